@@ -0,0 +1,141 @@
+import { PrismaClient } from '@prisma/client';
+import * as fs from 'fs';
+import * as path from 'path';
+
+const prisma = new PrismaClient();
+
+interface WesleyanCourse {
+  id: string;
+  code: string;
+  number: string;
+  title: string;
+  department: string;
+  description: string;
+  professor: string;
+  term: string;
+  genEdArea: string | null;
+  level: string;
+  credits: number;
+  prerequisites: string | null;
+  location: string;
+  time: string;
+  createdAt: string;
+}
+
+interface FieldChange {
+  old: unknown;
+  new: unknown;
+}
+
+interface ChangedCourse {
+  id: string;
+  code: string;
+  changes: Record<string, FieldChange>;
+}
+
+interface CourseDiff {
+  added: WesleyanCourse[];
+  removed: WesleyanCourse[];
+  changed: ChangedCourse[];
+}
+
+// Scraper fields that are stored on the Course table
+const DB_FIELDS = ['department', 'credits', 'number', 'professor', 'term', 'title'] as const;
+
+async function applyCourseDiff() {
+  try {
+    console.log('🔄 Applying course catalog diff...\n');
+
+    // Diff written by `python scrape_all_courses.py --diff` or catalog_diff.py
+    const diffPath = process.argv[2]
+      ? path.resolve(process.argv[2])
+      : path.join(__dirname, '..', 'wesleyan courses', 'wesleyan_courses_fall_2025.diff.json');
+    console.log(`📖 Reading diff from: ${diffPath}`);
+
+    if (!fs.existsSync(diffPath)) {
+      throw new Error('Course diff JSON file not found!');
+    }
+
+    const diff: CourseDiff = JSON.parse(fs.readFileSync(diffPath, 'utf8'));
+    console.log(`📚 ${diff.added.length} added, ${diff.removed.length} removed, ${diff.changed.length} changed\n`);
+
+    const university = await prisma.university.findFirst();
+    if (!university) {
+      throw new Error('No university found in database!');
+    }
+    console.log(`🏫 Using university: ${university.name} (ID: ${university.id})\n`);
+
+    // Removed courses: keep any that sessions or user courses still reference.
+    // Deleting never fails on its own: user_courses rows cascade and sessions
+    // lose their course, so references are checked explicitly
+    const removed = await prisma.course.findMany({
+      where: { code: { in: diff.removed.map(course => course.code) }, universityId: university.id },
+      select: { id: true, code: true, _count: { select: { sessions: true, userCourses: true } } }
+    });
+    for (const course of removed) {
+      if (course._count.sessions > 0 || course._count.userCourses > 0) {
+        console.warn(`⚠️  Kept ${course.code}: still referenced by ${course._count.sessions} sessions ` +
+                     `and ${course._count.userCourses} user courses`);
+      }
+    }
+    // The reference check is repeated in the delete, so nothing referenced in between is lost
+    const deleteResult = await prisma.course.deleteMany({
+      where: {
+        id: { in: removed.map(course => course.id) },
+        sessions: { none: {} },
+        userCourses: { none: {} }
+      }
+    });
+    console.log(`✅ Deleted ${deleteResult.count} courses (${removed.length - deleteResult.count} still referenced, kept)`);
+
+    // Added courses: upsert so re-applying the same diff is harmless
+    for (const course of diff.added) {
+      const data = {
+        department: course.department,
+        credits: course.credits,
+        number: course.number,
+        professor: course.professor,
+        term: course.term,
+        title: course.title
+      };
+      await prisma.course.upsert({
+        where: { code_universityId: { code: course.code, universityId: university.id } },
+        update: data,
+        create: { ...data, code: course.code, universityId: university.id }
+      });
+    }
+    console.log(`✅ Added ${diff.added.length} courses`);
+
+    // Changed courses: only write the fields that actually changed
+    let updatedCount = 0;
+    for (const course of diff.changed) {
+      const data: Record<string, unknown> = {};
+      for (const field of DB_FIELDS) {
+        if (field in course.changes) {
+          data[field] = course.changes[field].new;
+        }
+      }
+      if (Object.keys(data).length === 0) {
+        continue;
+      }
+      const result = await prisma.course.updateMany({
+        where: { code: course.code, universityId: university.id },
+        data
+      });
+      updatedCount += result.count;
+    }
+    console.log(`✅ Updated ${updatedCount} courses`);
+
+    const finalCourseCount = await prisma.course.count();
+    console.log(`\n📊 Final course count in database: ${finalCourseCount}`);
+    console.log('\n🎉 Course diff applied!');
+
+  } catch (error) {
+    console.error('❌ Error:', error);
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+// Run the script
+applyCourseDiff();
@@ -1,6 +1,7 @@
-import { PrismaClient } from '@prisma/client';
+import { Prisma, PrismaClient } from '@prisma/client';
 import * as fs from 'fs';
 import * as path from 'path';
+import * as readline from 'readline';
 
 const prisma = new PrismaClient();
 
@@ -22,21 +23,73 @@ interface WesleyanCourse {
   createdAt: string;
 }
 
+// Interactive transactions time out after 5 seconds by default; a full catalog takes longer
+const TRANSACTION_TIMEOUT_MS = 10 * 60 * 1000;
+
+// Fail on records missing the fields the courses table requires, instead of inserting them
+function validateCourse(course: WesleyanCourse, where: string): WesleyanCourse {
+  for (const field of ['code', 'department', 'number', 'title'] as const) {
+    if (typeof course?.[field] !== 'string' || !course[field]) {
+      throw new Error(`${where}: course is missing "${field}"`);
+    }
+  }
+  return course;
+}
+
+// Yield courses from an NDJSON file one line at a time, or from a legacy JSON array
+async function* readCourses(filePath: string): AsyncGenerator<WesleyanCourse> {
+  if (!filePath.endsWith('.ndjson')) {
+    const courses: WesleyanCourse[] = JSON.parse(fs.readFileSync(filePath, 'utf8'));
+    if (!Array.isArray(courses)) {
+      throw new Error(`${filePath}: expected a JSON array of courses`);
+    }
+    for (let i = 0; i < courses.length; i++) {
+      yield validateCourse(courses[i], `${filePath} record ${i + 1}`);
+    }
+    return;
+  }
+
+  const lines = readline.createInterface({
+    input: fs.createReadStream(filePath, { encoding: 'utf8' }),
+    crlfDelay: Infinity
+  });
+  let lineNumber = 0;
+  for await (const line of lines) {
+    lineNumber += 1;
+    if (line.trim()) {
+      let course: WesleyanCourse;
+      try {
+        course = JSON.parse(line);
+      } catch (error) {
+        throw new Error(`${filePath} line ${lineNumber}: ${(error as Error).message}`);
+      }
+      yield validateCourse(course, `${filePath} line ${lineNumber}`);
+    }
+  }
+}
+
+// The newer of the streamed NDJSON output and the JSON array, so a stale file is never loaded
+function defaultCoursesPath(): string {
+  const coursesDir = path.join(__dirname, '..', 'wesleyan courses');
+  const candidates = ['wesleyan_courses_fall_2025.ndjson', 'wesleyan_courses_fall_2025.json']
+    .map(name => path.join(coursesDir, name))
+    .filter(candidate => fs.existsSync(candidate))
+    .sort((a, b) => fs.statSync(b).mtimeMs - fs.statSync(a).mtimeMs);
+  return candidates[0] ?? path.join(coursesDir, 'wesleyan_courses_fall_2025.json');
+}
+
 async function replaceAllCourses() {
   try {
     console.log('🔄 Starting complete course database replacement...\n');
 
-    // Read the Wesleyan courses JSON file
-    const jsonPath = path.join(__dirname, '..', 'wesleyan courses', 'wesleyan_courses_fall_2025.json');
+    // Read the courses file given on the command line, or the newest scraper output
+    const jsonPath = process.argv[2] ? path.resolve(process.argv[2]) : defaultCoursesPath();
     console.log(`📖 Reading courses from: ${jsonPath}`);
     
     if (!fs.existsSync(jsonPath)) {
       throw new Error('Wesleyan courses JSON file not found!');
     }
 
-    const coursesData: WesleyanCourse[] = JSON.parse(fs.readFileSync(jsonPath, 'utf8'));
-    console.log(`📚 Found ${coursesData.length} courses in JSON file\n`);
-
     // Get the university ID (assuming Wesleyan is the first/only university)
     const university = await prisma.university.findFirst();
     if (!university) {
@@ -48,40 +101,62 @@ async function replaceAllCourses() {
     const currentCourseCount = await prisma.course.count();
     console.log(`📊 Current courses in database: ${currentCourseCount}`);
 
-    // Delete all existing courses
-    console.log('🗑️  Deleting all existing courses...');
-    const deleteResult = await prisma.course.deleteMany({});
-    console.log(`✅ Deleted ${deleteResult.count} existing courses\n`);
-
-    // Insert all courses from JSON
-    console.log('📥 Inserting courses from JSON file...');
-    
-    const coursesToInsert = coursesData.map(course => ({
-      code: course.code,
-      department: course.department,
-      universityId: university.id,
-      credits: course.credits,
-      number: course.number,
-      professor: course.professor,
-      term: course.term,
-      title: course.title
-    }));
-
-    // Insert in batches to avoid memory issues
+    // Courses are streamed from the file after the delete, so both run in one
+    // transaction: a truncated or malformed file rolls back to the old courses
     const batchSize = 100;
+    let readCount = 0;
     let insertedCount = 0;
-    
-    for (let i = 0; i < coursesToInsert.length; i += batchSize) {
-      const batch = coursesToInsert.slice(i, i + batchSize);
-      const result = await prisma.course.createMany({
-        data: batch,
-        skipDuplicates: true
-      });
-      insertedCount += result.count;
-      console.log(`   Batch ${Math.floor(i / batchSize) + 1}: Inserted ${result.count} courses`);
-    }
 
-    console.log(`\n✅ Successfully inserted ${insertedCount} courses`);
+    await prisma.$transaction(async (tx) => {
+      // Delete all existing courses
+      console.log('🗑️  Deleting all existing courses...');
+      const deleteResult = await tx.course.deleteMany({});
+      console.log(`✅ Deleted ${deleteResult.count} existing courses (committed once every insert succeeds)\n`);
+
+      // Insert all courses from the file
+      console.log('📥 Inserting courses from file...');
+
+      // Insert in batches as courses are read to avoid memory issues
+      let batchNumber = 0;
+      let batch: Prisma.CourseCreateManyInput[] = [];
+
+      const insertBatch = async () => {
+        const result = await tx.course.createMany({
+          data: batch,
+          skipDuplicates: true
+        });
+        insertedCount += result.count;
+        batchNumber += 1;
+        console.log(`   Batch ${batchNumber}: Inserted ${result.count} courses`);
+        batch = [];
+      };
+
+      for await (const course of readCourses(jsonPath)) {
+        readCount += 1;
+        batch.push({
+          code: course.code,
+          department: course.department,
+          universityId: university.id,
+          credits: course.credits,
+          number: course.number,
+          professor: course.professor,
+          term: course.term,
+          title: course.title
+        });
+        if (batch.length === batchSize) {
+          await insertBatch();
+        }
+      }
+      if (batch.length > 0) {
+        await insertBatch();
+      }
+      if (readCount === 0) {
+        throw new Error(`${jsonPath} has no courses; keeping the existing ones`);
+      }
+    }, { timeout: TRANSACTION_TIMEOUT_MS });
+
+    console.log(`\n📚 Read ${readCount} courses from file`);
+    console.log(`✅ Successfully inserted ${insertedCount} courses`);
 
     // Verify the insertion
     const finalCourseCount = await prisma.course.count();
@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+# Read once at import, while nothing else runs: os.umask can only be read by changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Mode a file created with open() gets
+FILE_MODE = 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_open(filename: str, mode: str = "w", encoding: Optional[str] = "utf-8", newline: Optional[str] = None,
+                durable: bool = False) -> Iterator[IO]:
+    """Write a file through a temp file beside it, renamed into place when the block succeeds.
+
+    Readers (and concurrent workers) never see a partial file, and a failed
+    write leaves the previous version untouched. The file gets the same
+    permissions as one created with open(), rather than mkstemp's 0600.
+    ``durable`` also fsyncs the data before the rename.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        if hasattr(os, "fchmod"):  # not on Windows, where mkstemp's mode does not apply anyway
+            os.fchmod(fd, FILE_MODE)
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding, newline=newline) as f:
+            yield f
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(filename: str, data, durable: bool = False, **kwargs):
+    """json.dump ``data`` to filename atomically; keyword arguments go to json.dump"""
+    with atomic_open(filename, durable=durable) as f:
+        json.dump(data, f, **kwargs)
+
+
+def write_text_atomic(filename: str, text: str, durable: bool = False):
+    with atomic_open(filename, durable=durable) as f:
+        f.write(text)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+CourseCatalog Microbenchmark
+Times autocomplete-style lookups over a multi-term catalog.
+
+    python bench_catalog.py                                   # Fall 2025 replicated to 4 terms
+    python bench_catalog.py wesleyan_courses_fall_2025.json wesleyan_courses_spring_2026.json --terms 1
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+from typing import List
+
+from course_catalog import CourseCatalog
+from course_scraper import Course, load_courses
+
+# Queries typed one keystroke at a time, as the course search box sends them
+TYPED_QUERIES = ["COMP211", "comp 2", "econ101", "introduction to economics", "grossman",
+                 "black women", "organic chemistry", "MATH", "bio", "statistics"]
+
+TARGET_MICROSECONDS = 1000.0
+
+
+def load_terms(filenames: List[str], terms: int) -> List[Course]:
+    """Load scraper output, replicating it into extra synthetic terms if asked"""
+    base = load_courses(*filenames)
+    courses = list(base)
+    for extra in range(1, terms):
+        suffix = f"X{extra}"
+        courses.extend(replace(course, id=f"{course.id}{suffix}", term=f"{course.term} {suffix}")
+                       for course in base)
+    return courses
+
+
+def keystrokes(query: str) -> List[str]:
+    return [query[:i] for i in range(1, len(query) + 1)]
+
+
+def time_queries(catalog: CourseCatalog, queries: List[str]) -> List[float]:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        catalog.search(query)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def time_call(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e6
+
+
+def report(label: str, timings: List[float]):
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:>22}: mean {statistics.mean(timings):8.1f} µs   "
+          f"p50 {statistics.median(timings):8.1f} µs   p99 {p99:8.1f} µs   max {ordered[-1]:8.1f} µs")
+    return p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CourseCatalog lookups")
+    parser.add_argument("files", nargs="*", default=["wesleyan_courses_fall_2025.json"])
+    parser.add_argument("--terms", type=int, default=4,
+                        help="Replicate the input into this many terms (default: 4)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    courses = load_terms(args.files, args.terms)
+    load_ms = (time.perf_counter() - start) * 1000
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    print(f"Loaded {len(courses)} records in {load_ms:.1f} ms ({memory_mb:.1f} MB)")
+    start = time.perf_counter()
+    catalog = CourseCatalog(courses)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Indexed {len(catalog)} courses from {len(courses)} records in {build_ms:.1f} ms\n")
+
+    queries = [prefix for query in TYPED_QUERIES for prefix in keystrokes(query)]
+
+    # First pass sees every query for the first time; later passes are repeat keystrokes.
+    # Like timeit, collection is off while timing, so one pause cannot decide the cold p99
+    gc.collect()
+    gc.disable()
+    try:
+        cold = time_queries(catalog, queries)
+        warm = []
+        for _ in range(args.rounds):
+            warm.extend(time_queries(catalog, queries))
+    finally:
+        gc.enable()
+
+    cold_p99 = report("first keystroke pass", cold)
+    warm_p99 = report("repeat keystrokes", warm)
+    report("code prefix", [time_call(lambda: catalog.by_code_prefix("COMP2")) for _ in range(args.rounds)])
+    report("professor", [time_call(lambda: catalog.by_professor("Grossman,Richard")) for _ in range(args.rounds)])
+
+    # Short queries not ranked at build time are memoized after the first pass, so the
+    # warm p99 alone would hide slow cold lookups
+    print()
+    missed = [label for label, p99 in (("first keystroke pass", cold_p99), ("repeat keystrokes", warm_p99))
+              if p99 >= TARGET_MICROSECONDS]
+    if missed:
+        print(f"❌ p99 over {TARGET_MICROSECONDS:.0f} µs: {', '.join(missed)}")
+        sys.exit(1)
+    print(f"✅ p99 under {TARGET_MICROSECONDS:.0f} µs on both passes "
+          f"(cold {cold_p99:.0f} µs, warm {warm_p99:.0f} µs)")
+
+
+if __name__ == "__main__":
+    main()
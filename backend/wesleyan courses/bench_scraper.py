@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark
+Microbenchmarks for the parser hot spots, then end-to-end scrapes of every
+department in departments.txt against a local mock WesMaps server.
+
+    python bench_scraper.py                                   # all engines, no injected latency
+    python bench_scraper.py --engines async --latency-ms 20 --error-rate 0.02
+    python bench_scraper.py --save-baseline bench_baseline.json
+    python bench_scraper.py --baseline bench_baseline.json    # exits 1 on a regression
+"""
+
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from course_scraper import WesleyanCourseScraper
+from fast_parser import iter_course_rows
+from get_departments import DepartmentCache
+from mock_wesmaps import MockWesMaps, read_departments
+from rate_limiter import AdaptiveRateLimiter
+
+ENGINES = ("sequential", "async", "pipeline")
+
+# Metrics where a larger value is better; every other one should shrink
+HIGHER_IS_BETTER = ("pages_per_second", "courses_per_second")
+
+# Reported but never a regression: in threaded engines the wall-clock parse
+# time includes waiting for the GIL, so it swings with scheduling (the
+# microbenchmarks measure parsing itself)
+INFORMATIONAL = ("parse_per_row_us",)
+
+
+def best_time(fn: Callable, number: int, repeat: int) -> float:
+    """Seconds per call, from the fastest of ``repeat`` batches of ``number`` calls"""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def run_microbenchmarks(sample_filename: str, repeat: int) -> Dict[str, float]:
+    with open(sample_filename, "rb") as f:
+        content = f.read()
+    bs4_scraper = WesleyanCourseScraper(parser_backend="bs4")
+    lxml_scraper = WesleyanCourseScraper(parser_backend="lxml")
+    soup = BeautifulSoup(content, "html.parser")
+    rows = len(bs4_scraper._parse_course_page(soup, "ECON", "1259"))
+    info_texts = [row[4] for row in iter_course_rows(content)]
+
+    def extract_all():
+        for text in info_texts:
+            bs4_scraper._extract_time_location(text)
+
+    results = {
+        "parse_course_page_us": best_time(lambda: bs4_scraper._parse_course_page(soup, "ECON", "1259"), 5, repeat) * 1e6,
+        "extract_time_location_us": best_time(extract_all, 20, repeat) / len(info_texts) * 1e6,
+        "bs4_page_ms": best_time(lambda: bs4_scraper._parse_content(content, "ECON", "1259"), 3, repeat) * 1e3,
+        "lxml_page_ms": best_time(lambda: lxml_scraper._parse_content(content, "ECON", "1259"), 10, repeat) * 1e3,
+    }
+    results["parse_course_page_per_row_us"] = results["parse_course_page_us"] / rows
+    return results
+
+
+def run_engine(engine: str, base_url: str, parser_backend: str, concurrency: int, rps: float) -> Dict[str, float]:
+    """Scrape one term from the mock server; runs in a fresh process so peak memory is its own"""
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = WesleyanCourseScraper(parser_backend=parser_backend,
+                                        department_cache=DepartmentCache(f"{tmp}/departments.json"),
+                                        rate_controller=AdaptiveRateLimiter(rps, rps / 16, rps))
+        scraper.base_url = base_url
+        start = time.perf_counter()
+        if engine == "pipeline":
+            from pipeline import ScrapePipeline
+            courses = ScrapePipeline(scraper, concurrency, requests_per_second=rps).run("1259")
+        elif engine == "async":
+            courses = scraper.scrape_all_courses_async("1259", concurrency, rps)
+        else:
+            courses = scraper.scrape_all_courses("1259")
+        elapsed = time.perf_counter() - start
+
+    counters = scraper.metrics.counters
+    parse = scraper.metrics.histograms.get("parse_seconds")
+    # ru_maxrss is KiB on Linux and bytes on macOS; children are the pipeline's parser processes
+    unit = 1 if sys.platform == "darwin" else 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * unit
+    return {
+        "seconds": elapsed,
+        "pages": counters.get("requests_total", 0),
+        "courses": len(courses),
+        "pages_per_second": counters.get("requests_total", 0) / elapsed,
+        "courses_per_second": len(courses) / elapsed,
+        "parse_per_row_us": parse.sum / counters["rows_scanned_total"] * 1e6 if parse and counters.get("rows_scanned_total") else 0.0,
+        "peak_memory_mb": peak / 1e6,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Metrics that got worse than the baseline by more than ``tolerance`` (a fraction)"""
+    regressions = []
+    for section in ("micro", "engines"):
+        for name, value, old in _pairs(results.get(section, {}), baseline.get(section, {})):
+            if old <= 0:
+                continue
+            change = (value - old) / old
+            metric = name.rsplit(".", 1)[-1]
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            regressed = worse > tolerance and metric not in INFORMATIONAL
+            marker = "·" if metric in INFORMATIONAL else "❌" if regressed else "✅"
+            print(f"  {marker} {name:<42} {old:12.2f} -> {value:12.2f}  ({change:+.1%})")
+            if regressed:
+                regressions.append(name)
+    return regressions
+
+
+def _pairs(current: Dict, old: Dict, prefix: str = ""):
+    for name, value in current.items():
+        if name not in old or name in ("seconds", "pages", "courses"):
+            continue
+        if isinstance(value, dict):
+            yield from _pairs(value, old[name], f"{prefix}{name}.")
+        else:
+            yield f"{prefix}{name}", value, old[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local mock WesMaps")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--parser", choices=["bs4", "lxml"], default="lxml")
+    parser.add_argument("--departments", default="departments.txt")
+    parser.add_argument("--sample", default="sample_page.html")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mock server delay per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random mock delay, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock responses that are 503s")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=500.0, help="Request rate ceiling (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Microbenchmark repetitions (best is kept)")
+    parser.add_argument("--no-micro", action="store_true", help="Skip the microbenchmarks")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed slowdown before a metric counts as a regression (default: 0.15)")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict] = {"config": {key: value for key, value in vars(args).items()
+                                           if key not in ("save_baseline", "baseline")}}
+
+    if not args.no_micro:
+        print("Microbenchmarks (sample_page.html, best of repeats):")
+        results["micro"] = run_microbenchmarks(args.sample, args.repeat)
+        for name, value in results["micro"].items():
+            print(f"  {name:<32} {value:10.2f}")
+        print()
+
+    departments = read_departments(args.departments)
+    results["engines"] = {}
+    with MockWesMaps(departments, args.sample, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                     error_rate=args.error_rate) as mock:
+        print(f"End-to-end: {len(departments)} departments from {mock.base_url} "
+              f"({args.latency_ms:.0f} ms latency, {args.error_rate:.1%} errors, {args.parser} parser)")
+        for engine in args.engines:
+            # A fresh interpreter per engine keeps peak memory and warm caches separate
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                stats = pool.submit(run_engine, engine, mock.base_url, args.parser,
+                                    args.concurrency, args.rps).result()
+            results["engines"][engine] = stats
+            print(f"  {engine:>10}: {stats['pages']:5.0f} pages in {stats['seconds']:6.2f}s   "
+                  f"{stats['pages_per_second']:8.1f} pages/s   {stats['courses_per_second']:9.0f} courses/s   "
+                  f"{stats['parse_per_row_us']:7.1f} µs parse/row   {stats['peak_memory_mb']:7.1f} MB peak")
+        print(f"  mock server answered {mock.requests} requests ({mock.errors} injected errors)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
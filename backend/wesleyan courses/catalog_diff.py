@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Catalog Diff
+Compares a new course scrape against the previous snapshot and writes only
+the records that were added, removed or changed.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fields that change on every scrape without the course itself changing
+IGNORED_FIELDS = ("createdAt",)
+
+
+def load_snapshot(filename: str) -> List[Dict]:
+    """Load a course JSON file, treating a missing file as an empty snapshot"""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.info(f"No previous snapshot at {filename}, treating every course as new")
+        return []
+
+
+def index_by_id(records: Iterable[Dict]) -> Dict[str, Dict]:
+    """Index course records by id.
+
+    Multi-section courses share an id; only the first record is kept, which is
+    the same row the backend keeps when it loads the catalog.
+    """
+    indexed = {}
+    for record in records:
+        indexed.setdefault(record["id"], record)
+    return indexed
+
+
+def diff_catalogs(old_records: Iterable[Dict], new_records: Iterable[Dict],
+                  ignored_fields: Iterable[str] = IGNORED_FIELDS,
+                  missing_departments: Iterable[str] = ()) -> Dict:
+    """Compare two catalogs by Course.id.
+
+    Returns a dict with ``added`` and ``removed`` course records and
+    ``changed`` entries of the form
+    ``{"id", "code", "changes": {field: {"old": ..., "new": ...}}}``.
+    Courses of ``missing_departments`` (departments that failed to scrape)
+    are absent from the new catalog without having been dropped, so they
+    are never reported as removed.
+    """
+    ignored = set(ignored_fields)
+    missing = set(missing_departments)
+    old = index_by_id(old_records)
+    new = index_by_id(new_records)
+
+    added = [record for course_id, record in new.items() if course_id not in old]
+    removed = [record for course_id, record in old.items()
+               if course_id not in new and record["department"] not in missing]
+
+    changed = []
+    for course_id, new_record in new.items():
+        old_record = old.get(course_id)
+        if old_record is None:
+            continue
+        changes = {}
+        for field in sorted(set(old_record) | set(new_record)):
+            if field in ignored:
+                continue
+            old_value = old_record.get(field)
+            new_value = new_record.get(field)
+            if old_value != new_value:
+                changes[field] = {"old": old_value, "new": new_value}
+        if changes:
+            changed.append({"id": course_id, "code": new_record["code"], "changes": changes})
+
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def save_diff(diff: Dict, filename: str):
+    """Write a catalog diff as JSON"""
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(diff, f, indent=2, ensure_ascii=False)
+    logger.info(f"Saved diff to {filename}: {len(diff['added'])} added, "
+                f"{len(diff['removed'])} removed, {len(diff['changed'])} changed")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Diff two Wesleyan course snapshots by course id")
+    parser.add_argument("old", help="Previous course JSON snapshot")
+    parser.add_argument("new", help="New course JSON snapshot")
+    parser.add_argument("-o", "--output", default="wesleyan_courses_diff.json",
+                        help="Where to write the diff (default: wesleyan_courses_diff.json)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    diff = diff_catalogs(load_snapshot(args.old), load_snapshot(args.new))
+    save_diff(diff, args.output)
+
+    print(f"Added:   {len(diff['added'])}")
+    print(f"Removed: {len(diff['removed'])}")
+    print(f"Changed: {len(diff['changed'])}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
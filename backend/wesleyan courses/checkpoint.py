@@ -0,0 +1,63 @@
+import json
+import os
+import shutil
+from dataclasses import asdict
+from typing import Dict, List, Optional
+import logging
+
+from atomic_file import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """Per-(term, department) checkpoints of completed scrape results.
+
+    Each finished unit is written atomically to
+    ``<checkpoint_dir>/<term>/<department>.json`` so an interrupted run can be
+    resumed without re-scraping departments that already completed. Only
+    units that finished without errors are recorded, so a department that
+    failed on a network blip is retried on resume.
+    """
+
+    def __init__(self, checkpoint_dir: str):
+        self.checkpoint_dir = checkpoint_dir
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def _term_dir(self, term: str) -> str:
+        return os.path.join(self.checkpoint_dir, term)
+
+    def _unit_path(self, term: str, department: str) -> str:
+        return os.path.join(self._term_dir(term), f"{department}.json")
+
+    def load(self, term: str, department: str) -> Optional[List[Dict]]:
+        """Return the checkpointed course records for a unit, or None if it has not finished"""
+        try:
+            with open(self._unit_path(term, department), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint for {department} {term}: {e}")
+            return None
+
+    def save(self, term: str, department: str, courses: List):
+        """Record a finished unit"""
+        term_dir = self._term_dir(term)
+        os.makedirs(term_dir, exist_ok=True)
+        write_json_atomic(self._unit_path(term, department), [asdict(course) for course in courses],
+                          ensure_ascii=False)
+
+    def completed(self, term: str) -> List[str]:
+        """Departments already checkpointed for a term"""
+        try:
+            names = os.listdir(self._term_dir(term))
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len(".json")] for name in names if name.endswith(".json"))
+
+    def clear(self, term: Optional[str] = None):
+        """Forget checkpoints for one term, or for every term"""
+        target = self._term_dir(term) if term else self.checkpoint_dir
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
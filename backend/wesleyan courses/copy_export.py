@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Postgres Bulk Export
+Writes scraped courses as a COPY file for the backend's ``courses`` table
+(see backend/prisma/schema.prisma) plus a psql script that loads it through
+a staging table and swaps the catalog in with one transaction, instead of
+inserting row by row through the ORM.
+
+    python copy_export.py wesleyan_courses_fall_2025.json --output courses.csv
+    psql "$DATABASE_URL" -f courses.swap.sql      # from the directory holding courses.csv
+"""
+
+import argparse
+import hashlib
+import os
+from typing import Iterable, Iterator, Optional, Tuple
+import logging
+
+from atomic_file import atomic_open
+
+logger = logging.getLogger(__name__)
+
+# Columns of the Prisma Course model's "courses" table, in table order
+TABLE_COLUMNS = ("id", "code", "department", "universityId", "createdAt", "updatedAt",
+                 "credits", "number", "professor", "term", "title")
+
+# Columns refreshed when a course already exists; its id and createdAt are kept
+UPDATED_COLUMNS = ("department", "credits", "number", "professor", "term", "title")
+
+# Prisma's default for Course.credits
+DEFAULT_CREDITS = 1.0
+
+COPY_FORMATS = ("csv", "text")
+
+
+def copy_format(filename: str) -> str:
+    """COPY format for an output file: Postgres text (tab-separated) for .tsv, CSV otherwise"""
+    return "text" if filename.lower().endswith((".tsv", ".txt")) else "csv"
+
+
+def swap_filename(filename: str) -> str:
+    """psql script accompanying a COPY file, e.g. courses.csv -> courses.swap.sql"""
+    return f"{os.path.splitext(filename)[0]}.swap.sql"
+
+
+def course_id(code: str, university_id: Optional[str] = None) -> str:
+    """Stable cuid-shaped id for a course that is new to the table"""
+    return "c" + hashlib.sha1(f"{university_id or ''}/{code}".encode("utf-8")).hexdigest()[:24]
+
+
+def course_rows(courses: Iterable, university_id: Optional[str] = None) -> Iterator[Tuple]:
+    """Table rows for scraped courses, one per code.
+
+    The table is unique on (code, universityId), so like the ORM loader's
+    ``skipDuplicates`` the first course with a code wins. A missing
+    ``university_id`` is left NULL for the swap script to fill in.
+    """
+    seen = set()
+    for course in courses:
+        if course.code in seen:
+            continue
+        seen.add(course.code)
+        yield (course_id(course.code, university_id), course.code, course.department, university_id,
+               course.createdAt, course.createdAt,
+               DEFAULT_CREDITS if course.credits is None else course.credits,
+               course.number, course.professor, course.term, course.title)
+
+
+def _csv_field(value) -> str:
+    if value is None:
+        return ""  # unquoted empty is NULL in CSV COPY
+    text = repr(value) if isinstance(value, float) else str(value)
+    if text == "" or text == "\\." or any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _text_field(value) -> str:
+    if value is None:
+        return "\\N"
+    text = repr(value) if isinstance(value, float) else str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def write_copy_file(courses: Iterable, filename: str, fmt: Optional[str] = None,
+                    university_id: Optional[str] = None) -> int:
+    """Write courses as a COPY file (CSV with a header, or text format); returns the row count"""
+    fmt = fmt or copy_format(filename)
+    if fmt not in COPY_FORMATS:
+        raise ValueError(f"Unknown COPY format {fmt!r}, expected one of {COPY_FORMATS}")
+    field, separator = (_csv_field, ",") if fmt == "csv" else (_text_field, "\t")
+    count = 0
+    # COPY reads bare \n line endings, whatever the platform
+    with atomic_open(filename, newline="\n") as f:
+        if fmt == "csv":
+            f.write(separator.join(TABLE_COLUMNS) + "\n")
+        for row in course_rows(courses, university_id):
+            f.write(separator.join(map(field, row)) + "\n")
+            count += 1
+    return count
+
+
+def _quoted(columns: Iterable[str]) -> str:
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def swap_sql(copy_filename: str, fmt: Optional[str] = None) -> str:
+    """psql script replacing the course catalog with the rows of a COPY file.
+
+    Rows are bulk-loaded into a temporary staging table, then merged in one
+    transaction: existing courses (matched on code and university) keep
+    their id and are only rewritten when something changed; new courses
+    are inserted; and courses missing from the file are deleted unless a
+    session or user course still references them (deleting would cascade
+    to enrolments and clear sessions' course), as apply-course-diff.ts
+    does. The kept courses are listed. Readers see the old catalog until
+    the commit.
+    """
+    fmt = fmt or copy_format(copy_filename)
+    options = "FORMAT csv, HEADER true" if fmt == "csv" else "FORMAT text"
+    path = os.path.basename(copy_filename).replace("'", "''")
+    columns = _quoted(TABLE_COLUMNS)
+    changed = "\n   OR ".join(f'"courses"."{c}" IS DISTINCT FROM EXCLUDED."{c}"' for c in UPDATED_COLUMNS)
+    updates = ",\n    ".join(f'"{c}" = EXCLUDED."{c}"' for c in UPDATED_COLUMNS + ("updatedAt",))
+    missing = ('"universityId" IN (SELECT DISTINCT "universityId" FROM "courses_staging")\n'
+               '  AND NOT EXISTS (SELECT 1 FROM "courses_staging" AS st\n'
+               '                  WHERE st."code" = "courses"."code" AND st."universityId" = "courses"."universityId")')
+    return f"""-- Replace the course catalog with {path} (generated by copy_export.py).
+-- Run from the directory holding {path}: psql "$DATABASE_URL" -f {os.path.basename(swap_filename(copy_filename))}
+\\set ON_ERROR_STOP on
+
+BEGIN;
+
+CREATE TEMP TABLE "courses_staging" (
+    "id"           TEXT NOT NULL,
+    "code"         TEXT NOT NULL,
+    "department"   TEXT NOT NULL,
+    "universityId" TEXT,
+    "createdAt"    TIMESTAMP(3) NOT NULL,
+    "updatedAt"    TIMESTAMP(3) NOT NULL,
+    "credits"      DOUBLE PRECISION NOT NULL,
+    "number"       TEXT NOT NULL,
+    "professor"    TEXT,
+    "term"         TEXT,
+    "title"        TEXT NOT NULL
+) ON COMMIT DROP;
+
+\\copy "courses_staging" ({columns}) FROM '{path}' WITH ({options})
+
+-- Like the ORM loader, courses belong to the first university when none was exported
+UPDATE "courses_staging"
+SET "universityId" = (SELECT "id" FROM "universities" ORDER BY "createdAt", "id" LIMIT 1)
+WHERE "universityId" IS NULL;
+
+-- Keep concurrent writers out until the swap commits; readers are not blocked
+LOCK TABLE "courses" IN SHARE ROW EXCLUSIVE MODE;
+
+INSERT INTO "courses" ({columns})
+SELECT {columns} FROM "courses_staging"
+ON CONFLICT ("code", "universityId") DO UPDATE SET
+    {updates}
+WHERE {changed};
+
+-- Courses missing from the file that sessions or user courses still reference are kept
+SELECT "code", "title", "term" FROM "courses"
+WHERE {missing}
+  AND (EXISTS (SELECT 1 FROM "sessions" s WHERE s."courseId" = "courses"."id")
+       OR EXISTS (SELECT 1 FROM "user_courses" uc WHERE uc."courseId" = "courses"."id"))
+ORDER BY "code";
+
+DELETE FROM "courses"
+WHERE {missing}
+  AND NOT EXISTS (SELECT 1 FROM "sessions" s WHERE s."courseId" = "courses"."id")
+  AND NOT EXISTS (SELECT 1 FROM "user_courses" uc WHERE uc."courseId" = "courses"."id");
+
+COMMIT;
+
+ANALYZE "courses";
+"""
+
+
+def write_swap_sql(copy_filename: str, fmt: Optional[str] = None) -> str:
+    """Write the swap script next to a COPY file; returns its filename"""
+    filename = swap_filename(copy_filename)
+    with open(filename, "w", encoding="utf-8", newline="\n") as f:
+        f.write(swap_sql(copy_filename, fmt))
+    return filename
+
+
+def export_courses(courses: Iterable, filename: str, university_id: Optional[str] = None) -> Tuple[int, str]:
+    """Write a COPY file and its swap script; returns (rows written, script filename)"""
+    count = write_copy_file(courses, filename, university_id=university_id)
+    return count, write_swap_sql(filename)
+
+
+def main(argv=None):
+    from course_scraper import load_courses
+
+    parser = argparse.ArgumentParser(description="Export scraped courses for a Postgres bulk load")
+    parser.add_argument("files", nargs="+", help="Scraper JSON files (earlier files win duplicate codes)")
+    parser.add_argument("--output", default="courses.csv",
+                        help="COPY file to write; .tsv selects the tab-separated text format (default: courses.csv)")
+    parser.add_argument("--university-id",
+                        help="universities.id to load the courses under (default: the first university)")
+    args = parser.parse_args(argv)
+
+    count, script = export_courses(load_courses(*args.files), args.output, args.university_id)
+    print(f"Wrote {count} courses to {args.output} and the load script to {script}")
+
+
+if __name__ == "__main__":
+    main()
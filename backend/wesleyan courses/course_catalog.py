@@ -0,0 +1,238 @@
+import bisect
+import heapq
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from course_scraper import Course, load_courses
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_code(text: str) -> str:
+    """Normalize a code query, so "comp 2" matches COMP211"""
+    return re.sub(r"\s+", "", text).upper()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_PATTERN.findall((text or "").lower())
+
+
+class _TokenIndex:
+    """Inverted index from tokens to course positions, with word-prefix lookups"""
+
+    # Prefixes up to this length have their matches precomputed, since they
+    # match the most words and would otherwise be the slowest to union
+    CACHED_PREFIX_LENGTH = 3
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.vocabulary: List[str] = []
+        self._prefix_matches: Dict[str, Set[int]] = {}
+
+    def add(self, position: int, text: Optional[str]):
+        for token in tokenize(text):
+            self.postings[token].add(position)
+
+    def freeze(self):
+        self.postings = dict(self.postings)
+        self.vocabulary = sorted(self.postings)
+        prefix_matches: Dict[str, Set[int]] = defaultdict(set)
+        for word, positions in self.postings.items():
+            for length in range(1, min(len(word), self.CACHED_PREFIX_LENGTH) + 1):
+                prefix_matches[word[:length]] |= positions
+        self._prefix_matches = dict(prefix_matches)
+
+    def cached_prefixes(self) -> Iterable[str]:
+        """Prefixes whose matches are precomputed"""
+        return self._prefix_matches.keys()
+
+    def _prefix(self, prefix: str) -> Set[int]:
+        """Positions with any word starting with prefix"""
+        if len(prefix) <= self.CACHED_PREFIX_LENGTH:
+            return self._prefix_matches.get(prefix, set())
+        matched = set()
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        for word in self.vocabulary[start:]:
+            if not word.startswith(prefix):
+                break
+            matched |= self.postings[word]
+        return matched
+
+    def score(self, tokens: List[str], weight: float, exact_bonus: float) -> Dict[int, float]:
+        """Score positions matching every token.
+
+        Each token matches any word it is a prefix of, so "intro econ" finds
+        "Introduction to Economics". Each match scores ``weight`` plus
+        ``exact_bonus`` per token that matched a whole word.
+        """
+        candidates: Optional[Set[int]] = None
+        for token in tokens:
+            matched = self._prefix(token)
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return {}
+        scores = dict.fromkeys(candidates, weight)
+        for token in tokens:
+            for position in self.postings.get(token, set()) & candidates:
+                scores[position] += exact_bonus
+        return scores
+
+
+class CourseCatalog:
+    """In-memory search index over scraped courses for autocomplete-style lookups.
+
+    Codes are kept in a sorted array for prefix lookups ("COMP2"), and titles
+    and professor names in inverted token indexes. Sections sharing an id are
+    indexed once, using the first section.
+    """
+
+    # Score weights used to rank results
+    EXACT_CODE = 100.0
+    CODE_PREFIX = 50.0
+    TITLE_MATCH = 20.0
+    PROFESSOR_MATCH = 10.0
+    EXACT_TOKEN = 5.0
+
+    # One- to three-character queries match thousands of courses but are what
+    # every keystroke starts with. The top results of every such word or code
+    # prefix are ranked when the catalog is built, overall and per term;
+    # other short queries (and larger limits) are memoized on first use
+    SHORT_QUERY_LENGTH = 3
+    SHORT_QUERY_RESULTS = 20
+    SHORT_QUERY_CACHE_SIZE = 10000
+
+    def __init__(self, courses: Iterable[Course]):
+        self.courses: List[Course] = []
+        seen = set()
+        for course in courses:
+            if course.id not in seen:
+                seen.add(course.id)
+                self.courses.append(course)
+
+        self._codes: List[Tuple[str, int]] = sorted(
+            (course.code.upper(), position) for position, course in enumerate(self.courses)
+        )
+        self._code_keys = [code for code, _ in self._codes]
+        self._titles = _TokenIndex()
+        self._professors = _TokenIndex()
+        self._by_professor: Dict[str, List[int]] = defaultdict(list)
+        for position, course in enumerate(self.courses):
+            self._titles.add(position, course.title)
+            for name in (course.professor or "").split(";"):
+                name = name.strip()
+                if name and name != "STAFF":
+                    self._professors.add(position, name)
+                    self._by_professor[name.lower()].append(position)
+        self._titles.freeze()
+        self._professors.freeze()
+        self._exact_codes: Dict[str, List[int]] = defaultdict(list)
+        for code, position in self._codes:
+            self._exact_codes[code].append(position)
+        self._exact_codes = dict(self._exact_codes)
+        # Fraction in [0, 1) ordering positions by (code, term), so ranking
+        # never compares strings per query
+        self._tiebreak = [0.0] * len(self.courses)
+        ordered = sorted(range(len(self.courses)), key=lambda p: (self.courses[p].code, self.courses[p].term))
+        for rank, position in enumerate(ordered):
+            self._tiebreak[position] = rank / (len(self.courses) + 1)
+        self._short_queries: Dict[Tuple[str, int, Optional[str]], List[Course]] = {}
+        self._ranked_prefixes: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        self._rank_prefixes()
+
+    @classmethod
+    def from_json(cls, *filenames: str) -> "CourseCatalog":
+        """Build a catalog from one or more scraper JSON files (e.g. one per term)"""
+        return cls(load_courses(*filenames))
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def _code_prefix_positions(self, prefix: str) -> List[int]:
+        start = bisect.bisect_left(self._code_keys, prefix)
+        # Every string starting with prefix sorts before prefix + U+FFFF
+        end = bisect.bisect_left(self._code_keys, prefix + "\uffff", lo=start)
+        return [position for _, position in self._codes[start:end]]
+
+    def by_code_prefix(self, prefix: str, limit: Optional[int] = None,
+                       term: Optional[str] = None) -> List[Course]:
+        """Courses whose code starts with prefix, in code order"""
+        courses = [self.courses[p] for p in self._code_prefix_positions(normalize_code(prefix))]
+        if term:
+            courses = [course for course in courses if course.term == term]
+        return courses[:limit] if limit else courses
+
+    def by_professor(self, name: str, term: Optional[str] = None) -> List[Course]:
+        """Courses taught by a professor, matched on the full "Last,First" name"""
+        courses = [self.courses[p] for p in self._by_professor.get(name.strip().lower(), [])]
+        return [course for course in courses if course.term == term] if term else courses
+
+    def _rank_prefixes(self):
+        """Rank every one- to three-character word or code prefix, overall and per term"""
+        length = self.SHORT_QUERY_LENGTH
+        prefixes = set(self._titles.cached_prefixes()) | set(self._professors.cached_prefixes())
+        prefixes.update(code[:i].lower() for code in self._code_keys for i in range(1, length + 1))
+        top = self.SHORT_QUERY_RESULTS
+        terms = [course.term for course in self.courses]
+        ranked = self._ranked_prefixes
+        for prefix in prefixes:
+            final = self._scores(prefix)
+            # Scores with the tie-break applied are all distinct, so this order is the search order
+            ordered = sorted(final, key=final.__getitem__, reverse=True)
+            ranked[prefix, None] = ordered[:top]
+            for position in ordered:
+                positions = ranked.setdefault((prefix, terms[position]), [])
+                if len(positions) < top:
+                    positions.append(position)
+
+    def search(self, query: str, limit: int = 10, term: Optional[str] = None) -> List[Course]:
+        """Ranked search over codes, title words and professor names.
+
+        Exact code matches rank first, then code prefixes, then courses whose
+        title has a word starting with every query word, then professor
+        matches; whole-word matches rank above prefix-only matches.
+        """
+        key = (query.strip().lower(), limit, term)
+        if len(key[0]) <= self.SHORT_QUERY_LENGTH:
+            if limit <= self.SHORT_QUERY_RESULTS:
+                positions = self._ranked_prefixes.get(key[0::2])
+                if positions is not None:
+                    return [self.courses[position] for position in positions[:limit]]
+            results = self._short_queries.get(key)
+            if results is None:
+                if len(self._short_queries) >= self.SHORT_QUERY_CACHE_SIZE:
+                    self._short_queries.clear()
+                results = self._short_queries[key] = self._rank(query, limit, term)
+            return list(results)
+        return self._rank(query, limit, term)
+
+    def _rank(self, query: str, limit: int, term: Optional[str]) -> List[Course]:
+        final = self._scores(query)
+        if term:
+            final = {position: score for position, score in final.items() if self.courses[position].term == term}
+        return [self.courses[position] for position in heapq.nlargest(limit, final, key=final.__getitem__)]
+
+    def _scores(self, query: str) -> Dict[int, float]:
+        """Score of every matching position, with the (code, term) tie-break applied"""
+        scores: Dict[int, float] = {}
+
+        code_query = normalize_code(query)
+        if code_query:
+            scores = dict.fromkeys(self._code_prefix_positions(code_query), self.CODE_PREFIX)
+            for position in self._exact_codes.get(code_query, ()):
+                scores[position] = self.EXACT_CODE
+
+        tokens = tokenize(query)
+        if tokens:
+            for index, weight in ((self._titles, self.TITLE_MATCH), (self._professors, self.PROFESSOR_MATCH)):
+                matched = index.score(tokens, weight, self.EXACT_TOKEN)
+                # Fold the smaller dict into the larger one
+                if len(matched) > len(scores):
+                    scores, matched = matched, scores
+                for position, score in matched.items():
+                    scores[position] = scores.get(position, 0.0) + score
+
+        # Scores are multiples of 5, so subtracting a tie-break below 1 keeps
+        # (code, term) order within a score without changing the score order
+        tiebreak = self._tiebreak
+        return {position: score - tiebreak[position] for position, score in scores.items()}
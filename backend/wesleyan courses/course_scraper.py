@@ -1,18 +1,91 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from bs4 import BeautifulSoup
+import asyncio
 import json
 import time
 import re
-from typing import List, Dict, Optional
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import logging
 
+from catalog_diff import diff_catalogs, load_snapshot, save_diff
+from checkpoint import CheckpointStore
+from copy_export import export_courses
+from fetch_plan import FetchPlan
+from get_departments import DepartmentCache, stream_departments
+from fast_parser import iter_course_rows
+from metrics import ScrapeMetrics
+from page_archive import PageArchive
+from rate_limiter import AdaptiveRateLimiter, RateLimiter
+from resilience import CircuitBreaker, RetryPolicy
+from response_cache import ResponseCache
+from sharding import shard_of
+from sqlite_store import CourseStore
+from term_store import TermCatalog
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Bump whenever parsing output changes so cached parse results are not reused
+PARSER_VERSION = 6
+
+# Day codes in WesMaps schedules (e.g. ".M.W..."), in week order, and their bits in Meeting day masks
+DAY_NAMES = {'U': 'Sunday', 'M': 'Monday', 'T': 'Tuesday', 'W': 'Wednesday', 'R': 'Thursday', 'F': 'Friday',
+             'S': 'Saturday'}
+DAY_BITS = {'M': 1, 'T': 2, 'W': 4, 'R': 8, 'F': 16, 'S': 32, 'U': 64}
+# Day of each position of a schedule's seven-character day code
+_DAY_POSITIONS = tuple(DAY_NAMES)
+
+# Day codes are seven fixed positions, Sunday to Saturday. The info text runs the
+# professor straight into them ("STAFF..T.R.."), so only a full positional code counts
+_TIME_PATTERN = re.compile(r'([.SU][.M][.T][.W][.R][.F][.SU])\s+(\d{1,2}:\d{2}[AP]M)-(\d{1,2}:\d{2}[AP]M)')
+# Rooms are listed as their own ";"-separated fields after the times (e.g. "01:20PM-02:40PM;FRANK100;")
+_LOCATION_PATTERN = re.compile(r'(?:^|;)\s*([A-Z]+\d+)\s*(?=;|$)')
+
+def to_minutes(clock: str) -> int:
+    """Minutes after midnight for a WesMaps clock time such as 01:20PM"""
+    hours, minutes = int(clock[:-5]), int(clock[-4:-2])
+    if clock.endswith('PM') and hours != 12:
+        hours += 12
+    elif clock.endswith('AM') and hours == 12:
+        hours = 0
+    return hours * 60 + minutes
+
+
+def to_clock(minutes: int) -> str:
+    """WesMaps clock time for minutes after midnight, the inverse of to_minutes"""
+    hours, minutes = divmod(minutes, 60)
+    return f"{(hours - 1) % 12 + 1:02d}:{minutes:02d}{'PM' if hours >= 12 else 'AM'}"
+
+# Parser backends accepted by WesleyanCourseScraper(parser_backend=...)
+PARSER_BACKENDS = ("bs4", "lxml")
+
+# Called with (department, courses) as each department finishes, in department order
+DepartmentCallback = Callable[[str, List["Course"]], None]
+
+@lru_cache(maxsize=None)
+def _course_code_pattern(department: str):
+    """Compiled section-code regex for a department (e.g. ECON101-01)"""
+    return re.compile(rf'({department}\d+)-(\d+)')
+
+# WesMaps course id in a course link (e.g. "...&crse=009187&term=1259")
+_CRSE_PATTERN = re.compile(r'[?&]crse=(\d+)')
+
+# (connect, read) timeouts in seconds; without them one stalled connection hangs the run
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Every course scraped by this process shares one createdAt stamp
+RUN_STARTED_AT = datetime.now().isoformat()
+
+
+@dataclass(slots=True)
 class Course:
     id: str
     code: str
@@ -28,19 +101,130 @@ class Course:
     prerequisites: Optional[str] = None
     location: Optional[str] = None
     time: Optional[str] = None
+    # Structured form of `time`: [{"days": day mask (see DAY_BITS), "start": minutes, "end": minutes}]
+    meetings: Optional[List[Dict[str, int]]] = None
+    # WesMaps "crse" id, which identifies the course's detail page
+    wesmapsId: Optional[str] = None
+    # Section number of a scraped row (the "01" of ECON101-01)
+    section: Optional[str] = None
+    # One entry per section: {"section", "professor", "location", "time", "meetings"}. Only set
+    # when enrichment.merge_sections combines several rows; a scraped row is its own section
+    sections: Optional[List[Dict]] = None
     createdAt: Optional[str] = None
 
     def __post_init__(self):
         if self.createdAt is None:
-            self.createdAt = datetime.now().isoformat()
+            self.createdAt = RUN_STARTED_AT
+
+
+def courses_from_records(records: Iterable[Dict], strings: Optional[Dict] = None) -> List[Course]:
+    """Build courses from JSON records (scraper output, checkpoints, cached parses).
+
+    Departments, terms, levels, professors, rooms and times repeat across
+    thousands of records (and ids and codes across sections), so one copy of
+    each string is shared through ``strings``, as is one list per distinct
+    set of meetings. Section entries are shared the same way. Pass the same
+    dict across calls to share values between files.
+    """
+    shared = strings if strings is not None else {}
+    share = shared.setdefault
+    get = dict.get
+
+    def share_meetings(meetings):
+        if not meetings:
+            return meetings
+        return share(tuple((m['days'], m['start'], m['end']) for m in meetings), meetings)
+
+    def share_section(s):
+        return {'section': share(s['section'], s['section']), 'professor': share(s['professor'], s['professor']),
+                'location': share(s['location'], s['location']), 'time': share(s['time'], s['time']),
+                'meetings': share_meetings(s['meetings'])}
+
+    courses = []
+    for r in records:
+        sections = get(r, 'sections')
+        title, description = r['title'], r['description']
+        # Positional construction is noticeably faster than Course(**r)
+        courses.append(Course(
+            share(r['id'], r['id']), share(r['code'], r['code']), share(r['number'], r['number']), title,
+            share(r['department'], r['department']), title if description == title else description,
+            share(r['professor'], r['professor']), share(r['term'], r['term']),
+            share(get(r, 'genEdArea'), get(r, 'genEdArea')), share(get(r, 'level'), get(r, 'level')),
+            get(r, 'credits'), get(r, 'prerequisites'),
+            share(get(r, 'location'), get(r, 'location')), share(get(r, 'time'), get(r, 'time')),
+            share_meetings(get(r, 'meetings')), get(r, 'wesmapsId'), share(get(r, 'section'), get(r, 'section')),
+            [share_section(s) for s in sections] if sections else sections,
+            share(get(r, 'createdAt'), get(r, 'createdAt'))
+        ))
+    return courses
+
+
+def load_courses(*filenames: str) -> List[Course]:
+    """Load one or more scraper JSON files (e.g. one per term) as courses"""
+    strings: Dict[str, str] = {}
+    courses = []
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            courses.extend(courses_from_records(json.loads(f.read()), strings))
+    return courses
+
+def term_output_filename(term_name: str) -> str:
+    """JSON file a term is saved to, e.g. "Fall 2025" -> wesleyan_courses_fall_2025.json"""
+    return f"wesleyan_courses_{term_name.lower().replace(' ', '_')}.json"
 
 class WesleyanCourseScraper:
-    def __init__(self):
+    # Department course-list URL patterns, tried in this order unless the fetch plan knows better
+    URL_PATTERNS = {
+        "subj_page": "?stuid=&facid=NONE&subj_page={department}&term={term}",
+        "crse_list": "?stuid=&facid=NONE&crse_list={department}&term={term}&offered=Y",
+    }
+    
+    def __init__(self, cache_dir: Optional[str] = None, parser_backend: str = "bs4",
+                 checkpoint_dir: Optional[str] = None, fetch_plan: Optional[FetchPlan] = None,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 department_cache: Optional[DepartmentCache] = None, shard: Optional[Tuple[int, int]] = None,
+                 archive: Optional[PageArchive] = None, rate_controller: Optional[AdaptiveRateLimiter] = None):
+        if parser_backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend {parser_backend!r}, expected one of {PARSER_BACKENDS}")
+        self.parser_backend = parser_backend
         self.base_url = "https://owaprod-pub.wesleyan.edu/reg/!wesmaps_page.html"
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # Every encoding urllib3 can decode here (gzip, deflate, plus br/zstd when installed)
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
         })
+        self._mount_pool(4)
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # When set, departments are discovered from the landing page as they are
+        # scraped (see iter_departments) instead of read from departments.txt
+        self.department_cache = department_cache
+        # (index, count): only scrape the units sharding.shard_of assigns to this shard
+        self.shard = shard
+        # Every department seen per term, in scrape order, including other shards' ones
+        self.department_order: Dict[str, List[str]] = {}
+        # (term, department) units whose fetches kept failing in this run
+        self.failed_units: List[Tuple[str, str]] = []
+        # Paces requests while an engine runs (a fixed cap or an adaptive controller)
+        self.rate_limiter: Optional[RateLimiter] = None
+        # When set, every engine adapts its request rate with this controller
+        self.rate_controller = rate_controller
+        # Sequential scrapes always adapt; this replaces the old one-second delay per department
+        self._sequential_rate = AdaptiveRateLimiter()
+        # Optional on-disk cache for conditional GETs and parse reuse
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        # Optional per-(term, department) checkpoints for resuming interrupted runs
+        self.checkpoint = CheckpointStore(checkpoint_dir) if checkpoint_dir else None
+        # Optional memory of working URL patterns and known-empty departments
+        self.fetch_plan = fetch_plan
+        # Optional append-only store of every page body fetched, for reparse.py
+        self.archive = archive
+        # Latency histograms and counters for the current run
+        self.metrics = ScrapeMetrics()
         
     def get_departments(self) -> List[str]:
         """Get list of all department codes"""
@@ -78,24 +262,67 @@ class WesleyanCourseScraper:
             logger.error(f"Error getting departments: {e}")
             return []
     
+    def iter_departments(self) -> Iterator[str]:
+        """Department codes to scrape, streamed as they become known.
+
+        With a department cache, codes come from landing-page discovery as the
+        page downloads (new departments first, see ``stream_departments``), so
+        scraping starts before discovery finishes. The landing page is fetched
+        like any other page, with retries, the circuit breaker and the rate
+        limit. Otherwise, or if discovery finds nothing, this is
+        ``get_departments()``; if discovery fails part way, the departments
+        it had not found yet are taken from ``get_departments()``.
+        """
+        if self.department_cache is None:
+            yield from self.get_departments()
+            return
+        found = False
+        for dept in stream_departments(self.department_cache, url=self.base_url,
+                                       fetch=lambda url: self._fetch(url, stream=True),
+                                       fallback=self.get_departments):
+            found = True
+            yield dept
+        if not found:
+            yield from self.get_departments()
+    
+    def iter_term_departments(self, term: str) -> Iterator[str]:
+        """``iter_departments`` restricted to this scraper's shard of the term, if any"""
+        order = self.department_order[term] = []
+        for dept in self.iter_departments():
+            order.append(dept)
+            if self.shard is None or shard_of(term, dept, self.shard[1]) == self.shard[0]:
+                yield dept
+    
     def scrape_department_courses(self, department: str, term: str = "1259") -> List[Course]:
         """Scrape all courses for a specific department"""
-        courses = []
+        courses, _ = self._scrape_department(department, term)
+        return courses
+    
+    def _scrape_department(self, department: str, term: str) -> Tuple[List[Course], bool]:
+        """Scrape a department, returning (courses, complete).
+
+        ``complete`` is False when no courses were found and at least one URL
+        pattern failed with an error, i.e. the empty result may not be real.
+        """
+        with self.metrics.timer("department_seconds"):
+            courses, failed, pattern = self._try_department_urls(department, term)
         
-        # Try different URL patterns
-        url_patterns = [
-            f"{self.base_url}?stuid=&facid=NONE&subj_page={department}&term={term}",
-            f"{self.base_url}?stuid=&facid=NONE&crse_list={department}&term={term}&offered=Y"
-        ]
+        complete = bool(courses) or not failed
+        self._update_fetch_plan(department, term, pattern if courses else None, complete)
+        return courses, complete
+    
+    def _try_department_urls(self, department: str, term: str) -> Tuple[List[Course], bool, Optional[str]]:
+        """Try each URL pattern until one yields courses; returns (courses, failed, last pattern)"""
+        courses = []
+        failed = False
+        pattern = None
         
-        for url in url_patterns:
+        for attempt, (pattern, url) in enumerate(self._department_urls(department, term)):
+            if attempt:
+                self.metrics.increment("retries_total")
             try:
                 logger.info(f"Scraping {department} courses from: {url}")
-                response = self.session.get(url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                dept_courses = self._parse_course_page(soup, department, term)
+                dept_courses = self._fetch_and_parse(url, department, term)
                 
                 if dept_courses:
                     courses.extend(dept_courses)
@@ -104,10 +331,222 @@ class WesleyanCourseScraper:
                     
             except Exception as e:
                 logger.error(f"Error scraping {department}: {e}")
+                failed = True
                 continue
         
+        return courses, failed, pattern
+    
+    def _load_checkpoint(self, department: str, term: str) -> Optional[List[Course]]:
+        """Courses from a finished (term, department) checkpoint, or None"""
+        if not self.checkpoint:
+            return None
+        rows = self.checkpoint.load(term, department)
+        return courses_from_records(rows) if rows is not None else None
+    
+    def _save_checkpoint(self, department: str, term: str, courses: List[Course], complete: bool):
+        """Checkpoint a finished unit; incomplete units are left to be retried on resume"""
+        if self.checkpoint and complete:
+            self.checkpoint.save(term, department, courses)
+    
+    def _update_fetch_plan(self, department: str, term: str, pattern: Optional[str], complete: bool):
+        """Remember which pattern produced courses, or that a complete scrape found none"""
+        if not self.fetch_plan:
+            return
+        if pattern:
+            self.fetch_plan.record_pattern(term, department, pattern)
+        elif complete:
+            self.fetch_plan.record_empty(term, department)
+    
+    def _record_failed_unit(self, department: str, term: str):
+        """Remember a unit that could not be fetched, so the run is not reported as complete"""
+        logger.error(f"Giving up on {department} for term {term} after repeated fetch errors")
+        self.failed_units.append((term, department))
+    
+    def failed_departments(self, term: str) -> List[str]:
+        """Departments of a term that failed in this run and are missing from its output"""
+        return [dept for unit_term, dept in self.failed_units if unit_term == term]
+    
+    def _is_known_empty(self, department: str, term: str) -> bool:
+        """True when the fetch plan says this department recently had no courses"""
+        return bool(self.fetch_plan and self.fetch_plan.is_known_empty(term, department))
+    
+    def _scrape_unit(self, department: str, term: str) -> Tuple[List[Course], bool]:
+        """Scrape one (term, department) unit or reuse a stored result.
+
+        Returns (courses, skipped), where skipped means no request was made
+        because the unit was checkpointed or is known to be empty.
+        """
+        courses = self._load_checkpoint(department, term)
+        if courses is not None:
+            logger.info(f"Resuming {department}: {len(courses)} courses from checkpoint")
+            return courses, True
+        if self._is_known_empty(department, term):
+            logger.info(f"Skipping {department}: no courses on its last check")
+            return [], True
+        courses, complete = self._scrape_department(department, term)
+        self._save_checkpoint(department, term, courses, complete)
+        if not complete:
+            self._record_failed_unit(department, term)
+        return courses, False
+    
+    def _fetch(self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False) -> requests.Response:
+        """Fetch a page with timeouts, retrying transient errors with jittered backoff.
+
+        Every attempt honours the circuit breaker and the shared rate limit
+        when one is set. Non-retryable errors (e.g. 404) and the last failed
+        attempt are raised to the caller. With ``stream`` the body is left
+        unread for the caller (and not counted in the byte metrics); only
+        getting the response is retried.
+        """
+        policy = self.retry_policy
+        for attempt in range(policy.max_attempts):
+            self.metrics.increment("sleep_seconds_total", self.circuit_breaker.wait())
+            if self.rate_limiter:
+                self.metrics.increment("sleep_seconds_total", self.rate_limiter.wait())
+            if attempt:
+                self.metrics.increment("retries_total")
+            self.metrics.increment("requests_total")
+            start = time.perf_counter()
+            try:
+                with self.metrics.timer("fetch_seconds"):
+                    response = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+                if not stream:
+                    self.metrics.increment("bytes_fetched_total", len(response.content))
+                elif not response.ok:
+                    response.close()
+                response.raise_for_status()
+            except Exception as e:
+                self.metrics.increment("http_errors_total")
+                retryable = policy.is_retryable(e)
+                self._rate_feedback(time.perf_counter() - start, retryable)
+                if not retryable:
+                    if getattr(e, 'response', None) is not None:
+                        # The server answered, so it is not struggling
+                        self.circuit_breaker.record_success()
+                    raise
+                if self.circuit_breaker.record_failure():
+                    self.metrics.increment("circuit_breaker_trips_total")
+                if attempt + 1 == policy.max_attempts:
+                    raise
+                delay = policy.backoff(attempt, e)
+                logger.warning(f"Fetch failed ({e}), retrying in {delay:.1f}s")
+                self.metrics.sleep(delay)
+                continue
+            self._rate_feedback(time.perf_counter() - start, False)
+            self.circuit_breaker.record_success()
+            return response
+    
+    def _rate_feedback(self, latency: float, overloaded: bool):
+        """Tell the rate limiter how a request went so an adaptive one can adjust"""
+        if self.rate_limiter:
+            decision = self.rate_limiter.record_response(latency, overloaded)
+            if decision > 0:
+                self.metrics.increment("rate_increases_total")
+            elif decision < 0:
+                self.metrics.increment("rate_decreases_total")
+    
+    def _department_urls(self, department: str, term: str) -> List[Tuple[str, str]]:
+        """(pattern, url) pairs to try, in order, for a department's course list.
+
+        The pattern that worked last time goes first, so a department usually
+        costs a single request.
+        """
+        patterns = list(self.URL_PATTERNS)
+        preferred = self.fetch_plan.preferred_pattern(term, department) if self.fetch_plan else None
+        if preferred in patterns:
+            patterns.remove(preferred)
+            patterns.insert(0, preferred)
+        return [
+            (pattern, self.base_url + self.URL_PATTERNS[pattern].format(department=department, term=term))
+            for pattern in patterns
+        ]
+    
+    def _fetch_and_parse(self, url: str, department: str, term: str) -> List[Course]:
+        """Fetch and parse a department page, reusing cached results for unchanged pages"""
+        content_hash, content, courses = self._fetch_page(url, department, term)
+        if courses is None:
+            courses = self._parse_content(content, department, term)
+            self._store_parsed(content_hash, department, term, courses)
+        return courses
+    
+    def _fetch_page(self, url: str, department: str, term: str) -> Tuple[Optional[str], Optional[bytes], Optional[List[Course]]]:
+        """Fetch a department page without parsing it.
+
+        Returns ``(content_hash, content, cached_courses)``. When the response
+        cache already holds parsed courses for this page, ``cached_courses`` is
+        set and the page does not need parsing; otherwise it is None.
+        """
+        if not self.cache:
+            response = self._fetch(url)
+            self._archive_page(url, department, term, response.content)
+            return None, response.content, None
+        
+        entry = self.cache.get(url)
+        response = self._fetch(url, headers=self.cache.conditional_headers(entry))
+        
+        if response.status_code == 304 and entry:
+            rows = self.cache.get_parsed(entry['content_hash'], PARSER_VERSION, department, term)
+            if rows is not None:
+                logger.info(f"{department} page not modified, reusing {len(rows)} cached courses")
+                return entry['content_hash'], None, courses_from_records(rows)
+            # Parsed rows were evicted, so we need the body after all
+            self.metrics.increment("retries_total")
+            response = self._fetch(url)
+        
+        self._archive_page(url, department, term, response.content)
+        content_hash = ResponseCache.content_hash(response.content)
+        self.cache.put(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), content_hash)
+        
+        rows = self.cache.get_parsed(content_hash, PARSER_VERSION, department, term)
+        if rows is not None:
+            logger.info(f"{department} page unchanged, reusing {len(rows)} cached courses")
+            return content_hash, response.content, courses_from_records(rows)
+        
+        return content_hash, response.content, None
+    
+    def _archive_page(self, url: str, department: str, term: str, content: bytes):
+        """Keep a fetched page body for offline re-parsing; archive errors never fail the scrape"""
+        if not self.archive:
+            return
+        try:
+            self.archive.add_page(url, department, term, content)
+        except OSError as e:
+            logger.error(f"Error archiving {url}: {e}")
+    
+    def _store_parsed(self, content_hash: Optional[str], department: str, term: str, courses: List[Course]):
+        """Remember parsed courses for a page body so unchanged pages skip parsing"""
+        if self.cache and content_hash:
+            self.cache.put_parsed(content_hash, PARSER_VERSION, department, term, [
+                {key: value for key, value in asdict(course).items() if key != 'createdAt'}
+                for course in courses
+            ])
+    
+    def _parse_content(self, content: bytes, department: str, term: str) -> List[Course]:
+        """Parse a raw department page with the configured parser backend"""
+        with self.metrics.timer("parse_seconds"):
+            courses = self._parse_with_backend(content, department, term)
+        self.metrics.increment("courses_extracted_total", len(courses))
         return courses
     
+    def _parse_with_backend(self, content: bytes, department: str, term: str) -> List[Course]:
+        if self.parser_backend == "lxml":
+            courses = []
+            rows = 0
+            for code_text, code_href, title, professor_names, info_text in iter_course_rows(content):
+                rows += 1
+                try:
+                    course = self._build_course(code_text, title, professor_names, info_text, department, term,
+                                                code_href)
+                    if course:
+                        courses.append(course)
+                except Exception as e:
+                    logger.error(f"Error parsing course row: {e}")
+            self.metrics.increment("rows_scanned_total", rows)
+            return courses
+        
+        soup = BeautifulSoup(content, 'html.parser')
+        return self._parse_course_page(soup, department, term)
+    
     def _parse_course_page(self, soup: BeautifulSoup, department: str, term: str) -> List[Course]:
         """Parse the course page HTML to extract course information"""
         courses = []
@@ -115,25 +554,29 @@ class WesleyanCourseScraper:
         # Find all table rows that contain course information
         # Based on the HTML structure, courses are in TR elements with 3 TD elements
         course_rows = soup.find_all('tr')
+        rows = 0
         
         for row in course_rows:
             try:
                 # Check if this row has the expected structure (3 columns)
                 cells = row.find_all('td')
                 if len(cells) == 3:
-                    course = self._extract_course_info(row, department, term)
+                    rows += 1
+                    course = self._extract_course_info(row, department, term, cells)
                     if course:
                         courses.append(course)
             except Exception as e:
                 logger.error(f"Error parsing course row: {e}")
                 continue
         
+        self.metrics.increment("rows_scanned_total", rows)
         return courses
     
-    def _extract_course_info(self, row, department: str, term: str) -> Optional[Course]:
+    def _extract_course_info(self, row, department: str, term: str, cells=None) -> Optional[Course]:
         """Extract course information from a single course row"""
         try:
-            cells = row.find_all('td')
+            if cells is None:
+                cells = row.find_all('td')
             if len(cells) != 3:
                 return None
             
@@ -142,109 +585,112 @@ class WesleyanCourseScraper:
             code_link = code_cell.find('a')
             if not code_link:
                 return None
-                
             code_text = code_link.get_text(strip=True)
-            # Extract course code (e.g., "ECON101-01" -> "ECON101")
-            code_match = re.match(rf'({department}\d+)-\d+', code_text)
-            if not code_match:
-                return None
-                
-            code = code_match.group(1)
-            number = code.replace(department, '')
+            code_href = code_link.get('href')
             
             # Second cell: Course title
-            title_cell = cells[1]
-            title = title_cell.get_text(strip=True)
-            if not title:
-                return None
+            title = cells[1].get_text(strip=True)
             
             # Third cell: Professor and schedule info
             info_cell = cells[2]
             info_text = info_cell.get_text(strip=True)
+            professor_names = [prof_link.get_text(strip=True) for prof_link in info_cell.find_all('a')]
             
-            # Extract professor name
-            professor_links = info_cell.find_all('a')
-            professors = []
-            for prof_link in professor_links:
-                prof_name = prof_link.get_text(strip=True)
-                if prof_name and prof_name != "STAFF":
-                    professors.append(prof_name)
-            
-            professor = "; ".join(professors) if professors else "STAFF"
-            
-            # Extract time and location
-            time_location = self._extract_time_location(info_text)
-            time_info = time_location.get('time', '')
-            location_info = time_location.get('location', '')
-            
-            # Determine term name
-            term_name = "Fall 2025" if term == "1259" else "Spring 2026" if term == "1261" else f"Term {term}"
-            
-            # Determine course level based on number
-            level = self._determine_course_level(number)
-            
-            course = Course(
-                id=f"{code}_{term}",
-                code=code,
-                number=number,
-                title=title,
-                department=department,
-                description=title,  # Using title as description for now
-                professor=professor,
-                term=term_name,
-                genEdArea=None,
-                level=level,
-                credits=1.0,  # Most courses are 1 credit
-                prerequisites=None,
-                location=location_info,
-                time=time_info
-            )
-            
-            return course
+            return self._build_course(code_text, title, professor_names, info_text, department, term, code_href)
             
         except Exception as e:
             logger.error(f"Error extracting course info: {e}")
             return None
     
-    def _extract_time_location(self, info_text: str) -> Dict[str, str]:
-        """Extract time and location information from the info text"""
+    def _build_course(self, code_text: str, title: str, professor_names: List[str], info_text: str,
+                      department: str, term: str, code_href: Optional[str] = None) -> Optional[Course]:
+        """Build a Course from the text of a row's code link, title cell and info cell.
+
+        Shared by every parser backend so they all produce identical courses.
+        """
+        # Extract course code (e.g., "ECON101-01" -> "ECON101")
+        code_match = _course_code_pattern(department).match(code_text)
+        if not code_match:
+            return None
+            
+        code, section = code_match.groups()
+        crse_match = _CRSE_PATTERN.search(code_href or '')
+        number = code.replace(department, '')
+        
+        if not title:
+            return None
+        
+        # Extract professor name
+        professors = [name for name in professor_names if name and name != "STAFF"]
+        # Professors, rooms and times repeat across many courses; share one copy
+        professor = sys.intern("; ".join(professors)) if professors else "STAFF"
+        
+        # Extract time and location
+        time_location = self._extract_time_location(info_text)
+        time_info = sys.intern(time_location.get('time', ''))
+        location_info = sys.intern(time_location.get('location', ''))
+        meetings = time_location.get('meetings', [])
+        
+        # Determine term name
+        term_name = "Fall 2025" if term == "1259" else "Spring 2026" if term == "1261" else f"Term {term}"
+        
+        # Determine course level based on number
+        level = self._determine_course_level(number)
+        
+        return Course(
+            id=f"{code}_{term}",
+            code=code,
+            number=number,
+            title=title,
+            department=department,
+            description=title,  # Using title as description for now
+            professor=professor,
+            term=term_name,
+            genEdArea=None,
+            level=level,
+            credits=1.0,  # Most courses are 1 credit
+            prerequisites=None,
+            location=location_info,
+            time=time_info,
+            meetings=meetings,
+            wesmapsId=crse_match.group(1) if crse_match else None,
+            section=sys.intern(section)
+        )
+    
+    def _extract_time_location(self, info_text: str) -> Dict:
+        """Extract time, location and structured meetings from the info text"""
         time_info = ""
         location_info = ""
+        meetings = []
         
         # Look for time patterns (e.g., ".M.W... 01:20PM-02:40PM")
-        time_pattern = r'([.MTRWF]+)\s+(\d{1,2}:\d{2}[AP]M-\d{1,2}:\d{2}[AP]M)'
-        time_matches = re.findall(time_pattern, info_text)
+        time_matches = _TIME_PATTERN.findall(info_text)
         
         if time_matches:
             time_parts = []
-            for days, time_range in time_matches:
-                # Convert day codes to readable format
-                day_map = {
-                    'M': 'Monday',
-                    'T': 'Tuesday', 
-                    'W': 'Wednesday',
-                    'R': 'Thursday',
-                    'F': 'Friday'
-                }
-                readable_days = []
-                for i, char in enumerate(days):
-                    if char in day_map:
-                        readable_days.append(day_map[char])
+            for days, start, end in time_matches:
+                # Days are read by position, as S and U may stand at either end of the week
+                codes = [_DAY_POSITIONS[position] for position, char in enumerate(days) if char != '.']
+                day_str = ", ".join(DAY_NAMES[code] for code in codes) if codes else days
+                time_parts.append(f"{day_str} {start}-{end}")
                 
-                day_str = ", ".join(readable_days) if readable_days else days
-                time_parts.append(f"{day_str} {time_range}")
+                day_mask = 0
+                for code in codes:
+                    day_mask |= DAY_BITS[code]
+                meetings.append({'days': day_mask, 'start': to_minutes(start), 'end': to_minutes(end)})
             
             time_info = "; ".join(time_parts)
         
-        # Look for location patterns (e.g., "FRANK100", "OLIN204")
-        location_pattern = r'\b[A-Z]+\d+\b'
-        location_matches = re.findall(location_pattern, info_text)
+        # Look for location fields (e.g., "FRANK100", "OLIN204"). Only whole
+        # fields count, so course codes mentioned in free text are not rooms
+        location_matches = _LOCATION_PATTERN.findall(info_text)
         if location_matches:
             location_info = ", ".join(location_matches)
         
         return {
             'time': time_info,
-            'location': location_info
+            'location': location_info,
+            'meetings': meetings
         }
     
     def _determine_course_level(self, number: str) -> str:
@@ -260,20 +706,102 @@ class WesleyanCourseScraper:
         except ValueError:
             return "Unknown"
     
-    def scrape_all_courses(self, term: str = "1259") -> List[Course]:
+    def scrape_all_courses(self, term: str = "1259", on_department: Optional[DepartmentCallback] = None) -> List[Course]:
         """Scrape all courses from all departments"""
         all_courses = []
-        departments = self.get_departments()
         
-        logger.info(f"Starting to scrape {len(departments)} departments")
+        logger.info("Starting to scrape departments")
         
-        for i, dept in enumerate(departments, 1):
-            logger.info(f"Scraping department {i}/{len(departments)}: {dept}")
-            courses = self.scrape_department_courses(dept, term)
-            all_courses.extend(courses)
-            
-            # Add delay to be respectful to the server
-            time.sleep(1)
+        # Be respectful to the server: requests are paced by a controller that
+        # speeds up while responses are fast and backs off when they are not
+        self.rate_limiter = self.rate_controller or self._sequential_rate
+        try:
+            for i, dept in enumerate(self.iter_term_departments(term), 1):
+                logger.info(f"Scraping department {i}: {dept}")
+                courses, _ = self._scrape_unit(dept, term)
+                all_courses.extend(courses)
+                if on_department:
+                    on_department(dept, courses)
+        finally:
+            self.rate_limiter = None
+        
+        logger.info(f"Total courses scraped: {len(all_courses)}")
+        return all_courses
+    
+    def _mount_pool(self, max_connections: int):
+        """Keep-alive connection pool sized for the number of concurrent fetchers.
+
+        Retries are handled by ``_fetch`` (with backoff and the circuit
+        breaker), so the adapter itself never retries.
+        """
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, max_retries=0, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def prepare_concurrent_fetching(self, max_connections: int, requests_per_second: float):
+        """Size the connection pool for concurrent workers and cap their shared request rate.
+
+        With a ``rate_controller`` the rate adapts within its limits instead.
+        """
+        self._mount_pool(max_connections)
+        self.rate_limiter = self.rate_controller or RateLimiter(requests_per_second)
+    
+    def scrape_all_courses_async(self, term: str = "1259", max_concurrency: int = 8,
+                                 requests_per_second: float = 4.0,
+                                 on_department: Optional[DepartmentCallback] = None) -> List[Course]:
+        """Scrape all departments concurrently.
+
+        At most ``max_concurrency`` departments are in flight at once and no
+        more than ``requests_per_second`` requests are sent overall. Returns
+        the same course list, in the same order, as ``scrape_all_courses``.
+        """
+        return asyncio.run(self._scrape_all_courses_async(term, max_concurrency, requests_per_second, on_department))
+    
+    async def _scrape_all_courses_async(self, term: str, max_concurrency: int, requests_per_second: float,
+                                        on_department: Optional[DepartmentCallback]) -> List[Course]:
+        logger.info(f"Starting to scrape departments "
+                    f"({max_concurrency} concurrent, {requests_per_second} req/s)")
+        
+        self.prepare_concurrent_fetching(max_concurrency, requests_per_second)
+        
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def scrape(i: int, dept: str, executor: ThreadPoolExecutor) -> List[Course]:
+            async with semaphore:
+                logger.info(f"Scraping department {i}: {dept}")
+                courses, _ = await loop.run_in_executor(executor, self._scrape_unit, dept, term)
+                return courses
+        
+        # Departments are scheduled as discovery yields them; None marks the end
+        scheduled: asyncio.Queue = asyncio.Queue()
+        
+        async def discover(executor: ThreadPoolExecutor):
+            departments = self.iter_term_departments(term)
+            try:
+                i = 0
+                # Discovery blocks on the network, so step the generator off the event loop
+                while (dept := await loop.run_in_executor(None, next, departments, None)) is not None:
+                    i += 1
+                    scheduled.put_nowait((dept, asyncio.ensure_future(scrape(i, dept, executor))))
+            finally:
+                scheduled.put_nowait(None)
+        
+        all_courses = []
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                discovery = asyncio.ensure_future(discover(executor))
+                # Await in department order so the output (and on_department calls)
+                # match the sequential path even though departments finish out of order
+                while (item := await scheduled.get()) is not None:
+                    dept, task = item
+                    courses = await task
+                    all_courses.extend(courses)
+                    if on_department:
+                        on_department(dept, courses)
+                await discovery
+        finally:
+            self.rate_limiter = None
         
         logger.info(f"Total courses scraped: {len(all_courses)}")
         return all_courses
@@ -281,11 +809,49 @@ class WesleyanCourseScraper:
     def save_courses_to_json(self, courses: List[Course], filename: str = "wesleyan_courses.json"):
         """Save courses to JSON file"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            with self.metrics.timer("save_seconds"), open(filename, 'w', encoding='utf-8') as f:
                 json.dump([asdict(course) for course in courses], f, indent=2, ensure_ascii=False)
             logger.info(f"Saved {len(courses)} courses to {filename}")
         except Exception as e:
             logger.error(f"Error saving courses: {e}")
+    
+    def save_courses_to_copy(self, courses: List[Course], filename: str = "courses.csv",
+                             university_id: Optional[str] = None):
+        """Save courses as a Postgres COPY file (.csv or .tsv) plus the staging-table swap script"""
+        try:
+            with self.metrics.timer("save_seconds"):
+                count, script = export_courses(courses, filename, university_id)
+            logger.info(f"Saved {count} courses to {filename}; load them with {script}")
+        except Exception as e:
+            logger.error(f"Error saving courses for COPY: {e}")
+    
+    def save_term_to_catalog(self, courses: List[Course], directory: str, term_name: str,
+                             term_code: Optional[str] = None):
+        """Add (or replace) a term in a multi-term catalog deduplicated across terms"""
+        try:
+            with self.metrics.timer("save_seconds"):
+                TermCatalog(directory).append_term(term_name, courses, term_code)
+        except Exception as e:
+            logger.error(f"Error saving {term_name} to the term catalog: {e}")
+    
+    def save_courses_to_sqlite(self, courses: List[Course], filename: str = "wesleyan_courses.db"):
+        """Upsert courses into an indexed SQLite catalog"""
+        try:
+            with CourseStore(filename) as store:
+                store.upsert_courses(courses)
+        except Exception as e:
+            logger.error(f"Error saving courses to SQLite: {e}")
+    
+    def save_courses_diff(self, courses: List[Course], previous_filename: str, diff_filename: str,
+                          failed_departments: Iterable[str] = ()) -> Dict:
+        """Save only the added/removed/changed courses relative to a previous snapshot.
+
+        Courses of departments that failed to scrape are kept out of ``removed``.
+        """
+        diff = diff_catalogs(load_snapshot(previous_filename), [asdict(course) for course in courses],
+                             missing_departments=failed_departments)
+        save_diff(diff, diff_filename)
+        return diff
 
 def main():
     scraper = WesleyanCourseScraper()
@@ -0,0 +1,210 @@
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from lxml import html
+
+from atomic_file import write_json_atomic
+from course_scraper import Course, WesleyanCourseScraper
+from fast_parser import decode_page
+
+logger = logging.getLogger(__name__)
+
+# Course detail page, relative to the scraper's base URL
+DETAIL_URL_PATTERN = "?stuid=&facid=NONE&crse={crse}&term={term}"
+
+# Bump whenever parse_course_detail output changes so cached details are refetched
+DETAIL_PARSER_VERSION = 1
+
+# Detail pages change rarely within a term, so they are reused for a week by default
+DEFAULT_DETAIL_TTL = 7 * 24 * 60 * 60
+
+# Labelled fields on a detail page; each label is followed by its value
+_CREDITS_PATTERN = re.compile(r'Credits?:\s*([\d.]+)')
+_GEN_ED_PATTERN = re.compile(r'Gen Ed Area(?: Dept)?:\s*([A-Z]{2,4})\b')
+_PREREQUISITES_PATTERN = re.compile(r'Prerequisites?:\s*([^\n]+)')
+_LABEL_PATTERN = re.compile(r'(?:Credits?|Gen Ed Area(?: Dept)?|Prerequisites?|Grading Mode|Course Format|Level):')
+
+# Shortest block of text treated as a course description
+_MIN_DESCRIPTION_LENGTH = 40
+
+
+def merge_sections(courses: List[Course]) -> List[Course]:
+    """Merge section rows sharing an id into one course with every section listed.
+
+    The first section's fields are kept for the course itself, as every other
+    consumer of the catalog already does; ``sections`` collects all of them.
+    A course with a single section stays a plain row without ``sections``.
+    """
+    merged: Dict[str, Course] = {}
+    sections: Dict[str, List[Dict]] = {}
+    for course in courses:
+        if course.id not in merged:
+            merged[course.id] = course
+            sections[course.id] = []
+        # Listings can repeat a section row (nested tables match twice); the
+        # first occurrence of each section number wins
+        listed = sections[course.id]
+        numbers = {section["section"] for section in listed}
+        for section in _own_sections(course):
+            if section["section"] is None or section["section"] not in numbers:
+                listed.append(section)
+                numbers.add(section["section"])
+    return [replace(course, sections=sections[course_id]) if len(sections[course_id]) > 1 else course
+            for course_id, course in merged.items()]
+
+
+def _own_sections(course: Course) -> List[Dict]:
+    """A row's sections: the ones it already merged, or its own fields as one section"""
+    if course.sections is not None:
+        return course.sections
+    return [{"section": course.section, "professor": course.professor, "location": course.location,
+             "time": course.time, "meetings": course.meetings}]
+
+
+def parse_course_detail(content: bytes) -> Dict:
+    """Extract description, gen-ed area, prerequisites and credits from a detail page.
+
+    Missing fields come back as None. The description is the longest block of
+    unlabelled text on the page.
+    """
+    root = html.fromstring(decode_page(content))
+    text = "\n".join(part.strip() for part in root.itertext() if part.strip())
+
+    credits = _CREDITS_PATTERN.search(text)
+    gen_ed = _GEN_ED_PATTERN.search(text)
+    prerequisites = _PREREQUISITES_PATTERN.search(text)
+    prerequisites = prerequisites.group(1).strip() if prerequisites else None
+
+    description = None
+    for block in root.iter("td", "p"):
+        # Only innermost blocks, so a layout table is not mistaken for the description
+        if block.tag == "td" and block.find(".//td") is not None:
+            continue
+        block_text = " ".join(" ".join(block.itertext()).split())
+        if len(block_text) < _MIN_DESCRIPTION_LENGTH or _LABEL_PATTERN.search(block_text):
+            continue
+        if description is None or len(block_text) > len(description):
+            description = block_text
+
+    return {
+        "description": description,
+        "genEdArea": gen_ed.group(1) if gen_ed else None,
+        "prerequisites": None if not prerequisites or prerequisites.lower() == "none" else prerequisites,
+        "credits": float(credits.group(1)) if credits else None,
+    }
+
+
+class DetailCache:
+    """Parsed detail pages stored as ``<cache_dir>/<term>/<wesmapsId>.json``, reused for ``ttl`` seconds"""
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_DETAIL_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def _path(self, term: str, wesmaps_id: str) -> str:
+        return os.path.join(self.cache_dir, term, f"{wesmaps_id}.json")
+
+    def get(self, term: str, wesmaps_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(term, wesmaps_id), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable detail cache entry {wesmaps_id}: {e}")
+            return None
+        if entry.get("version") != DETAIL_PARSER_VERSION or time.time() - entry.get("fetched_at", 0) >= self.ttl:
+            return None
+        return entry["detail"]
+
+    def put(self, term: str, wesmaps_id: str, detail: Dict):
+        term_dir = os.path.join(self.cache_dir, term)
+        os.makedirs(term_dir, exist_ok=True)
+        write_json_atomic(self._path(term, wesmaps_id),
+                          {"version": DETAIL_PARSER_VERSION, "fetched_at": time.time(), "detail": detail},
+                          ensure_ascii=False)
+
+
+class CourseEnricher:
+    """Fill in description, gen-ed area, prerequisites and credits from detail pages.
+
+    Each unique (WesMaps id, term) is fetched once, even when several codes
+    are cross-listed to it, using ``max_workers`` concurrent fetches under
+    the scraper's timeouts, retries and a ``requests_per_second`` cap.
+    Parsed details are cached so later runs only fetch what has expired.
+    """
+
+    def __init__(self, scraper: WesleyanCourseScraper, max_workers: int = 8,
+                 requests_per_second: float = 4.0, cache: Optional[DetailCache] = None):
+        self.scraper = scraper
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self.cache = cache
+
+    @staticmethod
+    def _key(course: Course) -> Optional[Tuple[str, str]]:
+        """(wesmapsId, term code) identifying a course's detail page"""
+        if not course.wesmapsId:
+            return None
+        # Course ids are "<code>_<term code>"
+        return course.wesmapsId, course.id.rsplit("_", 1)[-1]
+
+    def enrich(self, courses: List[Course]) -> List[Course]:
+        keys = list(dict.fromkeys(key for key in map(self._key, courses) if key))
+        details: Dict[Tuple[str, str], Dict] = {}
+        missing = []
+        for key in keys:
+            detail = self.cache.get(key[1], key[0]) if self.cache else None
+            if detail is not None:
+                details[key] = detail
+            else:
+                missing.append(key)
+        self.scraper.metrics.increment("details_cached_total", len(details))
+        logger.info(f"Enriching {len(courses)} courses: {len(keys)} detail pages, "
+                    f"{len(details)} cached, {len(missing)} to fetch")
+
+        if missing:
+            self.scraper.prepare_concurrent_fetching(self.max_workers, self.requests_per_second)
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    for key, detail in zip(missing, executor.map(self._fetch_detail, missing)):
+                        if detail is not None:
+                            details[key] = detail
+            finally:
+                self.scraper.rate_limiter = None
+
+        return [self._apply(course, details.get(self._key(course))) for course in courses]
+
+    def _fetch_detail(self, key: Tuple[str, str]) -> Optional[Dict]:
+        wesmaps_id, term = key
+        url = self.scraper.base_url + DETAIL_URL_PATTERN.format(crse=wesmaps_id, term=term)
+        try:
+            response = self.scraper._fetch(url)
+            with self.scraper.metrics.timer("detail_parse_seconds"):
+                detail = parse_course_detail(response.content)
+        except Exception as e:
+            logger.error(f"Error fetching details for course {wesmaps_id}: {e}")
+            self.scraper.metrics.increment("detail_errors_total")
+            return None
+        self.scraper.metrics.increment("details_fetched_total")
+        if self.cache:
+            self.cache.put(term, wesmaps_id, detail)
+        return detail
+
+    @staticmethod
+    def _apply(course: Course, detail: Optional[Dict]) -> Course:
+        if not detail:
+            return course
+        return replace(
+            course,
+            description=detail["description"] or course.description,
+            genEdArea=detail["genEdArea"] or course.genEdArea,
+            prerequisites=detail["prerequisites"] or course.prerequisites,
+            credits=detail["credits"] if detail["credits"] is not None else course.credits,
+        )
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Fast Course Page Parser
+lxml-based backend for WesleyanCourseScraper that only walks course-table rows.
+Run it against a saved page to check it matches the BeautifulSoup backend:
+
+    python fast_parser.py sample_page.html ECON 1259
+"""
+
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from bs4 import UnicodeDammit
+from lxml import etree, html
+
+# Compiled once; every row and cell reuses them
+_ROWS = etree.XPath("//tr")
+_CELLS = etree.XPath(".//td")
+_LINKS = etree.XPath(".//a")
+_TEXT = etree.XPath(".//text()")
+
+
+def _text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)"""
+    return "".join(text.strip() for text in _TEXT(element))
+
+
+def decode_page(content: bytes) -> str:
+    """Decode a page the way BeautifulSoup would, with a fast path for UTF-8"""
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return UnicodeDammit(content, is_html=True).unicode_markup
+
+
+def iter_course_rows(content: bytes) -> Iterator[Tuple[str, Optional[str], str, List[str], str]]:
+    """Yield (code text, code link href, title, professor names, info text) for every course row.
+
+    A course row is a <tr> with exactly three <td> descendants whose first cell
+    holds a link, which is the same rule the BeautifulSoup backend applies.
+    """
+    root = html.fromstring(decode_page(content))
+    for row in _ROWS(root):
+        cells = _CELLS(row)
+        if len(cells) != 3:
+            continue
+        code_links = _LINKS(cells[0])
+        if not code_links:
+            continue
+        info_cell = cells[2]
+        yield (
+            _text(code_links[0]),
+            code_links[0].get("href"),
+            _text(cells[1]),
+            [_text(link) for link in _LINKS(info_cell)],
+            _text(info_cell),
+        )
+
+
+def main():
+    """Check the lxml backend against the BeautifulSoup backend and time both"""
+    from dataclasses import asdict
+    from course_scraper import WesleyanCourseScraper
+
+    filename = sys.argv[1] if len(sys.argv) > 1 else "sample_page.html"
+    department = sys.argv[2] if len(sys.argv) > 2 else "ECON"
+    term = sys.argv[3] if len(sys.argv) > 3 else "1259"
+    rounds = 50
+
+    with open(filename, "rb") as f:
+        content = f.read()
+
+    results = {}
+    for backend in ("bs4", "lxml"):
+        scraper = WesleyanCourseScraper(parser_backend=backend)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            courses = scraper._parse_content(content, department, term)
+        elapsed = (time.perf_counter() - start) / rounds
+        results[backend] = [{**asdict(course), "createdAt": None} for course in courses]
+        print(f"{backend:>5}: {len(courses)} courses, {elapsed * 1000:.2f} ms per page")
+
+    if results["bs4"] != results["lxml"]:
+        print("❌ Backends produced different courses")
+        sys.exit(1)
+    print("✅ Backends produced identical courses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+from typing import Dict, Optional
+import logging
+
+from atomic_file import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Negative results are re-probed after a week by default
+DEFAULT_EMPTY_TTL = 7 * 24 * 60 * 60
+
+
+class FetchPlan:
+    """Persisted memory of how each (term, department) was last fetched.
+
+    Records which URL pattern produced courses, so the next run tries it
+    first, and which departments had no offerings, so they are skipped
+    entirely until the negative result expires after ``empty_ttl`` seconds.
+
+    Stored as one JSON object keyed by ``"<term>/<department>"``.
+    """
+
+    def __init__(self, filename: str, empty_ttl: float = DEFAULT_EMPTY_TTL):
+        self.filename = filename
+        self.empty_ttl = empty_ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fetch plan {self.filename}: {e}")
+            return {}
+
+    @staticmethod
+    def _key(term: str, department: str) -> str:
+        return f"{term}/{department}"
+
+    def preferred_pattern(self, term: str, department: str) -> Optional[str]:
+        """The URL pattern that last produced courses for this unit, if any"""
+        with self._lock:
+            entry = self._entries.get(self._key(term, department))
+        return entry.get("pattern") if entry else None
+
+    def is_known_empty(self, term: str, department: str) -> bool:
+        """True if the department had no courses recently enough to skip it"""
+        with self._lock:
+            entry = self._entries.get(self._key(term, department))
+        if not entry or "empty_since" not in entry:
+            return False
+        return time.time() - entry["empty_since"] < self.empty_ttl
+
+    def record_pattern(self, term: str, department: str, pattern: str):
+        """Remember the pattern that worked for this unit"""
+        self._update(term, department, {"pattern": pattern, "checked_at": time.time()})
+
+    def record_empty(self, term: str, department: str):
+        """Remember that every pattern came back without courses"""
+        self._update(term, department, {"empty_since": time.time(), "checked_at": time.time()})
+
+    def _update(self, term: str, department: str, entry: Dict):
+        with self._lock:
+            self._entries[self._key(term, department)] = entry
+            self._save()
+
+    def _save(self):
+        write_json_atomic(self.filename, self._entries, indent=2, sort_keys=True)
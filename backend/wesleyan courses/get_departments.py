@@ -1,47 +1,175 @@
 import requests
-from bs4 import BeautifulSoup
 import re
+import json
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import logging
 
-def get_all_departments():
-    """Get all department codes from the main WesMaps page"""
-    url = "https://owaprod-pub.wesleyan.edu/reg/!wesmaps_page.html"
-    
+from atomic_file import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+WESMAPS_URL = "https://owaprod-pub.wesleyan.edu/reg/!wesmaps_page.html"
+
+# Department codes appear in link targets (subj_page=DEPT or crse_list=DEPT)
+# and as the text of course links (<a href="...crse=009187...">ECON101-01</a>).
+# Other markup, attributes and page text are not scanned. Every part is
+# bounded, so no match is longer than _LOOKAHEAD
+_DEPARTMENT_PATTERN = re.compile(
+    r'<[aA]\s[^>]{0,400}?(?:subj_page|crse_list)=([A-Z]{2,4})'
+    r'|<[aA]\s[^>]{0,400}?crse=\d{1,10}[^>]{0,400}>\s{0,20}([A-Z]{2,4})\d{3}\b'
+)
+
+# Characters kept unscanned at the end of the buffer so a match is never cut
+# by a chunk boundary (longer than any match), and characters kept before
+# the scan position for context
+_LOOKAHEAD = 1024
+_LOOKBEHIND = 8
+
+# Discovered departments are reused for a day by default
+DEFAULT_DEPARTMENT_TTL = 24 * 60 * 60
+
+
+class DepartmentCache:
+    """Discovered department codes, reused until they are ``ttl`` seconds old"""
+
+    def __init__(self, filename: str = ".departments_cache.json", ttl: float = DEFAULT_DEPARTMENT_TTL):
+        self.filename = filename
+        self.ttl = ttl
+
+    def _load(self) -> Optional[dict]:
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable department cache {self.filename}: {e}")
+            return None
+
+    def fresh(self) -> Optional[List[str]]:
+        """Cached departments if they are still within the TTL"""
+        entry = self._load()
+        if entry and time.time() - entry.get("discovered_at", 0) < self.ttl:
+            return entry["departments"]
+        return None
+
+    def known(self) -> List[str]:
+        """Cached departments regardless of age (empty on a cold start)"""
+        entry = self._load()
+        return entry["departments"] if entry else []
+
+    def save(self, departments: List[str]):
+        write_json_atomic(self.filename, {"discovered_at": time.time(), "departments": departments}, indent=2)
+
+
+def _scan(buffer: str, pos: int, limit: int) -> Tuple[List[str], int]:
+    """Department codes matched in buffer[pos:limit], and where the next scan starts"""
+    found = []
+    for match in _DEPARTMENT_PATTERN.finditer(buffer, pos):
+        if match.end() > limit:
+            return found, match.start()
+        found.append(match.group(1) or match.group(2))
+        pos = match.end()
+    return found, max(pos, limit)
+
+
+def iter_page_departments(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Yield each department code the first time it appears in a streamed page"""
+    seen = set()
+    buffer, pos = "", 0
+    for chunk in chunks:
+        # Codes are ASCII, and latin-1 never fails to decode a chunk boundary
+        buffer += chunk.decode("latin-1")
+        found, pos = _scan(buffer, pos, len(buffer) - _LOOKAHEAD)
+        for dept in found:
+            if dept not in seen:
+                seen.add(dept)
+                yield dept
+        drop = max(0, pos - _LOOKBEHIND)
+        buffer, pos = buffer[drop:], pos - drop
+    found, _ = _scan(buffer, pos, len(buffer))
+    for dept in found:
+        if dept not in seen:
+            seen.add(dept)
+            yield dept
+
+
+def discover_departments(session: Optional[requests.Session] = None, url: str = WESMAPS_URL,
+                         timeout: Tuple[float, float] = (5.0, 30.0), chunk_size: int = 16384,
+                         fetch: Optional[Callable[[str], requests.Response]] = None) -> Iterator[str]:
+    """Stream the WesMaps landing page, yielding department codes as they arrive.
+
+    ``fetch`` opens the streamed response (e.g. the scraper's retrying,
+    rate-limited fetch); by default the page is requested with ``session``.
+    """
+    if fetch is None:
+        session = session or _new_session()
+        response = session.get(url, stream=True, timeout=timeout)
+        response.raise_for_status()
+    else:
+        response = fetch(url)
+    with response:
+        yield from iter_page_departments(response.iter_content(chunk_size))
+
+
+def stream_departments(cache: Optional[DepartmentCache] = None, session: Optional[requests.Session] = None,
+                       url: str = WESMAPS_URL, timeout: Tuple[float, float] = (5.0, 30.0),
+                       fetch: Optional[Callable[[str], requests.Response]] = None,
+                       fallback: Optional[Callable[[], Iterable[str]]] = None) -> Iterator[str]:
+    """Department codes to scrape, yielded as soon as they are known.
+
+    A fresh cache is used as is. Otherwise the landing page is streamed:
+    departments missing from the (stale or empty) cache are yielded the
+    moment they are found, so they are scraped first, and the ones already
+    known follow once discovery finishes. If discovery fails, even part way
+    through the page, the stale cache and then ``fallback()`` fill in the
+    departments not yielded yet.
+    """
+    if cache:
+        cached = cache.fresh()
+        if cached is not None:
+            logger.info(f"Using {len(cached)} cached departments")
+            yield from cached
+            return
+    known = set(cache.known()) if cache else set()
+
+    discovered, deferred = [], []
+    try:
+        for dept in discover_departments(session, url, timeout, fetch=fetch):
+            discovered.append(dept)
+            if dept in known:
+                deferred.append(dept)
+            else:
+                yield dept
+    except Exception as e:
+        logger.error(f"Error discovering departments after {len(discovered)} were found: {e}")
+        remaining = sorted(known) + list(fallback() if fallback else [])
+        yielded = set(discovered) - set(deferred)
+        for dept in dict.fromkeys(remaining):
+            if dept not in yielded:
+                yield dept
+        return
+
+    logger.info(f"Discovered {len(discovered)} departments "
+                f"({len(discovered) - len(deferred)} not in the cache)")
+    yield from deferred
+    if cache and discovered:
+        cache.save(discovered)
+
+
+def _new_session() -> requests.Session:
     session = requests.Session()
     session.headers.update({
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     })
-    
+    return session
+
+
+def get_all_departments():
+    """Get all department codes from the main WesMaps page"""
     try:
-        response = session.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for department links in the page
-        departments = set()
-        
-        # Find all links that might be department links
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            href = link['href']
-            # Look for patterns like subj_page=DEPT or crse_list=DEPT
-            dept_match = re.search(r'(?:subj_page|crse_list)=([A-Z]{2,4})', href)
-            if dept_match:
-                dept = dept_match.group(1)
-                if len(dept) >= 2 and len(dept) <= 4:
-                    departments.add(dept)
-        
-        # Also look for department codes in the text
-        text_content = soup.get_text()
-        dept_codes = re.findall(r'\b[A-Z]{2,4}\d{3}\b', text_content)
-        for code in dept_codes:
-            match = re.match(r'([A-Z]{2,4})\d{3}', code)
-            if match:
-                dept = match.group(1)
-                departments.add(dept)
-        
-        return sorted(list(departments))
-        
+        return sorted(discover_departments())
     except Exception as e:
         print(f"Error getting departments: {e}")
         return []
@@ -51,10 +179,10 @@ if __name__ == "__main__":
     print(f"Found {len(departments)} departments:")
     for dept in departments:
         print(f"  {dept}")
-    
+
     # Save to file
     with open("departments.txt", "w") as f:
         for dept in departments:
             f.write(f"{dept}\n")
-    
-    print(f"\nSaved departments to departments.txt") 
\ No newline at end of file
+
+    print(f"\nSaved departments to departments.txt")
@@ -0,0 +1,211 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+import logging
+
+from atomic_file import write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Prefix for every exported Prometheus metric
+PROMETHEUS_PREFIX = "wesmaps_scrape_"
+
+HELP = {
+    "fetch_seconds": "HTTP request latency, including reading the body",
+    "department_seconds": "Time to scrape one department, across every URL pattern tried",
+    "parse_seconds": "Time to parse one department page",
+    "save_seconds": "Time to write a JSON output file",
+    "requests_total": "HTTP requests sent",
+    "http_errors_total": "HTTP requests that failed or returned an error status",
+    "bytes_fetched_total": "Response body bytes received",
+    "rows_scanned_total": "Candidate course rows examined by the parser",
+    "courses_extracted_total": "Courses built from scanned rows",
+    "retries_total": "Requests re-issued (backoff retry, next URL pattern or cache refetch)",
+    "circuit_breaker_trips_total": "Times repeated failures paused all requests",
+    "details_fetched_total": "Course detail pages fetched for enrichment",
+    "details_cached_total": "Course details reused from the detail cache",
+    "detail_errors_total": "Course detail pages that could not be fetched or parsed",
+    "detail_parse_seconds": "Time to parse one course detail page",
+    "rate_increases_total": "Times the adaptive rate controller raised the request rate",
+    "rate_decreases_total": "Times the adaptive rate controller cut the request rate",
+    "sleep_seconds_total": "Time spent deliberately sleeping (rate limiting and retry backoff)",
+}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: Dict):
+        """Add in a histogram exported by ``to_dict`` (e.g. from a worker process)"""
+        for i, count in enumerate(other["counts"]):
+            self.counts[i] += count
+        self.count += other["count"]
+        self.sum += other["sum"]
+        for bound, pick in (("min", min), ("max", max)):
+            if other[bound] is not None:
+                current = getattr(self, bound)
+                setattr(self, bound, other[bound] if current is None else pick(current, other[bound]))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+        }
+
+
+class ScrapeMetrics:
+    """Thread-safe counters and latency histograms for one scrape run.
+
+    Exported at the end of a run as a JSON report (``write_json``) and a
+    Prometheus text file (``write_prometheus``), so runs can be compared to
+    spot regressions in network latency, parsing or politeness delays.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.info: Dict[str, str] = {}
+
+    def increment(self, name: str, amount: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Observe the duration of the ``with`` block in histogram ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def sleep(self, seconds: float):
+        """Sleep, counting the time towards sleep_seconds_total"""
+        if seconds > 0:
+            time.sleep(seconds)
+            self.increment("sleep_seconds_total", seconds)
+
+    def set_info(self, **labels: str):
+        """Attach run details (engine, parser, terms) to the report"""
+        with self._lock:
+            self.info.update({key: str(value) for key, value in labels.items()})
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "started_at": self._started,
+                "duration_seconds": time.time() - self._started,
+                "info": dict(self.info),
+                "counters": dict(self.counters),
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+    def merge(self, snapshot: Dict):
+        """Fold in counters and histograms recorded elsewhere, e.g. in a parser process"""
+        with self._lock:
+            for name, value in snapshot["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, data in snapshot["histograms"].items():
+                self.histograms.setdefault(name, Histogram(tuple(data["buckets"]))).merge(data)
+
+    def write_json(self, filename: str):
+        write_text_atomic(filename, json.dumps(self.snapshot(), indent=2, sort_keys=True) + "\n")
+        logger.info(f"Wrote scrape metrics to {filename}")
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        labels = ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(snapshot["info"].items()))
+        lines += [f"# HELP {PROMETHEUS_PREFIX}info Scrape run details",
+                  f"# TYPE {PROMETHEUS_PREFIX}info gauge",
+                  f"{PROMETHEUS_PREFIX}info{{{labels}}} 1"]
+        for name, help_text in (("duration_seconds", "Wall-clock duration of the run"),
+                                ("started_at_seconds", "Unix time the run started")):
+            value = snapshot["duration_seconds"] if name == "duration_seconds" else snapshot["started_at"]
+            lines += [f"# HELP {PROMETHEUS_PREFIX}{name} {help_text}",
+                      f"# TYPE {PROMETHEUS_PREFIX}{name} gauge",
+                      f"{PROMETHEUS_PREFIX}{name} {_number(value)}"]
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = PROMETHEUS_PREFIX + name
+            lines += [f"# HELP {metric} {HELP.get(name, name)}",
+                      f"# TYPE {metric} counter",
+                      f"{metric} {_number(value)}"]
+        for name, data in sorted(snapshot["histograms"].items()):
+            metric = PROMETHEUS_PREFIX + name
+            lines += [f"# HELP {metric} {HELP.get(name, name)}",
+                      f"# TYPE {metric} histogram"]
+            cumulative = 0
+            for bound, count in zip(data["buckets"] + ["+Inf"], data["counts"]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines += [f"{metric}_sum {_number(data['sum'])}",
+                      f"{metric}_count {data['count']}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, filename: str):
+        """Write the Prometheus text exposition format, e.g. for node_exporter's textfile collector"""
+        write_text_atomic(filename, self.to_prometheus())
+        logger.info(f"Wrote Prometheus metrics to {filename}")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
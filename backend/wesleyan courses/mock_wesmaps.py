@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Mock WesMaps Server
+Serves a synthetic WesMaps locally, so the scraper can be benchmarked and
+exercised without touching the real site. Every department page is
+sample_page.html with ECON replaced by the department code.
+
+    python mock_wesmaps.py --port 8765 --latency-ms 50 --error-rate 0.02
+    python scrape_all_courses.py ...   # with base_url pointed at http://127.0.0.1:8765/reg/!wesmaps_page.html
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Department code in sample_page.html, replaced per department
+SAMPLE_DEPARTMENT = b"ECON"
+
+DETAIL_PAGE = """<html><body><table><tr><td>
+<p>{description}</p>
+<p>Credit: 1.00</p><p>Gen Ed Area Dept: SBS {department}</p><p>Prerequisites: None</p>
+</td></tr></table></body></html>"""
+
+
+class MockWesMaps:
+    """Threaded local HTTP server imitating the WesMaps pages the scraper reads.
+
+    Serves the landing page (linking every department), department course
+    lists for both URL patterns, and course detail pages. Each request
+    waits ``latency`` seconds (plus up to ``jitter`` more), and a fraction
+    ``error_rate`` of requests fail with a 503, chosen by a seeded random
+    generator so runs are repeatable. Unknown departments get a 404.
+    """
+
+    def __init__(self, departments: List[str], sample_filename: str = "sample_page.html",
+                 port: int = 0, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0):
+        with open(sample_filename, "rb") as f:
+            self.sample = f.read()
+        self.departments = list(departments)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._pages: Dict[str, bytes] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        """Value for WesleyanCourseScraper.base_url"""
+        return f"http://127.0.0.1:{self.port}/reg/!wesmaps_page.html"
+
+    def start(self) -> "MockWesMaps":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockWesMaps":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def department_page(self, department: str) -> bytes:
+        """Synthesized course list for a department (built once, then reused)"""
+        page = self._pages.get(department)
+        if page is None:
+            page = self._pages[department] = self.sample.replace(SAMPLE_DEPARTMENT, department.encode("ascii"))
+        return page
+
+    def landing_page(self) -> bytes:
+        links = "\n".join(f'<a href="!wesmaps_page.html?stuid=&facid=NONE&subj_page={dept}&term=1259">{dept}</a>'
+                          for dept in self.departments)
+        return f"<html><body>{links}</body></html>".encode("ascii")
+
+    def respond(self, path: str):
+        """(status, body) for a request path, after the configured latency and error injection"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            return 503, b"Service Unavailable"
+
+        query = parse_qs(urlparse(path).query)
+        department = (query.get("subj_page") or query.get("crse_list") or [None])[0]
+        if department is not None:
+            if department not in self.departments:
+                return 404, b"Not Found"
+            return 200, self.department_page(department)
+        if "crse" in query:
+            description = f"Synthetic description of course {query['crse'][0]} for benchmarking the scraper."
+            return 200, DETAIL_PAGE.format(description=description, department="ECON").encode("ascii")
+        return 200, self.landing_page()
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed ACKs add ~40 ms per response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, body = mock.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=iso-8859-1")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def read_departments(filename: str = "departments.txt") -> List[str]:
+    with open(filename, "r") as f:
+        return [line.strip() for line in f if re.fullmatch(r"[A-Z]{2,4}", line.strip())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic WesMaps for local testing")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--departments", default="departments.txt", help="Department codes to serve")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockWesMaps(read_departments(args.departments), port=args.port, latency=args.latency_ms / 1000,
+                       jitter=args.jitter_ms / 1000, error_rate=args.error_rate, seed=args.seed)
+    print(f"Serving {len(mock.departments)} departments at {mock.base_url} (Ctrl-C to stop)")
+    try:
+        mock._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import json
+import os
+from dataclasses import asdict
+from typing import Dict, Iterable, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class NDJSONWriter:
+    """Stream courses to a newline-delimited JSON file as they are scraped.
+
+    Lines go to ``<filename>.partial`` and are flushed after every
+    department, so a crash keeps everything scraped so far. ``finalize``
+    atomically renames the partial file into place, and can also build the
+    legacy indented JSON array from it.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.partial_filename = f"{filename}.partial"
+        self.count = 0
+        self._file = open(self.partial_filename, "w", encoding="utf-8")
+
+    def write_courses(self, courses: Iterable) -> int:
+        """Append one department's courses and flush them to disk"""
+        written = 0
+        for course in courses:
+            self._file.write(json.dumps(asdict(course), ensure_ascii=False))
+            self._file.write("\n")
+            written += 1
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.count += written
+        return written
+
+    def finalize(self, legacy_json_filename: Optional[str] = None):
+        """Move the finished file into place, optionally writing the legacy JSON array too"""
+        self._file.close()
+        os.replace(self.partial_filename, self.filename)
+        logger.info(f"Saved {self.count} courses to {self.filename}")
+        if legacy_json_filename:
+            ndjson_to_json_array(self.filename, legacy_json_filename)
+
+    def close(self):
+        """Close without finalizing, leaving the partial file for inspection or resume"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Only a clean exit finalizes; otherwise the .partial file is left as-is
+        if exc_type is None and not self._file.closed:
+            self.finalize()
+        else:
+            self.close()
+        return False
+
+
+def iter_ndjson(filename: str) -> Iterator[Dict]:
+    """Yield course records from an NDJSON file one line at a time"""
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def ndjson_to_json_array(ndjson_filename: str, json_filename: str) -> int:
+    """Stream an NDJSON file into the legacy indented JSON array format.
+
+    The output is byte-identical to ``json.dump(records, f, indent=2,
+    ensure_ascii=False)`` but never holds more than one record in memory.
+    """
+    tmp_filename = f"{json_filename}.partial"
+    count = 0
+    with open(tmp_filename, "w", encoding="utf-8") as out:
+        for record in iter_ndjson(ndjson_filename):
+            out.write("[\n" if count == 0 else ",\n")
+            body = json.dumps(record, indent=2, ensure_ascii=False)
+            out.write("\n".join(f"  {line}" for line in body.split("\n")))
+            count += 1
+        out.write("\n]" if count else "[]")
+    os.replace(tmp_filename, json_filename)
+    logger.info(f"Saved {count} courses to {json_filename}")
+    return count
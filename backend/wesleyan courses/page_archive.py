@@ -0,0 +1,138 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DATA_FILENAME = "pages.zz"
+INDEX_FILENAME = "index.ndjson"
+
+# Pages are HTML and compress well; higher levels cost fetch-time CPU for little gain
+COMPRESSION_LEVEL = 6
+
+
+class PageArchive:
+    """Append-only archive of every department page fetched, for offline re-parsing.
+
+    Page bodies are zlib-compressed and appended to ``pages.zz``; each fetch
+    appends one line to ``index.ndjson`` with its URL, term, department,
+    fetch time and the byte range of its body. A body identical to one
+    already stored is not written again, its index line just points at the
+    stored copy. Scrape runs also append a ``run`` line with the order the
+    departments of a term were scraped in and the run's createdAt stamp, so
+    ``reparse.py`` can rebuild the exact output.
+
+    Nothing is ever rewritten: a crash can at worst leave unindexed bytes at
+    the end of ``pages.zz`` or a torn last index line, both of which are
+    ignored.
+
+    Layout::
+
+        <directory>/pages.zz        concatenated zlib streams
+        <directory>/index.ndjson    {"kind": "page", "url", "term", "department", "fetched_at",
+                                     "offset", "length", "size", "sha256"}
+                                    {"kind": "run", "term", "term_name", "departments",
+                                     "run_timestamp", "recorded_at"}
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.data_path = os.path.join(directory, DATA_FILENAME)
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._stored: Optional[Dict[str, Dict]] = None
+
+    def _open_for_append(self):
+        """Load the content hashes already stored, the first time something is appended"""
+        if self._stored is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._stored = {entry["sha256"]: entry for entry in self.pages()}
+
+    def add_page(self, url: str, department: str, term: str, content: bytes,
+                 fetched_at: Optional[float] = None):
+        """Append a fetched page body (thread-safe)"""
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            self._open_for_append()
+            stored = self._stored.get(digest)
+            if stored is None:
+                blob = zlib.compress(content, COMPRESSION_LEVEL)
+                with open(self.data_path, "ab") as f:
+                    offset = f.tell()
+                    f.write(blob)
+                    f.flush()
+                    os.fsync(f.fileno())
+                stored = {"offset": offset, "length": len(blob)}
+            entry = {
+                "kind": "page",
+                "url": url,
+                "term": term,
+                "department": department,
+                "fetched_at": time.time() if fetched_at is None else fetched_at,
+                "offset": stored["offset"],
+                "length": stored["length"],
+                "size": len(content),
+                "sha256": digest,
+            }
+            self._append_index(entry)
+            self._stored[digest] = entry
+
+    def record_run(self, term: str, term_name: str, departments: List[str], run_timestamp: str):
+        """Note the department order and createdAt stamp of a finished term scrape"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._append_index({
+                "kind": "run",
+                "term": term,
+                "term_name": term_name,
+                "departments": departments,
+                "run_timestamp": run_timestamp,
+                "recorded_at": time.time(),
+            })
+
+    def _append_index(self, entry: Dict):
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self, until: Optional[float] = None) -> Iterator[Dict]:
+        """Index entries in the order they were appended, optionally only those up to ``until``"""
+        try:
+            f = open(self.index_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping torn line {line_number} of {self.index_path}")
+                    continue
+                stamp = entry["fetched_at"] if entry["kind"] == "page" else entry["recorded_at"]
+                if until is None or stamp <= until:
+                    yield entry
+
+    def pages(self, until: Optional[float] = None) -> Iterator[Dict]:
+        return (entry for entry in self.entries(until) if entry["kind"] == "page")
+
+    def open_data(self) -> Optional[mmap.mmap]:
+        """Memory-map the page data read-only (None while the archive is empty)"""
+        try:
+            with open(self.data_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+
+def read_page(data: mmap.mmap, offset: int, length: int) -> bytes:
+    """Decompress one archived page body from the mapped data file"""
+    return zlib.decompress(data[offset:offset + length])
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Pipelined Scraper
+Fetcher threads download department pages onto a bounded queue while a
+process pool parses them, so network waits and parsing overlap and parsing
+scales across cores instead of being capped by the GIL.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import course_scraper
+from course_scraper import Course, DepartmentCallback, WesleyanCourseScraper
+from metrics import ScrapeMetrics
+
+logger = logging.getLogger(__name__)
+
+# Scraper instance owned by each parser worker process
+_worker_scraper: Optional[WesleyanCourseScraper] = None
+
+
+def _init_parser_worker(parser_backend: str, run_started_at: str):
+    global _worker_scraper
+    # Courses parsed here are stamped like the ones parsed in the parent
+    course_scraper.RUN_STARTED_AT = run_started_at
+    _worker_scraper = WesleyanCourseScraper(parser_backend=parser_backend)
+
+
+def _parse_in_worker(content: bytes, department: str, term: str) -> Tuple[List[Course], Dict]:
+    """Parse a page, returning the courses and the parse metrics recorded for it"""
+    _worker_scraper.metrics = ScrapeMetrics()
+    courses = _worker_scraper._parse_content(content, department, term)
+    return courses, _worker_scraper.metrics.snapshot()
+
+
+class ScrapePipeline:
+    """Producer/consumer scrape of every department for a term.
+
+    ``fetch_workers`` threads fetch pages and push the raw bytes onto a queue
+    holding at most ``queue_size`` pages; fetchers block when it is full. A
+    dispatcher hands pages to ``parse_workers`` processes and never keeps more
+    than ``2 * parse_workers`` parses outstanding, so memory stays flat no
+    matter how far the fetchers could run ahead.
+
+    Departments are scheduled as ``iter_departments`` yields them, so
+    fetching starts while discovery is still running.
+
+    Each department still tries its URL patterns in order: a page that
+    parses to no courses sends the department back to the fetchers for the
+    next pattern. Results come back in department order, matching
+    ``scrape_all_courses``.
+    """
+
+    def __init__(self, scraper: WesleyanCourseScraper, fetch_workers: int = 8,
+                 parse_workers: Optional[int] = None, queue_size: int = 16,
+                 requests_per_second: float = 4.0):
+        self.scraper = scraper
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.requests_per_second = requests_per_second
+
+    def run(self, term: str = "1259", on_department: Optional[DepartmentCallback] = None) -> List[Course]:
+        logger.info(f"Starting pipelined scrape "
+                    f"({self.fetch_workers} fetchers, {self.parse_workers} parsers)")
+
+        self.scraper.prepare_concurrent_fetching(self.fetch_workers, self.requests_per_second)
+        self._term = term
+        self._work = queue.Queue()
+        self._pages = queue.Queue(maxsize=self.queue_size)
+        self._parse_slots = threading.BoundedSemaphore(2 * self.parse_workers)
+        self._results: Dict[int, List[Course]] = {}
+        self._remaining = 0
+        self._departments: List[str] = []
+        self._discovering = True
+        self._on_department = on_department
+        self._next_emit = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started: Dict[int, float] = {}
+
+        fetchers = [threading.Thread(target=self._fetch_loop, daemon=True) for _ in range(self.fetch_workers)]
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers, initializer=_init_parser_worker,
+                                     initargs=(self.scraper.parser_backend, course_scraper.RUN_STARTED_AT)) as pool:
+                self._pool = pool
+                dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+                dispatcher.start()
+                for fetcher in fetchers:
+                    fetcher.start()
+
+                # Feed departments to the fetchers as discovery yields them
+                try:
+                    for dept in self.scraper.iter_term_departments(term):
+                        self._schedule(dept)
+                finally:
+                    with self._lock:
+                        self._discovering = False
+                        if self._remaining == 0:
+                            self._done.set()
+
+                self._done.wait()
+
+                # Everything is finished; release the fetchers and dispatcher
+                for _ in fetchers:
+                    self._work.put(None)
+                self._pages.put(None)
+                dispatcher.join()
+                for fetcher in fetchers:
+                    fetcher.join()
+        finally:
+            self.scraper.rate_limiter = None
+
+        all_courses = [course for index in range(len(self._departments)) for course in self._results.get(index, [])]
+        logger.info(f"Total courses scraped: {len(all_courses)}")
+        return all_courses
+
+    def _schedule(self, dept: str):
+        """Queue a newly discovered department, or record its stored result"""
+        with self._lock:
+            index = len(self._departments)
+            self._departments.append(dept)
+            self._remaining += 1
+        term = self._term
+        courses = self.scraper._load_checkpoint(dept, term)
+        if courses is not None:
+            logger.info(f"Resuming {dept}: {len(courses)} courses from checkpoint")
+            self._record_result(index, courses)
+        elif self.scraper._is_known_empty(dept, term):
+            logger.info(f"Skipping {dept}: no courses on its last check")
+            self._record_result(index, [])
+        else:
+            self._work.put((index, dept, 0, False))
+
+    def _fetch_loop(self):
+        """Fetcher thread: download pages and queue them for parsing"""
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            index, dept, pattern, failed = item
+            if pattern:
+                self.scraper.metrics.increment("retries_total")
+            else:
+                self._started[index] = time.perf_counter()
+            _, url = self.scraper._department_urls(dept, self._term)[pattern]
+            try:
+                logger.info(f"Scraping {dept} courses from: {url}")
+                content_hash, content, cached = self.scraper._fetch_page(url, dept, self._term)
+            except Exception as e:
+                logger.error(f"Error scraping {dept}: {e}")
+                self._finish_page(index, dept, pattern, [], True)
+                continue
+
+            if cached is not None:
+                self._finish_page(index, dept, pattern, cached, failed)
+            else:
+                # Blocks while the queue is full, which is what keeps memory flat
+                self._pages.put((index, dept, pattern, failed, content_hash, content))
+
+    def _dispatch_loop(self):
+        """Dispatcher thread: hand queued pages to the parser processes"""
+        while True:
+            item = self._pages.get()
+            if item is None:
+                return
+            index, dept, pattern, failed, content_hash, content = item
+            self._parse_slots.acquire()
+            try:
+                future = self._pool.submit(_parse_in_worker, content, dept, self._term)
+            except Exception as e:
+                logger.error(f"Error parsing {dept}: {e}")
+                self._parse_slots.release()
+                self._finish_page(index, dept, pattern, [], True)
+                continue
+            future.add_done_callback(
+                lambda f, index=index, dept=dept, pattern=pattern, failed=failed, content_hash=content_hash:
+                    self._on_parsed(f, index, dept, pattern, failed, content_hash)
+            )
+
+    def _on_parsed(self, future: Future, index: int, dept: str, pattern: int, failed: bool,
+                   content_hash: Optional[str]):
+        self._parse_slots.release()
+        try:
+            courses, parse_metrics = future.result()
+            self.scraper.metrics.merge(parse_metrics)
+            self.scraper._store_parsed(content_hash, dept, self._term, courses)
+        except Exception as e:
+            logger.error(f"Error parsing {dept}: {e}")
+            courses = []
+            failed = True
+        self._finish_page(index, dept, pattern, courses, failed)
+
+    def _finish_page(self, index: int, dept: str, pattern: int, courses: List[Course], failed: bool):
+        """Record a department's result, or send it back for the next URL pattern.
+
+        ``failed`` is carried across patterns so a department whose fetches
+        errored is not checkpointed as legitimately empty.
+        """
+        if not courses and pattern + 1 < len(self.scraper._department_urls(dept, self._term)):
+            self._work.put((index, dept, pattern + 1, failed))
+            return
+
+        if courses:
+            logger.info(f"Found {len(courses)} courses for {dept}")
+        self.scraper.metrics.observe("department_seconds", time.perf_counter() - self._started.pop(index))
+        complete = bool(courses) or not failed
+        pattern_name = self.scraper._department_urls(dept, self._term)[pattern][0] if courses else None
+        try:
+            self.scraper._update_fetch_plan(dept, self._term, pattern_name, complete)
+            self.scraper._save_checkpoint(dept, self._term, courses, complete)
+            if not complete:
+                self.scraper._record_failed_unit(dept, self._term)
+        except Exception as e:
+            logger.error(f"Error recording results for {dept}: {e}")
+        self._record_result(index, courses)
+
+    def _record_result(self, index: int, courses: List[Course]):
+        with self._lock:
+            self._results[index] = courses
+            self._remaining -= 1
+            # Report finished departments in department order, as soon as the prefix is complete
+            while self._next_emit in self._results:
+                if self._on_department:
+                    emit_dept = self._departments[self._next_emit]
+                    try:
+                        self._on_department(emit_dept, self._results[self._next_emit])
+                    except Exception as e:
+                        logger.error(f"Error handling results for {emit_dept}: {e}")
+                self._next_emit += 1
+            if self._remaining == 0 and not self._discovering:
+                self._done.set()
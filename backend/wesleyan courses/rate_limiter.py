@@ -0,0 +1,118 @@
+import threading
+import time
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Global requests-per-second cap shared by every in-flight request.
+
+    Each caller reserves the next free slot on a shared timeline and then
+    sleeps until that slot, so the cap holds no matter how many threads or
+    coroutines are fetching at once.
+    """
+
+    def __init__(self, requests_per_second: float):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.requests_per_second = requests_per_second
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserve the next request slot and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.requests_per_second
+            return slot - now
+
+    def wait(self) -> float:
+        """Block the calling thread until it may send a request; returns the time slept"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+    def record_response(self, latency: Optional[float], overloaded: bool) -> int:
+        """Feedback from a finished request; a fixed cap ignores it and returns 0"""
+        return 0
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """AIMD request rate controller, bounded by ``min_rps`` and ``max_rps``.
+
+    Requests are paced like ``RateLimiter``, but every response feeds back
+    into the rate. After each ``window`` healthy responses the rate grows
+    by ``increase`` requests per second. A 429/5xx or a timeout cuts it by
+    ``decrease`` at once, as does a window whose mean latency exceeds
+    ``latency_factor`` times the (slowly tracked) baseline latency. After a
+    cut, overload signals from requests that were already in flight are
+    not counted again.
+    """
+
+    def __init__(self, initial_rps: float = 1.0, min_rps: float = 0.25, max_rps: float = 8.0,
+                 increase: float = 0.25, decrease: float = 0.5, window: int = 10, latency_factor: float = 2.0):
+        if not 0 < min_rps <= max_rps:
+            raise ValueError("need 0 < min_rps <= max_rps")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        super().__init__(min(max(initial_rps, min_rps), max_rps))
+        self.min_rps = min_rps
+        self.max_rps = max_rps
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.latency_factor = latency_factor
+        self.baseline_latency: Optional[float] = None
+        self._latencies: List[float] = []
+        self._hold_until = 0.0
+
+    def record_response(self, latency: Optional[float], overloaded: bool) -> int:
+        """Adjust the rate from one response; returns +1, -1 or 0 for the decision taken.
+
+        ``overloaded`` marks 429/5xx responses, timeouts and dropped
+        connections; ``latency`` is the time the request took.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if overloaded:
+                self._latencies.clear()
+                if now < self._hold_until:
+                    return 0
+                return self._cut(now, "server overloaded (429/5xx or timeout)")
+            if latency is None:
+                return 0
+
+            self._latencies.append(latency)
+            if len(self._latencies) < self.window:
+                return 0
+            mean = sum(self._latencies) / len(self._latencies)
+            self._latencies.clear()
+            baseline = self.baseline_latency if self.baseline_latency is not None else mean
+            # Tracked slowly, so a lasting slowdown stops counting as a spike
+            self.baseline_latency = 0.9 * baseline + 0.1 * mean
+            if mean > self.latency_factor * baseline:
+                if now < self._hold_until:
+                    return 0
+                return self._cut(now, f"latency rising ({mean * 1000:.0f} ms vs {baseline * 1000:.0f} ms baseline)")
+            return self._set_rate(self.requests_per_second + self.increase,
+                                  f"healthy ({mean * 1000:.0f} ms mean latency)")
+
+    def _cut(self, now: float, reason: str) -> int:
+        decision = self._set_rate(self.requests_per_second * self.decrease, reason)
+        # Requests sent before the cut finish within about this long
+        self._hold_until = now + 1.0 / self.requests_per_second + (self.baseline_latency or 0.0)
+        return decision
+
+    def _set_rate(self, rate: float, reason: str) -> int:
+        """Move the rate within the limits, logging the decision (caller holds the lock)"""
+        old = self.requests_per_second
+        self.requests_per_second = min(max(rate, self.min_rps), self.max_rps)
+        if self.requests_per_second == old:
+            logger.debug(f"Keeping rate at {old:.2f} req/s: {reason}")
+            return 0
+        logger.info(f"Rate {old:.2f} -> {self.requests_per_second:.2f} req/s: {reason}")
+        return 1 if self.requests_per_second > old else -1
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Offline Re-parse
+Rebuilds the scraper's JSON output from the raw-page archive, without
+network access, after a parser fix. Pages are memory-mapped and parsed in
+parallel on a process pool.
+
+    python reparse.py .scrape_archive
+    python reparse.py .scrape_archive --parser lxml --until 2025-09-01T12:00:00
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import course_scraper
+from course_scraper import PARSER_BACKENDS, Course, WesleyanCourseScraper, term_output_filename
+from enrichment import merge_sections
+from page_archive import PageArchive, read_page
+from sharding import ALL_COURSES_FILENAME
+
+logger = logging.getLogger(__name__)
+
+# Per-process state of the parser workers
+_worker_scraper: Optional[WesleyanCourseScraper] = None
+_worker_data: List = []
+_worker_run_timestamps: Dict[str, str] = {}
+
+
+def _init_worker(parser_backend: str, run_timestamps: Dict[str, str], data_paths: List[str]):
+    global _worker_scraper, _worker_data, _worker_run_timestamps
+    _worker_scraper = WesleyanCourseScraper(parser_backend=parser_backend)
+    _worker_run_timestamps = run_timestamps
+    # Each worker maps the archives itself; the pages are then shared through the page cache
+    _worker_data = [PageArchive(path).open_data() for path in data_paths]
+
+
+def _parse_page(task: Tuple[int, int, int, str, str]) -> List[Course]:
+    archive, offset, length, department, term = task
+    content = read_page(_worker_data[archive], offset, length)
+    # Courses get the stamp of the run that scraped the term, so output is reproducible
+    course_scraper.RUN_STARTED_AT = _worker_run_timestamps.get(term, course_scraper.RUN_STARTED_AT)
+    return _worker_scraper._parse_content(content, department, term)
+
+
+class Reparser:
+    """Re-derive the catalog from one or more page archives.
+
+    For each (term, department) the newest copy of every URL is parsed, and
+    the URL patterns are tried in the scraper's default order, as a fresh
+    scrape would. Departments come out in the order the last recorded run
+    scraped them (any others follow in the order first archived), and each
+    term's courses keep that run's createdAt stamp. The result depends only
+    on the archive and ``until``, not on when or where it is re-parsed.
+    """
+
+    def __init__(self, directories: List[str], parser_backend: str = "lxml", workers: Optional[int] = None,
+                 until: Optional[float] = None):
+        self.archives = [PageArchive(directory) for directory in directories]
+        self.parser_backend = parser_backend
+        self.workers = workers or os.cpu_count() or 1
+        self.until = until
+
+    def _collect(self) -> Tuple[Dict[str, Dict], Dict[Tuple[str, str], Dict[str, Tuple]]]:
+        """Latest run record per term, and the newest page per URL of every unit"""
+        runs: Dict[str, Dict] = {}
+        pages: Dict[Tuple[str, str], Dict[str, Tuple]] = {}
+        for number, archive in enumerate(self.archives):
+            for entry in archive.entries(self.until):
+                if entry["kind"] == "run":
+                    if entry["term"] not in runs or entry["recorded_at"] >= runs[entry["term"]]["recorded_at"]:
+                        runs[entry["term"]] = entry
+                    continue
+                unit = pages.setdefault((entry["term"], entry["department"]), {})
+                newest = unit.get(entry["url"])
+                if newest is None or entry["fetched_at"] >= newest[0]:
+                    unit[entry["url"]] = (entry["fetched_at"], number, entry["offset"], entry["length"])
+        return runs, pages
+
+    def run(self) -> List[Tuple[str, str, List[Course]]]:
+        """(term, term name, courses) for every archived term, in archive order"""
+        runs, pages = self._collect()
+        terms = list(dict.fromkeys(term for term, _ in pages))
+        tasks, task_units = [], []
+        for (term, department), urls in pages.items():
+            for url in self._url_order(department, term, urls):
+                _, number, offset, length = urls[url]
+                tasks.append((number, offset, length, department, term))
+                task_units.append((term, department))
+        logger.info(f"Re-parsing {len(tasks)} pages for {len(pages)} departments "
+                    f"with {self.workers} {self.parser_backend} workers")
+
+        results: Dict[Tuple[str, str], List[Course]] = {}
+        start = time.perf_counter()
+        run_timestamps = {term: run["run_timestamp"] for term, run in runs.items()}
+        data_paths = [archive.directory for archive in self.archives]
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.parser_backend, run_timestamps, data_paths)) as pool:
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            for unit, courses in zip(task_units, pool.map(_parse_page, tasks, chunksize=chunksize)):
+                # The first URL with courses wins, as in WesleyanCourseScraper._try_department_urls
+                if not results.get(unit):
+                    results[unit] = courses
+        logger.info(f"Parsed {len(tasks)} pages in {time.perf_counter() - start:.2f}s")
+
+        output = []
+        for term in terms:
+            run = runs.get(term)
+            archived = [department for unit_term, department in pages if unit_term == term]
+            order = [d for d in (run["departments"] if run else []) if (term, d) in pages]
+            order += [d for d in archived if d not in order]
+            courses = [course for department in order for course in results.get((term, department), [])]
+            name = run["term_name"] if run else (courses[0].term if courses else f"Term {term}")
+            output.append((term, name, courses))
+        return output
+
+    @staticmethod
+    def _url_order(department: str, term: str, urls: Dict[str, Tuple]) -> List[str]:
+        """Archived URLs of a unit in the scraper's default pattern order, then any others"""
+        known = [WesleyanCourseScraper.URL_PATTERNS[pattern].format(department=department, term=term)
+                 for pattern in WesleyanCourseScraper.URL_PATTERNS]
+        ordered = [url for suffix in known for url in urls if url.endswith(suffix)]
+        return ordered + [url for url in urls if url not in ordered]
+
+
+def _parse_until(text: str) -> float:
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO timestamp: {text!r}")
+
+
+def _write_json(courses: List[Course], filename: str):
+    # Same format as WesleyanCourseScraper.save_courses_to_json
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump([asdict(course) for course in courses], f, indent=2, ensure_ascii=False)
+    logger.info(f"Saved {len(courses)} courses to {filename}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-parse archived WesMaps pages into the scraper's JSON output")
+    parser.add_argument("archives", nargs="+", help="Page archive directories (e.g. .scrape_archive)")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default="lxml",
+                        help="HTML parser backend (default: lxml)")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--until", type=_parse_until, metavar="ISO_TIME",
+                        help="Ignore pages archived after this time, to reproduce an earlier catalog")
+    parser.add_argument("--merge-sections", action="store_true",
+                        help="Write one record per course with a list of its sections")
+    parser.add_argument("--output-dir", default=".", help="Where the JSON files are written (default: .)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    start = time.perf_counter()
+    terms = Reparser(args.archives, args.parser, args.workers, args.until).run()
+    if not terms:
+        logger.error("No archived pages found")
+        return 1
+
+    all_courses = []
+    for term, term_name, courses in terms:
+        if args.merge_sections:
+            courses = merge_sections(courses)
+        _write_json(courses, os.path.join(args.output_dir, term_output_filename(term_name)))
+        all_courses.extend(courses)
+    _write_json(all_courses, os.path.join(args.output_dir, ALL_COURSES_FILENAME))
+    print(f"Re-derived {len(all_courses)} courses for {len(terms)} terms in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
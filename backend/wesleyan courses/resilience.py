@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+import logging
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "try again later" rather than "this page is wrong"
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter for transient fetch errors.
+
+    Attempt ``n`` (0-based) waits a random time between 0 and
+    ``min(max_delay, base_delay * 2 ** n)``, so concurrent workers that fail
+    together do not retry in lockstep. A ``Retry-After`` header is honoured
+    up to ``max_delay``.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Timeouts, dropped connections and 408/425/429/5xx responses are worth retrying"""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        response = getattr(error, "response", None)
+        return response is not None and response.status_code in RETRYABLE_STATUSES
+
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Seconds to wait before retrying after the given failed attempt"""
+        retry_after = _retry_after(getattr(error, "response", None))
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Pauses every fetcher when the server is clearly struggling.
+
+    After ``failure_threshold`` consecutive retryable failures the breaker
+    opens and ``wait`` blocks all callers for ``cooldown`` seconds. The next
+    request is a trial: success closes the breaker, another failure reopens
+    it with the cooldown doubled (up to ``max_cooldown``).
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, max_cooldown: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.trips = 0
+        self._cooldown = cooldown
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._open_until
+
+    def wait(self) -> float:
+        """Block while the breaker is open; returns the time slept"""
+        with self._lock:
+            delay = self._open_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            return delay
+        return 0.0
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._cooldown = self.base_cooldown
+
+    def record_failure(self) -> bool:
+        """Count a retryable failure; returns True if it opened the breaker"""
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                # Requests already in flight when it opened; the pause covers them
+                return False
+            self._failures += 1
+            if self._failures < self.failure_threshold:
+                return False
+            self._open_until = time.monotonic() + self._cooldown
+            self.trips += 1
+            logger.warning(f"{self._failures} consecutive fetch failures, pausing requests for {self._cooldown:.1f}s")
+            # One more failure after the pause reopens it, for longer
+            self._failures = self.failure_threshold - 1
+            self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+            return True
+
+
+def _retry_after(response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), if present"""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+import logging
+
+from atomic_file import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """On-disk cache of department page responses, keyed by URL.
+
+    For every URL we remember the validators the server sent (ETag and
+    Last-Modified) and a SHA-256 of the body. Parsed course rows are stored
+    separately, keyed by that content hash, so a page that comes back
+    byte-identical (or as a 304) never has to be parsed again.
+
+    Layout::
+
+        <cache_dir>/responses/<sha1 of url>.json
+        <cache_dir>/parsed/<content hash>_<parser version>_<department>_<term>.json
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.responses_dir = os.path.join(cache_dir, "responses")
+        self.parsed_dir = os.path.join(cache_dir, "parsed")
+        os.makedirs(self.responses_dir, exist_ok=True)
+        os.makedirs(self.parsed_dir, exist_ok=True)
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def _response_path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.responses_dir, f"{key}.json")
+
+    def _parsed_path(self, content_hash: str, parser_version: int, department: str, term: str) -> str:
+        return os.path.join(self.parsed_dir, f"{content_hash}_{parser_version}_{department}_{term}.json")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL, or None"""
+        try:
+            with open(self._response_path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+            return None
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached entry"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], content_hash: str):
+        """Record the validators and content hash of a fresh response"""
+        self._write_json(self._response_path(url), {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+        })
+
+    def get_parsed(self, content_hash: str, parser_version: int, department: str, term: str) -> Optional[List[Dict]]:
+        """Return previously parsed course rows for this exact page body, or None"""
+        try:
+            with open(self._parsed_path(content_hash, parser_version, department, term), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable parsed cache for {department} {term}: {e}")
+            return None
+
+    def put_parsed(self, content_hash: str, parser_version: int, department: str, term: str, rows: List[Dict]):
+        """Store the parsed course rows for a page body"""
+        self._write_json(self._parsed_path(content_hash, parser_version, department, term), rows)
+
+    def _write_json(self, path: str, data):
+        # Write to a temp file and rename so concurrent workers never see a partial entry
+        write_json_atomic(path, data, ensure_ascii=False)
@@ -5,7 +5,6 @@ Provides options for running the complete course scraping process
 """
 
 import sys
-import os
 from course_scraper import WesleyanCourseScraper
 import logging
 
@@ -30,16 +29,8 @@ def main():
     print("This process may take 30-60 minutes depending on your internet connection.")
     print()
     
-    # Check if departments.txt exists
-    if not os.path.exists("departments.txt"):
-        print("⚠️  departments.txt not found. Running department discovery first...")
-        try:
-            from get_departments import get_all_departments
-            departments = get_all_departments()
-            print(f"✅ Found {len(departments)} departments")
-        except Exception as e:
-            print(f"❌ Error discovering departments: {e}")
-            return
+    # Departments are discovered while scraping (and cached), so there is no
+    # separate discovery step before the full scrape
     
     print("Options:")
     print("1. Test with 5 departments (recommended first)")
@@ -49,6 +40,8 @@ def main():
     print("5. Exit")
     print()
     
+    # Only the full scrape checkpoints finished departments
+    checkpointing = False
     while True:
         try:
             choice = input("Enter your choice (1-5): ").strip()
@@ -85,7 +78,9 @@ def main():
                 if confirm in ['y', 'yes']:
                     print("Starting full scrape...")
                     from scrape_all_courses import main as full_scrape
-                    full_scrape()
+                    checkpointing = True
+                    if full_scrape([]) != 0:
+                        print("⚠️  Some departments failed; run `python scrape_all_courses.py --resume` to retry them.")
                 else:
                     print("Full scrape cancelled.")
                 break
@@ -99,6 +94,8 @@ def main():
                 
         except KeyboardInterrupt:
             print("\n\nScraping interrupted by user.")
+            if checkpointing:
+                print("Finished departments are checkpointed; run `python scrape_all_courses.py --resume` to continue.")
             break
         except Exception as e:
             print(f"Error: {e}")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Schedule Conflict Engine
+Vectorized meeting-time overlap and availability queries over scraped courses.
+
+    python schedule.py wesleyan_courses_fall_2025.json            # conflict summary
+    python schedule.py wesleyan_courses_fall_2025.json --free M:08:00-12:00 W:08:00-12:00
+"""
+
+import argparse
+import time
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from course_scraper import DAY_BITS, DAY_NAMES, Course, load_courses, to_minutes
+from sqlite_store import parse_meetings
+
+MINUTES_PER_DAY = 24 * 60
+WEEKDAYS = tuple(DAY_BITS)  # M T W R F S U, in day-mask bit order
+
+# Meetings compared per block in the pairwise overlap, bounding the
+# intermediate boolean matrix to BLOCK_SIZE x meetings
+BLOCK_SIZE = 1024
+
+_DAY_CODES = {name: code for code, name in DAY_NAMES.items()}
+
+
+def course_meetings(course: Course) -> List[Dict[str, int]]:
+    """Structured meetings, derived from the time string for output scraped before they existed"""
+    if course.meetings is not None:
+        return course.meetings
+    meetings = []
+    for day_names, start, end in parse_meetings(course.time):
+        day_mask = 0
+        for name in day_names.split(", "):
+            day_mask |= DAY_BITS.get(_DAY_CODES.get(name, ""), 0)
+        meetings.append({"days": day_mask, "start": to_minutes(start), "end": to_minutes(end)})
+    return meetings
+
+
+def course_sections(course: Course) -> List[Course]:
+    """One record per section: merged courses are split back into their sections"""
+    if not course.sections or len(course.sections) == 1:
+        return [course]
+    return [replace(course, professor=section["professor"], location=section["location"],
+                    time=section["time"], meetings=section["meetings"], section=section["section"], sections=None)
+            for section in course.sections]
+
+
+class ScheduleEngine:
+    """Conflict and availability queries over every section meeting at once.
+
+    Meetings are flattened into parallel NumPy arrays (owning section, day
+    mask, start and end minute), so a whole catalog is checked with array
+    operations instead of comparing time strings per pair of courses.
+
+    A student takes one section of a course, so sections are evaluated on
+    their own: two courses conflict only when every section of one overlaps
+    every section of the other, and a course fits free time when any one of
+    its sections does. A section without scheduled meetings (TBA) overlaps
+    nothing, so its course never conflicts. Courses of different
+    terms never conflict, so several term files can be loaded together.
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        self.courses: List[Course] = []
+        self._positions: Dict[str, int] = {}
+        grouped: List[List[Course]] = []
+        for course in courses:
+            position = self._positions.setdefault(course.id, len(self.courses))
+            if position == len(self.courses):
+                self.courses.append(course)
+                grouped.append([])
+            grouped[position].extend(course_sections(course))
+
+        terms: Dict[str, int] = {}
+        self.course_term = np.asarray([terms.setdefault(course.term, len(terms)) for course in self.courses],
+                                      dtype=np.int32)
+        # Sections are laid out course by course, so per-course sums are one reduceat
+        self.sections: List[Course] = [section for sections in grouped for section in sections]
+        self.section_course = np.repeat(np.arange(len(self.courses), dtype=np.int32),
+                                        [len(sections) for sections in grouped])
+        self._section_starts = np.cumsum([0] + [len(sections) for sections in grouped[:-1]])
+
+        owners, days, starts, ends = [], [], [], []
+        for position, section in enumerate(self.sections):
+            for meeting in course_meetings(section):
+                if meeting["days"] and meeting["end"] > meeting["start"]:
+                    owners.append(position)
+                    days.append(meeting["days"])
+                    starts.append(meeting["start"])
+                    ends.append(meeting["end"])
+
+        self.owner = np.asarray(owners, dtype=np.int32)
+        self.days = np.asarray(days, dtype=np.uint8)
+        self.start = np.asarray(starts, dtype=np.int16)
+        self.end = np.asarray(ends, dtype=np.int16)
+        self._meeting_course = self.section_course[self.owner]
+        self._meeting_term = self.course_term[self._meeting_course]
+        self._section_conflicts: Optional[np.ndarray] = None
+        self._conflicts: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_json(cls, *filenames: str) -> "ScheduleEngine":
+        """Build an engine from one or more scraper JSON files (e.g. one per term)"""
+        return cls(load_courses(*filenames))
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def _overlaps(self, rows: slice) -> np.ndarray:
+        """Boolean matrix of meetings[rows] overlapping every meeting of another course in the same term"""
+        days, start, end = self.days[rows, None], self.start[rows, None], self.end[rows, None]
+        return (((days & self.days) != 0) & (start < self.end) & (self.start < end)
+                & (self._meeting_term[rows, None] == self._meeting_term)
+                & (self._meeting_course[rows, None] != self._meeting_course))
+
+    def section_conflict_matrix(self) -> np.ndarray:
+        """Symmetric section x section boolean matrix of meeting-time conflicts between courses"""
+        if self._section_conflicts is None:
+            count = len(self.sections)
+            conflicts = np.zeros((count, count), dtype=bool)
+            for begin in range(0, len(self.owner), BLOCK_SIZE):
+                rows = slice(begin, begin + BLOCK_SIZE)
+                i, j = np.nonzero(self._overlaps(rows))
+                conflicts[self.owner[rows][i], self.owner[j]] = True
+            self._section_conflicts = conflicts
+        return self._section_conflicts
+
+    def conflict_matrix(self) -> np.ndarray:
+        """Symmetric course x course boolean matrix: no section of one can be taken with any section of the other"""
+        if self._conflicts is None:
+            sections = self.section_conflict_matrix()
+            if not len(self.courses):
+                self._conflicts = np.zeros((0, 0), dtype=bool)
+                return self._conflicts
+            starts = self._section_starts
+            # Overlapping section pairs per pair of courses, against all of their section pairs;
+            # an unscheduled section overlaps nothing, so its course never reaches the total
+            overlapping = np.add.reduceat(np.add.reduceat(sections, starts, axis=0, dtype=np.int32),
+                                          starts, axis=1)
+            counts = np.bincount(self.section_course, minlength=len(self.courses))
+            self._conflicts = overlapping == counts[:, None].astype(np.int64) * counts
+        return self._conflicts
+
+    def conflicting_pairs(self) -> List[Tuple[Course, Course]]:
+        """Every pair of courses that cannot be taken together, each pair once"""
+        i, j = np.nonzero(np.triu(self.conflict_matrix(), k=1))
+        return [(self.courses[a], self.courses[b]) for a, b in zip(i.tolist(), j.tolist())]
+
+    def conflicts_with(self, course_id: str) -> List[Course]:
+        """Courses that cannot be taken together with the given course"""
+        position = self._positions.get(course_id)
+        if position is None:
+            return []
+        return [self.courses[p] for p in np.flatnonzero(self.conflict_matrix()[position]).tolist()]
+
+    def schedule_conflicts(self, course_ids: Sequence[str]) -> List[Tuple[Course, Course]]:
+        """Conflicting pairs within a proposed schedule"""
+        positions = sorted({self._positions[c] for c in course_ids if c in self._positions})
+        sub = self.conflict_matrix()[np.ix_(positions, positions)]
+        i, j = np.nonzero(np.triu(sub, k=1))
+        return [(self.courses[positions[a]], self.courses[positions[b]]) for a, b in zip(i.tolist(), j.tolist())]
+
+    def fits_availability(self, windows: Dict[str, List[Tuple[int, int]]]) -> List[Course]:
+        """Sections whose every meeting falls inside the given free windows.
+
+        ``windows`` maps a day code (M, T, W, R, F, S, U) to (start, end) minute
+        ranges. A course with several sections is listed once per section
+        that fits. Sections without scheduled meetings are not returned.
+        """
+        # busy[d, m] counts the unavailable minutes before minute m of day d,
+        # so a meeting fits when no busy minute lies in [start, end)
+        free = np.zeros((len(WEEKDAYS), MINUTES_PER_DAY), dtype=bool)
+        for day, ranges in windows.items():
+            for start, end in ranges:
+                free[WEEKDAYS.index(day), start:end] = True
+        busy = np.zeros((len(WEEKDAYS), MINUTES_PER_DAY + 1), dtype=np.int32)
+        np.cumsum(~free, axis=1, out=busy[:, 1:])
+
+        bits = np.array([DAY_BITS[day] for day in WEEKDAYS], dtype=np.uint8)
+        meets_on = (self.days[:, None] & bits) != 0                      # meetings x days
+        day_index = np.arange(len(WEEKDAYS))
+        busy_minutes = busy[day_index, self.end[:, None]] - busy[day_index, self.start[:, None]]
+        meeting_fits = ~(meets_on & (busy_minutes > 0)).any(axis=1)
+
+        # A section fits only if none of its meetings fall outside the windows
+        count = len(self.sections)
+        has_meetings = np.bincount(self.owner, minlength=count) > 0
+        misfits = np.bincount(self.owner, weights=(~meeting_fits).astype(np.float64), minlength=count) > 0
+        return [self.sections[p] for p in np.flatnonzero(has_meetings & ~misfits).tolist()]
+
+
+def parse_window(text: str) -> Tuple[str, int, int]:
+    """Parse a "M:08:00-12:00" free window into (day, start, end) minutes"""
+    day, _, times = text.partition(":")
+    start, end = times.split("-")
+
+    def minutes(clock: str) -> int:
+        if clock[-2:].upper() in ("AM", "PM"):
+            return to_minutes(clock.upper().zfill(7))
+        hours, mins = clock.split(":")
+        return int(hours) * 60 + int(mins)
+
+    return day.upper(), minutes(start), minutes(end)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find schedule conflicts in scraped courses")
+    parser.add_argument("files", nargs="+", help="Scraper JSON files")
+    parser.add_argument("--free", nargs="*", default=None, metavar="DAY:HH:MM-HH:MM",
+                        help="List courses that fit entirely in these free windows")
+    args = parser.parse_args()
+
+    engine = ScheduleEngine.from_json(*args.files)
+    print(f"Loaded {len(engine)} courses ({len(engine.sections)} sections) with {len(engine.owner)} meetings")
+
+    start = time.perf_counter()
+    pairs = engine.conflicting_pairs()
+    print(f"Found {len(pairs)} conflicting course pairs in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.free is not None:
+        windows: Dict[str, List[Tuple[int, int]]] = {}
+        for text in args.free:
+            day, begin, end = parse_window(text)
+            windows.setdefault(day, []).append((begin, end))
+        start = time.perf_counter()
+        fitting = engine.fits_availability(windows)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{len(fitting)} sections fit the free windows ({elapsed:.1f} ms)")
+        for course in fitting[:20]:
+            print(f"  {course.code:<10} {course.time}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,19 @@ Scrapes all courses from all departments and saves them to JSON files.
 
 import sys
 import os
-from course_scraper import WesleyanCourseScraper
+import argparse
+from datetime import datetime
+import course_scraper
+from course_scraper import WesleyanCourseScraper, term_output_filename
+from enrichment import CourseEnricher, DetailCache, merge_sections
+from resilience import RetryPolicy
+from fetch_plan import FetchPlan
+from get_departments import DepartmentCache
+from ndjson_writer import NDJSONWriter
+from page_archive import PageArchive
+from rate_limiter import AdaptiveRateLimiter
+from pipeline import ScrapePipeline
+from sharding import manifest_filename, parse_shard, shard_filename, shard_label, write_manifest
 import logging
 
 # Set up logging
@@ -20,9 +32,122 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape all Wesleyan courses for every term")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Scrape departments concurrently instead of one at a time")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Fetch on threads and parse on a process pool, overlapping the two")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximum departments in flight in async/pipeline mode (default: 8)")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Parser processes in pipeline mode (default: CPU count)")
+    parser.add_argument("--rps", type=float, default=4.0,
+                        help="Global requests-per-second cap in async/pipeline mode (default: 4)")
+    parser.add_argument("--adaptive-rate", action="store_true",
+                        help="Adapt the request rate to the server (AIMD) in every engine, starting at --rps; "
+                             "sequential scrapes always adapt, starting at 1 req/s")
+    parser.add_argument("--min-rps", type=float, default=0.25,
+                        help="Floor for the adaptive request rate (default: 0.25)")
+    parser.add_argument("--max-rps", type=float, default=8.0,
+                        help="Ceiling for the adaptive request rate (default: 8)")
+    parser.add_argument("--parser", choices=["bs4", "lxml"], default="bs4",
+                        help="HTML parser backend; lxml is several times faster (default: bs4)")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Stream each term to .ndjson as departments finish, then build the JSON file from it")
+    parser.add_argument("--sqlite", metavar="DB_FILE",
+                        help="Also upsert every scraped course into this SQLite catalog")
+    parser.add_argument("--copy", metavar="FILE",
+                        help="Also write every course as a Postgres COPY file (.csv, or .tsv for text format) "
+                             "and a FILE.swap.sql script that bulk-loads it into the courses table")
+    parser.add_argument("--catalog", metavar="DIR",
+                        help="Also add each term to this multi-term catalog, which stores what terms share once "
+                             "(see term_store.py)")
+    parser.add_argument("--university-id",
+                        help="universities.id for --copy rows (default: the database's first university)")
+    parser.add_argument("--diff", action="store_true",
+                        help="Also write <term file>.diff.json against the previous term file")
+    parser.add_argument("--cache-dir",
+                        help="Directory for the HTTP revalidation cache (disabled when omitted)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip (term, department) units finished by an interrupted run")
+    parser.add_argument("--checkpoint-dir", default=".scrape_checkpoints",
+                        help="Where finished units are checkpointed (default: .scrape_checkpoints)")
+    parser.add_argument("--fetch-plan", default=".scrape_fetch_plan.json",
+                        help="File remembering working URL patterns and empty departments (default: .scrape_fetch_plan.json)")
+    parser.add_argument("--empty-ttl-days", type=float, default=7.0,
+                        help="Days before a department with no courses is checked again (default: 7)")
+    parser.add_argument("--merge-sections", action="store_true",
+                        help="Write one record per course with a list of its sections, instead of one per section")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Merge sections and fill in description, gen-ed area, prerequisites and credits "
+                             "from each course's detail page")
+    parser.add_argument("--detail-cache-dir", default=".scrape_details",
+                        help="Where parsed detail pages are cached for --enrich (default: .scrape_details)")
+    parser.add_argument("--no-discovery", action="store_true",
+                        help="Use departments.txt (or the built-in list) instead of discovering departments while scraping")
+    parser.add_argument("--department-cache", default=".departments_cache.json",
+                        help="File caching discovered departments (default: .departments_cache.json)")
+    parser.add_argument("--department-ttl-hours", type=float, default=24.0,
+                        help="Hours before departments are rediscovered (default: 24)")
+    parser.add_argument("--connect-timeout", type=float, default=5.0,
+                        help="Seconds to wait for a connection before retrying (default: 5)")
+    parser.add_argument("--read-timeout", type=float, default=30.0,
+                        help="Seconds to wait for response data before retrying (default: 30)")
+    parser.add_argument("--max-retries", type=int, default=3,
+                        help="Retries per request on timeouts, dropped connections and 5xx/429 (default: 3)")
+    parser.add_argument("--metrics", default="scrape_metrics", metavar="PREFIX",
+                        help="Write run metrics to PREFIX.json and PREFIX.prom (default: scrape_metrics)")
+    parser.add_argument("--archive-dir", default=".scrape_archive",
+                        help="Append every fetched page to this archive for reparse.py; \"\" disables it "
+                             "(default: .scrape_archive)")
+    parser.add_argument("--shard", type=_shard_arg, metavar="I/N",
+                        help="Only scrape the 1-based I-th of N deterministic shards of the (term, department) "
+                             "units; combine the shards' output with sharding.py")
+    parser.add_argument("--run-timestamp", type=_timestamp_arg, metavar="ISO_TIME",
+                        help="createdAt stamp for scraped courses (default: now); give every shard the same one "
+                             "so merged output matches a single-node run")
+    return parser.parse_args(argv)
+
+def _shard_arg(text):
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _timestamp_arg(text):
+    try:
+        datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO timestamp: {text!r}")
+    return text
+
+def incomplete_output_filename(term_filename: str) -> str:
+    """Where a term with failed departments is written instead of its snapshot"""
+    return term_filename.replace(".json", ".incomplete.json")
+
+def main(argv=None):
     """Main function to scrape all courses"""
-    scraper = WesleyanCourseScraper()
+    args = parse_args(argv)
+    if args.run_timestamp:
+        course_scraper.RUN_STARTED_AT = args.run_timestamp
+    # Shards may share a machine, so each checkpoints separately
+    checkpoint_dir = os.path.join(args.checkpoint_dir, shard_label(args.shard)) if args.shard else args.checkpoint_dir
+    archive_dir = os.path.join(args.archive_dir, shard_label(args.shard)) if args.shard and args.archive_dir else args.archive_dir
+    archive = PageArchive(archive_dir) if archive_dir else None
+    fetch_plan = FetchPlan(args.fetch_plan, empty_ttl=args.empty_ttl_days * 24 * 60 * 60)
+    department_cache = None if args.no_discovery else DepartmentCache(args.department_cache,
+                                                                      ttl=args.department_ttl_hours * 60 * 60)
+    engine = "pipeline" if args.pipeline else "async" if args.use_async else "sequential"
+    rate_controller = None
+    if args.adaptive_rate or engine == "sequential":
+        rate_controller = AdaptiveRateLimiter(args.rps if args.adaptive_rate else 1.0, args.min_rps, args.max_rps)
+    scraper = WesleyanCourseScraper(cache_dir=args.cache_dir, parser_backend=args.parser,
+                                    checkpoint_dir=checkpoint_dir, fetch_plan=fetch_plan,
+                                    timeout=(args.connect_timeout, args.read_timeout),
+                                    retry_policy=RetryPolicy(max_attempts=args.max_retries + 1),
+                                    department_cache=department_cache, shard=args.shard, archive=archive,
+                                    rate_controller=rate_controller)
     
     # Terms to scrape (1259 = Fall 2025, 1261 = Spring 2026)
     terms = {
@@ -30,28 +155,112 @@ def main():
         "1261": "Spring 2026"
     }
     
+    enricher = CourseEnricher(scraper, args.concurrency, args.rps, DetailCache(args.detail_cache_dir)) if args.enrich else None
+    post_process = args.merge_sections or args.enrich
+    
+    scraper.metrics.set_info(engine=engine, parser=args.parser, terms=",".join(terms),
+                             shard=shard_label(args.shard) if args.shard else "none")
+    if args.shard and (args.sqlite or args.diff or args.copy or args.catalog):
+        logger.warning("--sqlite, --diff, --copy and --catalog are ignored with --shard; run them on the merged output")
+    
+    if args.resume:
+        for term_code, term_name in terms.items():
+            done = scraper.checkpoint.completed(term_code)
+            logger.info(f"Resuming {term_name}: {len(done)} departments already finished")
+    else:
+        scraper.checkpoint.clear()
+    
     all_courses = []
+    shard_terms = []
     
     for term_code, term_name in terms.items():
         logger.info(f"Starting to scrape {term_name} courses...")
         
+        term_filename = term_output_filename(term_name)
+        output_filename = shard_filename(term_filename, args.shard) if args.shard else term_filename
+        writer = NDJSONWriter(output_filename.replace(".json", ".ndjson")) if args.ndjson else None
+        # Merged/enriched output only exists once the term is done, so it is written then
+        stream = writer and not post_process
+        on_department = (lambda dept, dept_courses: writer.write_courses(dept_courses)) if stream else None
+        
         try:
-            courses = scraper.scrape_all_courses(term_code)
+            if args.pipeline:
+                pipeline = ScrapePipeline(scraper, args.concurrency, args.parse_workers,
+                                          requests_per_second=args.rps)
+                courses = pipeline.run(term_code, on_department)
+            elif args.use_async:
+                courses = scraper.scrape_all_courses_async(term_code, args.concurrency, args.rps, on_department)
+            else:
+                courses = scraper.scrape_all_courses(term_code, on_department)
             logger.info(f"Scraped {len(courses)} courses for {term_name}")
+            if post_process:
+                courses = merge_sections(courses)
+                logger.info(f"Merged sections into {len(courses)} courses")
+            if enricher:
+                courses = enricher.enrich(courses)
+            if writer and post_process:
+                writer.write_courses(courses)
+            if archive:
+                archive.record_run(term_code, term_name, scraper.department_order.get(term_code, []),
+                                   course_scraper.RUN_STARTED_AT)
+            failed = scraper.failed_departments(term_code)
+            if failed:
+                logger.error(f"{term_name} is incomplete: {len(failed)} departments failed ({', '.join(failed)})")
             all_courses.extend(courses)
             
-            # Save term-specific courses
-            term_filename = f"wesleyan_courses_{term_name.lower().replace(' ', '_')}.json"
-            scraper.save_courses_to_json(courses, term_filename)
+            # Diff against the previous snapshot before it is overwritten. The
+            # failed departments' courses were not scraped, not removed
+            if args.diff and not args.shard:
+                diff_filename = term_filename.replace(".json", ".diff.json")
+                scraper.save_courses_diff(courses, term_filename, diff_filename, failed)
+            
+            # An incomplete term never replaces the last complete snapshot; a
+            # shard's output is checked for failures when the shards are merged
+            if failed and not args.shard:
+                incomplete_filename = incomplete_output_filename(term_filename)
+                logger.error(f"Keeping the previous {term_filename}; "
+                             f"the incomplete scrape is in {incomplete_filename}")
+                if writer:
+                    writer.close()
+                scraper.save_courses_to_json(courses, incomplete_filename)
+            elif writer:
+                writer.finalize(legacy_json_filename=output_filename)
+            else:
+                scraper.save_courses_to_json(courses, output_filename)
+            if args.catalog and not args.shard and not failed:
+                scraper.save_term_to_catalog(courses, args.catalog, term_name, term_code)
+            shard_terms.append({"code": term_code, "name": term_name, "file": term_filename,
+                                "shard_file": output_filename,
+                                "departments": scraper.department_order.get(term_code, []),
+                                "failed": failed})
             
         except Exception as e:
             logger.error(f"Error scraping {term_name} courses: {e}")
+            if writer:
+                writer.close()
             continue
     
-    # Save all courses combined
+    if args.shard:
+        write_manifest(manifest_filename(args.shard), args.shard, course_scraper.RUN_STARTED_AT, shard_terms)
+    
+    # Save all courses combined (for a shard, sharding.py does this after the merge).
+    # The COPY swap deletes courses missing from its file, so an incomplete run
+    # leaves every combined output as the last complete run wrote it
     if all_courses:
-        logger.info(f"Saving {len(all_courses)} total courses...")
-        scraper.save_courses_to_json(all_courses, "wesleyan_all_courses.json")
+        if scraper.failed_units and not args.shard:
+            logger.error("Not writing wesleyan_all_courses.json, --sqlite or --copy output for an incomplete run")
+        elif not args.shard:
+            logger.info(f"Saving {len(all_courses)} total courses...")
+            scraper.save_courses_to_json(all_courses, "wesleyan_all_courses.json")
+            if args.sqlite:
+                scraper.save_courses_to_sqlite(all_courses, args.sqlite)
+            if args.copy:
+                scraper.save_courses_to_copy(all_courses, args.copy, args.university_id)
+        
+        # The run finished, so the next one starts from scratch. After failures,
+        # keep the checkpoints so --resume only retries the failed departments
+        if not scraper.failed_units:
+            scraper.checkpoint.clear()
         
         # Print summary statistics
         print("\n" + "="*50)
@@ -85,6 +294,17 @@ def main():
         
     else:
         logger.error("No courses were scraped successfully")
+    
+    # Export metrics even for failed runs; they are most useful then
+    if args.metrics:
+        scraper.metrics.write_json(f"{args.metrics}.json")
+        scraper.metrics.write_prometheus(f"{args.metrics}.prom")
+    
+    if scraper.failed_units:
+        logger.error(f"{len(scraper.failed_units)} departments could not be fetched; "
+                     f"rerun with --resume to retry only those")
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Sharded Scraping
+Splits a scrape across machines (``scrape_all_courses.py --shard i/N``) and
+merges the per-shard output back into the files a single-node run writes.
+
+    python sharding.py wesleyan_shard-*-of-4.manifest.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from atomic_file import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+SHARD_PATTERN = re.compile(r'^(\d+)/(\d+)$')
+
+# Combined output of every term, as written by scrape_all_courses.py
+ALL_COURSES_FILENAME = "wesleyan_all_courses.json"
+
+MANIFEST_VERSION = 1
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """Parse "i/N" (1-based, e.g. "2/4") into (index, count)"""
+    match = SHARD_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"Shard must look like i/N, got {text!r}")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+def shard_of(term: str, department: str, count: int) -> int:
+    """1-based shard owning a (term, department) unit.
+
+    Based only on the unit itself, so every node agrees on the split no
+    matter in which order it discovers departments.
+    """
+    digest = hashlib.sha1(f"{term}/{department}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def shard_label(shard: Tuple[int, int]) -> str:
+    return f"shard-{shard[0]}-of-{shard[1]}"
+
+
+def shard_filename(filename: str, shard: Tuple[int, int]) -> str:
+    """Per-shard variant of an output file, e.g. courses.json -> courses.shard-2-of-4.json"""
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{shard_label(shard)}{ext}"
+
+
+def manifest_filename(shard: Tuple[int, int]) -> str:
+    return f"wesleyan_{shard_label(shard)}.manifest.json"
+
+
+def write_manifest(filename: str, shard: Tuple[int, int], run_timestamp: str, terms: List[Dict]):
+    """Record what a shard wrote so ``merge_shards`` can rebuild the single-node output.
+
+    Each term entry holds its ``code``, ``name``, single-node ``file``, the
+    ``shard_file`` holding this shard's courses, every department in the
+    order it was scraped (``departments``) and the ``failed`` ones.
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "shard": shard[0],
+        "shards": shard[1],
+        "run_timestamp": run_timestamp,
+        "terms": terms,
+    }
+    write_json_atomic(filename, manifest, indent=2)
+    logger.info(f"Wrote shard manifest {filename}")
+
+
+def load_manifests(filenames: List[str]) -> List[Dict]:
+    """Load shard manifests, checking they form one complete, consistent run"""
+    manifests = []
+    for filename in filenames:
+        with open(filename, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"{filename}: unsupported manifest version {manifest.get('version')}")
+        # Shard files are named relative to the manifest
+        manifest["directory"] = os.path.dirname(os.path.abspath(filename))
+        manifests.append(manifest)
+    if not manifests:
+        raise ValueError("No shard manifests given")
+
+    count = manifests[0]["shards"]
+    if any(m["shards"] != count for m in manifests):
+        raise ValueError("Manifests come from runs with different shard counts")
+    found = sorted({m["shard"] for m in manifests})
+    missing = sorted(set(range(1, count + 1)) - set(found))
+    if missing:
+        raise ValueError(f"Missing output for shard(s) {', '.join(map(str, missing))} of {count}")
+    if len({m["run_timestamp"] for m in manifests}) > 1:
+        logger.warning("Shards used different run timestamps; createdAt will differ from a single-node run "
+                       "(pass the same --run-timestamp to every shard)")
+    return sorted(manifests, key=lambda m: m["shard"])
+
+
+def merge_shards(manifests: List[Dict]) -> List[Tuple[str, List[Dict]]]:
+    """Rebuild each term's single-node output as (file, records).
+
+    Departments are ordered as the lowest-numbered shard saw them, with any
+    it did not see appended in the order later shards did. A unit is taken
+    from the first shard that has it, and a course id already taken from
+    another department or shard is dropped, so overlapping shard output
+    (a unit scraped twice) merges to one copy.
+    """
+    merged = []
+    for term in _term_order(manifests):
+        filename = None
+        departments: List[str] = []
+        units: Dict[str, List[Dict]] = {}
+        for manifest in manifests:
+            entry = _term_entry(manifest, term)
+            if entry is None:
+                continue
+            filename = filename or entry["file"]
+            departments.extend(d for d in entry["departments"] if d not in departments)
+            for dept, records in _group_by_department(_load_shard_file(manifest, entry)).items():
+                units.setdefault(dept, records)
+
+        records = []
+        owners: Dict[str, str] = {}
+        for dept in departments + sorted(set(units) - set(departments)):
+            for record in units.get(dept, []):
+                # Sections of one course share an id, so only other departments conflict
+                if owners.setdefault(record["id"], dept) == dept:
+                    records.append(record)
+        merged.append((filename, records))
+    return merged
+
+
+def incomplete_units(manifests: List[Dict]) -> List[str]:
+    """Descriptions of the units some shard could not scrape, including whole terms it gave up on"""
+    problems = []
+    for term in _term_order(manifests):
+        for manifest in manifests:
+            entry = _term_entry(manifest, term)
+            if entry is None:
+                problems.append(f"all of term {term} on shard {manifest['shard']}")
+            else:
+                problems.extend(f"{dept} ({term})" for dept in entry["failed"])
+    return problems
+
+
+def _term_order(manifests: List[Dict]) -> List[str]:
+    codes: List[str] = []
+    for manifest in manifests:
+        codes.extend(entry["code"] for entry in manifest["terms"] if entry["code"] not in codes)
+    return codes
+
+
+def _term_entry(manifest: Dict, code: str) -> Optional[Dict]:
+    return next((entry for entry in manifest["terms"] if entry["code"] == code), None)
+
+
+def _load_shard_file(manifest: Dict, entry: Dict) -> List[Dict]:
+    with open(os.path.join(manifest["directory"], entry["shard_file"]), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _group_by_department(records: List[Dict]) -> Dict[str, List[Dict]]:
+    groups: Dict[str, List[Dict]] = {}
+    for record in records:
+        groups.setdefault(record["department"], []).append(record)
+    return groups
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge sharded scrape output into single-node output files")
+    parser.add_argument("manifests", nargs="+", help="Shard manifest files (wesleyan_shard-*-of-N.manifest.json)")
+    parser.add_argument("--output-dir", default=".", help="Where merged files are written (default: .)")
+    parser.add_argument("--allow-incomplete", action="store_true",
+                        help="Merge even if some shard failed to scrape departments")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        manifests = load_manifests(args.manifests)
+    except (OSError, ValueError) as e:
+        logger.error(f"Cannot merge shards: {e}")
+        return 1
+    incomplete = incomplete_units(manifests)
+    if incomplete:
+        logger.error(f"The shard runs are incomplete: {', '.join(incomplete)}")
+        if not args.allow_incomplete:
+            logger.error("Rerun the failing shards with --resume, or pass --allow-incomplete")
+            return 1
+
+    all_records = []
+    for filename, records in merge_shards(manifests):
+        # Same serialization as WesleyanCourseScraper.save_courses_to_json
+        write_json_atomic(os.path.join(args.output_dir, filename), records, indent=2, ensure_ascii=False)
+        logger.info(f"Merged {len(records)} courses into {filename}")
+        all_records.extend(records)
+    if all_records:
+        write_json_atomic(os.path.join(args.output_dir, ALL_COURSES_FILENAME), all_records,
+                           indent=2, ensure_ascii=False)
+        logger.info(f"Merged {len(all_records)} courses into {ALL_COURSES_FILENAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
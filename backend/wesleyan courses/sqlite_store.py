@@ -0,0 +1,182 @@
+import re
+import sqlite3
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    id            TEXT PRIMARY KEY,
+    code          TEXT NOT NULL,
+    number        TEXT NOT NULL,
+    title         TEXT NOT NULL,
+    department    TEXT NOT NULL,
+    description   TEXT,
+    professor     TEXT,
+    term          TEXT NOT NULL,
+    genEdArea     TEXT,
+    level         TEXT,
+    credits       REAL,
+    prerequisites TEXT,
+    location      TEXT,
+    time          TEXT,
+    createdAt     TEXT
+);
+CREATE TABLE IF NOT EXISTS meetings (
+    course_id  TEXT NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    ordinal    INTEGER NOT NULL,
+    days       TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time   TEXT NOT NULL,
+    PRIMARY KEY (course_id, ordinal)
+);
+CREATE TABLE IF NOT EXISTS instructors (
+    course_id TEXT NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    ordinal   INTEGER NOT NULL,
+    name      TEXT NOT NULL,
+    PRIMARY KEY (course_id, ordinal)
+);
+CREATE INDEX IF NOT EXISTS idx_courses_code ON courses(code);
+CREATE INDEX IF NOT EXISTS idx_courses_department ON courses(department);
+CREATE INDEX IF NOT EXISTS idx_courses_term ON courses(term);
+CREATE INDEX IF NOT EXISTS idx_instructors_name ON instructors(name);
+"""
+
+COURSE_COLUMNS = ("id", "code", "number", "title", "department", "description", "professor", "term",
+                  "genEdArea", "level", "credits", "prerequisites", "location", "time", "createdAt")
+
+# One meeting in a display string like "Monday, Wednesday 01:20PM-02:40PM"
+_MEETING_PATTERN = re.compile(r'^(.*?)\s+(\d{1,2}:\d{2}[AP]M)-(\d{1,2}:\d{2}[AP]M)$')
+
+
+def parse_meetings(time_text: Optional[str]) -> List[Tuple[str, str, str]]:
+    """Split a course's time string into (days, start, end) meetings"""
+    meetings = []
+    for part in (time_text or "").split(";"):
+        match = _MEETING_PATTERN.match(part.strip())
+        if match:
+            meetings.append(match.groups())
+    return meetings
+
+
+def meeting_rows(entry: Dict) -> List[Tuple[str, str, str]]:
+    """(days, start, end) meetings of a course record or section entry.
+
+    Built from the structured ``meetings`` when present, and parsed from
+    the ``time`` string for output scraped before they existed.
+    """
+    if entry.get("meetings") is None:
+        return parse_meetings(entry.get("time"))
+    from course_scraper import DAY_BITS, DAY_NAMES, to_clock
+
+    return [(", ".join(name for day, name in DAY_NAMES.items() if meeting["days"] & DAY_BITS[day]),
+             to_clock(meeting["start"]), to_clock(meeting["end"]))
+            for meeting in entry["meetings"]]
+
+
+def parse_instructors(professor: Optional[str]) -> List[str]:
+    """Split the "; "-joined professor field into individual names"""
+    return [name.strip() for name in (professor or "").split(";") if name.strip()]
+
+
+class CourseStore:
+    """Indexed SQLite catalog of scraped courses.
+
+    Courses are normalized into ``courses``, ``meetings`` and ``instructors``
+    tables with indexes on code, department, term and instructor name, so
+    lookups do not need to load the whole catalog.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def upsert_courses(self, courses: Iterable) -> int:
+        """Insert or replace courses keyed by Course.id, in a single transaction.
+
+        Sections of the same course share an id: the first section's fields
+        are kept (as the backend loader does), and the meetings and
+        instructors of every section are merged under it, whether the
+        sections arrive as separate rows or merged into ``sections``.
+        """
+        records: Dict[str, Dict] = {}
+        meetings: Dict[str, List[Tuple[str, str, str]]] = {}
+        instructors: Dict[str, List[str]] = {}
+        for course in courses:
+            record = asdict(course)
+            course_id = record["id"]
+            records.setdefault(course_id, record)
+            for section in record["sections"] or [record]:
+                for meeting in meeting_rows(section):
+                    if meeting not in meetings.setdefault(course_id, []):
+                        meetings[course_id].append(meeting)
+                for name in parse_instructors(section["professor"]):
+                    if name not in instructors.setdefault(course_id, []):
+                        instructors[course_id].append(name)
+
+        placeholders = ", ".join("?" for _ in COURSE_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COURSE_COLUMNS if column != "id")
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO courses ({', '.join(COURSE_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                [tuple(record[column] for column in COURSE_COLUMNS) for record in records.values()]
+            )
+            ids = [(course_id,) for course_id in records]
+            self.conn.executemany("DELETE FROM meetings WHERE course_id = ?", ids)
+            self.conn.executemany("DELETE FROM instructors WHERE course_id = ?", ids)
+            self.conn.executemany(
+                "INSERT INTO meetings (course_id, ordinal, days, start_time, end_time) VALUES (?, ?, ?, ?, ?)",
+                [(course_id, ordinal, *meeting)
+                 for course_id, course_meetings in meetings.items()
+                 for ordinal, meeting in enumerate(course_meetings)]
+            )
+            self.conn.executemany(
+                "INSERT INTO instructors (course_id, ordinal, name) VALUES (?, ?, ?)",
+                [(course_id, ordinal, name)
+                 for course_id, names in instructors.items()
+                 for ordinal, name in enumerate(names)]
+            )
+        logger.info(f"Upserted {len(records)} courses into {self.filename}")
+        return len(records)
+
+    def find_courses(self, code: Optional[str] = None, department: Optional[str] = None,
+                     term: Optional[str] = None, professor: Optional[str] = None,
+                     level: Optional[str] = None) -> List[Dict]:
+        """Look up courses by any combination of indexed fields"""
+        clauses, params = [], []
+        for column, value in (("code", code), ("department", department), ("term", term), ("level", level)):
+            if value is not None:
+                clauses.append(f"c.{column} = ?")
+                params.append(value)
+        if professor is not None:
+            clauses.append("c.id IN (SELECT course_id FROM instructors WHERE name = ?)")
+            params.append(professor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(f"SELECT * FROM courses c {where} ORDER BY c.term, c.code", params)
+        return [dict(row) for row in rows]
+
+    def meetings_for(self, course_id: str) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT days, start_time, end_time FROM meetings WHERE course_id = ? ORDER BY ordinal", (course_id,)
+        )
+        return [dict(row) for row in rows]
+
+    def instructors_for(self, course_id: str) -> List[str]:
+        rows = self.conn.execute("SELECT name FROM instructors WHERE course_id = ? ORDER BY ordinal", (course_id,))
+        return [row["name"] for row in rows]
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Multi-term Catalog Store
+Keeps every scraped term in one directory, storing each course's shared
+attributes (title, department, level, instructor, ...) once across terms
+and only the per-term offering details (sections, times, rooms) per term.
+
+    python term_store.py append catalog/ wesleyan_courses_fall_2025.json wesleyan_courses_spring_2026.json
+    python term_store.py export catalog/ "Fall 2025" -o wesleyan_courses_fall_2025.json
+    python term_store.py info catalog/
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from atomic_file import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+COURSES_FILENAME = "courses.ndjson"
+MANIFEST_FILENAME = "terms.json"
+
+# Course fields that usually stay the same from term to term, stored once per distinct combination
+SHARED_FIELDS = ("code", "number", "title", "department", "description", "professor",
+                 "genEdArea", "level", "credits", "prerequisites", "wesmapsId")
+
+# Fields each term's offering keeps itself, after the reference to its shared record
+OFFERING_FIELDS = ("id", "location", "time", "meetings", "section", "sections", "createdAt")
+
+
+class TermCatalog:
+    """Directory store for a multi-term catalog, deduplicated across terms.
+
+    ``courses.ndjson`` holds one JSON array of ``SHARED_FIELDS`` values per
+    distinct course record; a line is only appended when a term brings a
+    course that is new or whose shared attributes changed, so the file
+    grows with changes rather than with terms. Each term file lists the
+    term's offerings in scrape order as ``[line, id, location, time,
+    meetings, section, sections, createdAt]``. The id is null when it is the usual
+    ``<code>_<term code>``, and createdAt is null when it matches the term's
+    default stamp.
+
+    ``terms.json`` is written last, atomically, and records how many bytes
+    of ``courses.ndjson`` are committed, so an interrupted append leaves
+    the previous catalog intact. Term files are never rewritten in place:
+    replacing a term writes a new file and removes the old one afterwards.
+
+    Layout::
+
+        <directory>/terms.json           {"version", "fields", "offering_fields", "generation", "records",
+                                          "records_bytes",
+                                          "terms": [{"term", "code", "file", "courses", "appended_at"}]}
+        <directory>/courses.ndjson       [code, number, title, ...] per line
+        <directory>/<term>.<n>.json      {"term", "code", "createdAt", "offerings": [[line, id, ...], ...]}
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.courses_path = os.path.join(directory, COURSES_FILENAME)
+        self.manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        self._manifest: Optional[Dict] = None
+        self._lines: Optional[List[bytes]] = None
+        self._records: Dict[int, Dict] = {}
+
+    @property
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except FileNotFoundError:
+                manifest = {"version": STORE_VERSION, "fields": list(SHARED_FIELDS),
+                            "offering_fields": list(OFFERING_FIELDS), "generation": 0,
+                            "records": 0, "records_bytes": 0, "terms": []}
+            if manifest.get("version") != STORE_VERSION:
+                raise ValueError(f"{self.manifest_path}: unsupported store version {manifest.get('version')}")
+            if tuple(manifest["fields"]) != SHARED_FIELDS or tuple(manifest["offering_fields"]) != OFFERING_FIELDS:
+                raise ValueError(f"{self.manifest_path}: written with different course fields")
+            self._manifest = manifest
+        return self._manifest
+
+    def terms(self) -> List[str]:
+        """Stored term names, in the order they were first appended"""
+        return [entry["term"] for entry in self.manifest["terms"]]
+
+    def _term_entry(self, term: str) -> Optional[Dict]:
+        return next((entry for entry in self.manifest["terms"] if entry["term"] == term), None)
+
+    def _shared_lines(self) -> List[bytes]:
+        """Committed lines of courses.ndjson, still undecoded"""
+        if self._lines is None:
+            size = self.manifest["records_bytes"]
+            if size:
+                with open(self.courses_path, "rb") as f:
+                    self._lines = f.read(size).splitlines()
+            else:
+                self._lines = []
+            if len(self._lines) != self.manifest["records"]:
+                raise ValueError(f"{self.courses_path}: expected {self.manifest['records']} records, "
+                                 f"found {len(self._lines)}")
+        return self._lines
+
+    def _shared(self, line: int) -> Dict:
+        # Lines are decoded on first use, so a term view only pays for its own courses
+        record = self._records.get(line)
+        if record is None:
+            record = self._records[line] = dict(zip(SHARED_FIELDS, json.loads(self._shared_lines()[line])))
+        return record
+
+    def term_courses(self, term: str) -> List:
+        """Courses of one term, as the scraper wrote them"""
+        from course_scraper import Course
+
+        entry = self._term_entry(term)
+        if entry is None:
+            raise KeyError(f"No term {term!r} in {self.directory}")
+        with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+            stored = json.loads(f.read())
+        code, default_stamp = stored["code"], stored["createdAt"]
+        courses = []
+        for line, course_id, location, time_text, meetings, section, sections, created_at in stored["offerings"]:
+            shared = self._shared(line)
+            courses.append(Course(
+                id=course_id or f"{shared['code']}_{code}", term=term, location=location, time=time_text,
+                meetings=meetings, section=section, sections=sections, createdAt=created_at or default_stamp,
+                **shared))
+        return courses
+
+    def all_courses(self) -> List:
+        """Every term's courses, in term order (the combined wesleyan_all_courses.json)"""
+        return [course for term in self.terms() for course in self.term_courses(term)]
+
+    def append_term(self, term: str, courses: Iterable, code: Optional[str] = None) -> Dict[str, int]:
+        """Add a term, or replace it if already stored; returns offering and new-record counts.
+
+        Only shared records not already in the store are appended, so adding
+        a term costs a lookup per course plus the lines that changed. ``code``
+        is the WesMaps term code (e.g. "1259"); by default it is taken from
+        the course ids.
+        """
+        courses = list(courses)
+        manifest = self.manifest
+        lines = self._shared_lines()
+        # Records are looked up by their encoded line, so stored lines are never decoded here
+        index: Dict[bytes, int] = {}
+        for number, raw in enumerate(lines):
+            index.setdefault(raw, number)
+
+        if code is None and courses:
+            prefix, _, suffix = courses[0].id.rpartition("_")
+            code = suffix if prefix == courses[0].code else None
+        default_stamp = courses[0].createdAt if courses else None
+
+        new_lines: List[bytes] = []
+        offerings = []
+        for course in courses:
+            raw = json.dumps([getattr(course, field) for field in SHARED_FIELDS], ensure_ascii=False).encode("utf-8")
+            line = index.get(raw)
+            if line is None:
+                line = index[raw] = len(lines) + len(new_lines)
+                new_lines.append(raw)
+            offerings.append([
+                line,
+                None if course.id == f"{course.code}_{code}" else course.id,
+                course.location, course.time, course.meetings, course.section, course.sections,
+                None if course.createdAt == default_stamp else course.createdAt,
+            ])
+
+        os.makedirs(self.directory, exist_ok=True)
+        records_bytes = manifest["records_bytes"]
+        with open(self.courses_path, "ab") as f:
+            # Drop whatever an interrupted append left past the committed records
+            f.truncate(records_bytes)
+            for raw in new_lines:
+                f.write(raw + b"\n")
+                records_bytes += len(raw) + 1
+            f.flush()
+            os.fsync(f.fileno())
+
+        previous = self._term_entry(term)
+        generation = manifest["generation"] + 1
+        filename = f"{_slug(term)}.{generation}.json"
+        _write_store_file(os.path.join(self.directory, filename),
+                           {"term": term, "code": code, "createdAt": default_stamp, "offerings": offerings})
+
+        entry = {"term": term, "code": code, "file": filename, "courses": len(offerings), "appended_at": time.time()}
+        updated = dict(manifest, generation=generation, records=manifest["records"] + len(new_lines),
+                       records_bytes=records_bytes, terms=[entry if e is previous else e for e in manifest["terms"]])
+        if previous is None:
+            updated["terms"].append(entry)
+        _write_store_file(self.manifest_path, updated)
+        self._manifest = updated
+        lines.extend(new_lines)
+        if previous:
+            try:
+                os.remove(os.path.join(self.directory, previous["file"]))
+            except FileNotFoundError:
+                pass
+
+        logger.info(f"Stored {term} in {self.directory}: {len(offerings)} courses, "
+                    f"{len(new_lines)} new shared records ({len(offerings) - len(new_lines)} reused)")
+        return {"courses": len(offerings), "new_records": len(new_lines)}
+
+
+def _slug(term: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in term.lower())
+
+
+def _write_store_file(filename: str, data):
+    write_json_atomic(filename, data, durable=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def _group_by_term(courses: Iterable) -> Dict[str, List]:
+    terms: Dict[str, List] = {}
+    for course in courses:
+        terms.setdefault(course.term, []).append(course)
+    return terms
+
+
+def _directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def main(argv=None):
+    from course_scraper import load_courses
+
+    parser = argparse.ArgumentParser(description="Store scraped terms in a catalog deduplicated across terms")
+    commands = parser.add_subparsers(dest="command", required=True)
+    append = commands.add_parser("append", help="Add (or replace) the terms in scraper JSON files")
+    append.add_argument("directory")
+    append.add_argument("files", nargs="+", help="Scraper JSON files; a file holding several terms adds each")
+    append.add_argument("--code", help="WesMaps term code (default: taken from the course ids)")
+    export = commands.add_parser("export", help="Write terms back out as scraper JSON")
+    export.add_argument("directory")
+    export.add_argument("term", nargs="?", help="Term name, e.g. \"Fall 2025\" (default: every term)")
+    export.add_argument("-o", "--output", help="Output file (default: the scraper's file name)")
+    info = commands.add_parser("info", help="List the stored terms")
+    info.add_argument("directory")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    store = TermCatalog(args.directory)
+    try:
+        if args.command == "append":
+            terms = _group_by_term(load_courses(*args.files))
+            if args.code and len(terms) > 1:
+                raise ValueError("--code needs input holding a single term")
+            for term, courses in terms.items():
+                store.append_term(term, courses, args.code)
+        elif args.command == "export":
+            from course_scraper import term_output_filename
+            from sharding import ALL_COURSES_FILENAME
+
+            courses = store.term_courses(args.term) if args.term else store.all_courses()
+            output = args.output or (term_output_filename(args.term) if args.term else ALL_COURSES_FILENAME)
+            # Same format as WesleyanCourseScraper.save_courses_to_json
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump([asdict(course) for course in courses], f, indent=2, ensure_ascii=False)
+            print(f"Wrote {len(courses)} courses to {output}")
+        else:
+            manifest = store.manifest
+            for entry in manifest["terms"]:
+                print(f"  {entry['term']:<14} {entry['code'] or '-':>6}  {entry['courses']:6d} courses")
+            print(f"{manifest['records']} shared course records, "
+                  f"{_directory_size(args.directory) / 1e6:.2f} MB on disk")
+    except (KeyError, ValueError, OSError) as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+import unittest
+
+from catalog_diff import diff_catalogs, load_snapshot, main
+
+
+def record(course_id: str, department: str = "ECON", **fields):
+    return dict({"id": course_id, "code": course_id.split("_")[0], "department": department,
+                 "title": "Title", "professor": "STAFF", "createdAt": "2025-07-09T00:00:00"}, **fields)
+
+
+class DiffCatalogsTest(unittest.TestCase):
+    def test_added_removed_and_changed(self):
+        old = [record("ECON101_1259"), record("ECON102_1259"), record("ECON103_1259")]
+        new = [record("ECON101_1259", createdAt="2025-08-01T00:00:00"),
+               record("ECON102_1259", professor="Grossman,Richard"), record("ECON104_1259")]
+        diff = diff_catalogs(old, new)
+        self.assertEqual([r["id"] for r in diff["added"]], ["ECON104_1259"])
+        self.assertEqual([r["id"] for r in diff["removed"]], ["ECON103_1259"])
+        # createdAt changes on every scrape and is not a change to the course
+        self.assertEqual(diff["changed"], [{"id": "ECON102_1259", "code": "ECON102",
+                                            "changes": {"professor": {"old": "STAFF", "new": "Grossman,Richard"}}}])
+
+    def test_sections_sharing_an_id_are_one_course(self):
+        old = [record("ECON101_1259", professor="A"), record("ECON101_1259", professor="B")]
+        new = [record("ECON101_1259", professor="A")]
+        self.assertEqual(diff_catalogs(old, new), {"added": [], "removed": [], "changed": []})
+
+    def test_missing_departments_are_not_removed(self):
+        old = [record("ECON101_1259"), record("COMP211_1259", "COMP"), record("HIST101_1259", "HIST")]
+        new = [record("ECON101_1259")]
+        diff = diff_catalogs(old, new, missing_departments=["COMP"])
+        self.assertEqual([r["id"] for r in diff["removed"]], ["HIST101_1259"])
+
+    def test_cli_writes_diff_against_missing_snapshot(self):
+        directory = tempfile.mkdtemp()
+        new_path, output = os.path.join(directory, "new.json"), os.path.join(directory, "diff.json")
+        with open(new_path, "w", encoding="utf-8") as f:
+            json.dump([record("ECON101_1259")], f)
+        main([os.path.join(directory, "missing.json"), new_path, "-o", output])
+        self.assertEqual(len(load_snapshot(output)["added"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
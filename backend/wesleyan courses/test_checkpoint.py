@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from checkpoint import CheckpointStore
+from course_scraper import WesleyanCourseScraper
+from mock_wesmaps import MockWesMaps
+from resilience import CircuitBreaker, RetryPolicy
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class CheckpointStoreTest(unittest.TestCase):
+    def test_unreadable_checkpoint_is_ignored(self):
+        store = CheckpointStore(tempfile.mkdtemp())
+        self.assertIsNone(store.load("1259", "ECON"))
+        store.save("1259", "ECON", [])
+        with open(os.path.join(store.checkpoint_dir, "1259", "HIST.json"), "w") as f:
+            f.write("[{")
+        self.assertEqual(store.load("1259", "ECON"), [])
+        self.assertIsNone(store.load("1259", "HIST"))
+        self.assertEqual(store.completed("1259"), ["ECON", "HIST"])
+        store.clear("1259")
+        self.assertEqual(store.completed("1259"), [])
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.checkpoint_dir = tempfile.mkdtemp()
+
+    def scraper(self, mock: MockWesMaps) -> WesleyanCourseScraper:
+        scraper = WesleyanCourseScraper(checkpoint_dir=self.checkpoint_dir,
+                                        retry_policy=RetryPolicy(max_attempts=2, base_delay=0.001),
+                                        circuit_breaker=CircuitBreaker(failure_threshold=100))
+        scraper.base_url = mock.base_url
+        return scraper
+
+    def test_finished_unit_is_not_scraped_again(self):
+        with MockWesMaps(["ECON"], SAMPLE_PAGE) as mock:
+            first, skipped = self.scraper(mock)._scrape_unit("ECON", "1259")
+            self.assertFalse(skipped)
+            requests_made = mock.requests
+            resumed, skipped = self.scraper(mock)._scrape_unit("ECON", "1259")
+        self.assertTrue(first)
+        self.assertTrue(skipped)
+        self.assertEqual(mock.requests, requests_made)
+        self.assertEqual(resumed, first)
+
+    def test_failed_unit_is_retried_on_resume(self):
+        with MockWesMaps(["ECON"], SAMPLE_PAGE, error_rate=1.0) as mock:
+            scraper = self.scraper(mock)
+            courses, _ = scraper._scrape_unit("ECON", "1259")
+        self.assertEqual(courses, [])
+        self.assertEqual(scraper.failed_departments("1259"), ["ECON"])
+        self.assertEqual(scraper.checkpoint.completed("1259"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+
+from copy_export import DEFAULT_CREDITS, TABLE_COLUMNS, swap_sql, write_copy_file
+from course_scraper import Course
+
+TEXT_ESCAPES = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r"}
+
+
+def course(code: str, title: str, professor, credits=None):
+    return Course(id=f"{code}_1259", code=code, number=code[-3:], title=title, department=code[:-3],
+                  description="", professor=professor, term="Fall 2025", credits=credits,
+                  createdAt="2025-07-09T00:00:00")
+
+
+def text_fields(line: str):
+    """Fields of a Postgres text-format COPY line, with \\N as None"""
+    return [None if field == "\\N" else re.sub(r"\\[\\tnr]", lambda m: TEXT_ESCAPES[m.group()], field)
+            for field in line.split("\t")]
+
+
+def csv_rows(content: str):
+    """Rows of a CSV COPY file as Postgres reads them: an unquoted empty field is None"""
+    rows, row, field, quoted, in_quotes = [], [], "", False, False
+    i = 0
+    while i < len(content):
+        c = content[i]
+        if in_quotes:
+            if c == '"' and content[i + 1:i + 2] == '"':
+                field += c
+                i += 1
+            elif c == '"':
+                in_quotes = False
+            else:
+                field += c
+        elif c == '"':
+            in_quotes = quoted = True
+        elif c in ",\n":
+            row.append(field if field or quoted else None)
+            field, quoted = "", False
+            if c == "\n":
+                rows.append(row)
+                row = []
+        else:
+            field += c
+        i += 1
+    return rows
+
+
+class CopyFileTest(unittest.TestCase):
+    courses = [
+        course("ECON101", 'Money, "Banking"\nand Credit', "Smith,Jo", credits=0.5),
+        course("ECON102", "Tabs\tand \\backslashes\\", ""),
+        course("ECON103", "\\.", None),
+        # A later section of a code already written is dropped
+        course("ECON101", "Second section", "Other"),
+    ]
+
+    def write(self, filename: str):
+        path = os.path.join(tempfile.mkdtemp(), filename)
+        self.assertEqual(write_copy_file(self.courses, path), 3)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return f.read()
+
+    def check_rows(self, rows):
+        column = {name: i for i, name in enumerate(TABLE_COLUMNS)}
+        self.assertEqual([row[column["title"]] for row in rows],
+                         ['Money, "Banking"\nand Credit', "Tabs\tand \\backslashes\\", "\\."])
+        # An empty professor stays an empty string; a missing one is NULL
+        self.assertEqual([row[column["professor"]] for row in rows], ["Smith,Jo", "", None])
+        self.assertEqual([float(row[column["credits"]]) for row in rows], [0.5, DEFAULT_CREDITS, DEFAULT_CREDITS])
+        self.assertIsNone(rows[0][column["universityId"]])
+
+    def test_csv_fields_round_trip(self):
+        content = self.write("courses.csv")
+        # COPY would read a bare \. as the end of the data
+        self.assertIn(',"\\."\n', content)
+        rows = csv_rows(content)
+        self.assertEqual(rows[0], list(TABLE_COLUMNS))
+        self.check_rows(rows[1:])
+
+    def test_text_fields_round_trip(self):
+        content = self.write("courses.tsv")
+        lines = content.split("\n")
+        self.assertEqual(lines[-1], "")
+        self.check_rows([text_fields(line) for line in lines[:-1]])
+
+
+class SwapSqlTest(unittest.TestCase):
+    def setUp(self):
+        # The statements after the upsert are plain SQL, so SQLite runs them as Postgres would
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.executescript("""
+            CREATE TABLE "courses" ("id" TEXT, "code" TEXT, "universityId" TEXT, "title" TEXT, "term" TEXT);
+            CREATE TABLE "courses_staging" ("code" TEXT, "universityId" TEXT);
+            CREATE TABLE "sessions" ("id" TEXT, "courseId" TEXT);
+            CREATE TABLE "user_courses" ("id" TEXT, "courseId" TEXT);
+            INSERT INTO "courses" VALUES ('c1', 'ECON101', 'u1', 'Intro', 'Fall 2025'),
+                                         ('c2', 'ECON102', 'u1', 'Enrolled', 'Fall 2025'),
+                                         ('c3', 'ECON103', 'u1', 'Tutored', 'Fall 2025'),
+                                         ('c4', 'ECON104', 'u1', 'Dropped', 'Fall 2025'),
+                                         ('c5', 'ECON104', 'u2', 'Elsewhere', 'Fall 2025');
+            INSERT INTO "courses_staging" VALUES ('ECON101', 'u1');
+            INSERT INTO "user_courses" VALUES ('uc1', 'c2');
+            INSERT INTO "sessions" VALUES ('s1', 'c3');
+        """)
+
+    def test_referenced_courses_are_kept_and_listed(self):
+        script = swap_sql("courses.csv")
+        statements = script[script.index("-- Courses missing"):script.index("COMMIT;")].split(";\n")
+        kept = self.conn.execute(statements[0]).fetchall()
+        self.conn.execute(statements[1])
+        self.assertEqual([code for code, title, term in kept], ["ECON102", "ECON103"])
+        remaining = [row[0] for row in self.conn.execute('SELECT "id" FROM "courses" ORDER BY "id"')]
+        # Only the unreferenced ECON104 of the exported university goes
+        self.assertEqual(remaining, ["c1", "c2", "c3", "c5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import unittest
+from dataclasses import replace
+
+from course_catalog import CourseCatalog
+from course_scraper import WesleyanCourseScraper
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class ShortQueryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(SAMPLE_PAGE, "rb") as f:
+            courses = WesleyanCourseScraper()._parse_content(f.read(), "ECON", "1259")
+        courses += [replace(course, id=f"{course.id}X", term="Spring 2026") for course in courses]
+        cls.catalog = CourseCatalog(courses)
+
+    def test_precomputed_prefixes_match_full_ranking(self):
+        catalog = self.catalog
+        queries = ["e", "ec", "eco", "EC", "1", "10", "in", "gro", "s", "zzz", "c 2"]
+        for query in queries:
+            for term in (None, "Fall 2025", "Spring 2026", "Summer 2026"):
+                for limit in (1, 5, catalog.SHORT_QUERY_RESULTS, 100):
+                    with self.subTest(query=query, term=term, limit=limit):
+                        self.assertEqual(catalog.search(query, limit, term), catalog._rank(query, limit, term))
+
+    def test_exact_code_ranks_first(self):
+        results = self.catalog.search("econ101", term="Fall 2025")
+        self.assertEqual(results[0].code, "ECON101")
+
+
+if __name__ == "__main__":
+    unittest.main()
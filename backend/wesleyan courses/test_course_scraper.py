@@ -0,0 +1,75 @@
+import os
+import unittest
+from dataclasses import asdict
+
+from course_scraper import DAY_BITS, WesleyanCourseScraper, courses_from_records
+from enrichment import merge_sections
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class ExtractTimeLocationTest(unittest.TestCase):
+    def setUp(self):
+        self.scraper = WesleyanCourseScraper()
+
+    def test_staff_row_day_code(self):
+        # The professor runs straight into the day code; STAFF's trailing F is not Friday
+        info = self.scraper._extract_time_location("STAFF..T.R.. 02:50PM-04:10PM;")
+        self.assertEqual(info["time"], "Tuesday, Thursday 02:50PM-04:10PM")
+        self.assertEqual(info["meetings"], [{"days": DAY_BITS["T"] | DAY_BITS["R"], "start": 890, "end": 970}])
+
+    def test_weekend_days(self):
+        info = self.scraper._extract_time_location("STAFFU.....S 10:00AM-12:00PM;")
+        self.assertEqual(info["time"], "Sunday, Saturday 10:00AM-12:00PM")
+        self.assertEqual(info["meetings"], [{"days": DAY_BITS["U"] | DAY_BITS["S"], "start": 600, "end": 720}])
+
+    def test_named_professor_and_room(self):
+        info = self.scraper._extract_time_location("Grossman,Richard.M.W... 01:20PM-02:40PM;FRANK100;")
+        self.assertEqual(info["time"], "Monday, Wednesday 01:20PM-02:40PM")
+        self.assertEqual(info["location"], "FRANK100")
+        self.assertEqual(info["meetings"], [{"days": DAY_BITS["M"] | DAY_BITS["W"], "start": 800, "end": 880}])
+
+    def test_staff_rows_in_sample_page(self):
+        with open(SAMPLE_PAGE, "rb") as f:
+            content = f.read()
+        for backend in ("bs4", "lxml"):
+            courses = WesleyanCourseScraper(parser_backend=backend)._parse_content(content, "ECON", "1261")
+            staff = {course.code: course for course in courses if course.professor == "STAFF"}
+            self.assertEqual(staff["ECON215"].meetings[0]["days"], DAY_BITS["T"] | DAY_BITS["R"])
+            self.assertEqual(staff["ECON222"].meetings[0]["days"], DAY_BITS["M"] | DAY_BITS["W"])
+            for course in staff.values():
+                self.assertNotIn("Friday", course.time)
+
+
+class SectionsTest(unittest.TestCase):
+    def setUp(self):
+        with open(SAMPLE_PAGE, "rb") as f:
+            self.courses = WesleyanCourseScraper()._parse_content(f.read(), "ECON", "1261")
+
+    def test_rows_hold_only_their_own_section(self):
+        self.assertTrue(all(course.section and course.sections is None for course in self.courses))
+
+    def test_merge_lists_sections_only_for_combined_rows(self):
+        # Section numbers of each id in scrape order, repeated rows dropped
+        rows = {}
+        for course in self.courses:
+            rows.setdefault(course.id, {})[course.section] = None
+        for course in merge_sections(self.courses):
+            if len(rows[course.id]) > 1:
+                self.assertEqual([section["section"] for section in course.sections], list(rows[course.id]))
+            else:
+                self.assertIsNone(course.sections)
+
+    def test_load_shares_meetings_and_sections(self):
+        merged = merge_sections(self.courses)
+        loaded = courses_from_records([asdict(course) for course in merged + merged])
+        half = len(merged)
+        for first, second in zip(loaded[:half], loaded[half:]):
+            self.assertIs(first.meetings, second.meetings)
+            for a, b in zip(first.sections or [], second.sections or []):
+                self.assertIs(a["meetings"], b["meetings"])
+                self.assertIs(a["professor"], b["professor"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import unittest
+from dataclasses import asdict
+
+from course_scraper import WesleyanCourseScraper
+from fast_parser import decode_page, iter_course_rows
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class FastParserTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(SAMPLE_PAGE, "rb") as f:
+            cls.page = f.read()
+
+    def parse(self, backend: str, content: bytes):
+        return [asdict(course) for course in
+                WesleyanCourseScraper(parser_backend=backend)._parse_content(content, "ECON", "1259")]
+
+    def test_matches_bs4_backend(self):
+        bs4_courses = self.parse("bs4", self.page)
+        self.assertTrue(bs4_courses)
+        self.assertEqual(self.parse("lxml", self.page), bs4_courses)
+
+    def test_matches_bs4_backend_on_latin1_page(self):
+        # Non-UTF-8 pages take the slow decoding path; both backends must agree on it
+        page = self.page.replace(b"Introduction to Economics", "Économie générale".encode("latin-1"))
+        lxml_courses = self.parse("lxml", page)
+        self.assertIn("Économie générale", {course["title"] for course in lxml_courses})
+        self.assertEqual(lxml_courses, self.parse("bs4", page))
+
+    def test_only_course_rows_are_yielded(self):
+        page = (b"<table><tr><td>header</td><td>Title</td><td>Info</td></tr>"
+                b"<tr><td><a href='?crse=1'>ECON101-01</a></td><td>Intro</td><td><a>Smith,Jo</a> .M.W... 01:20PM-02:40PM;</td></tr>"
+                b"<tr><td><a href='?crse=2'>ECON102-01</a></td><td>Only two cells</td></tr></table>")
+        rows = list(iter_course_rows(page))
+        self.assertEqual(rows, [("ECON101-01", "?crse=1", "Intro", ["Smith,Jo"], "Smith,Jo.M.W... 01:20PM-02:40PM;")])
+
+    def test_decode_page_falls_back_from_utf8(self):
+        self.assertEqual(decode_page("café".encode("utf-8")), "café")
+        self.assertIn("café", decode_page(b"<html><body>caf\xe9</body></html>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from course_scraper import WesleyanCourseScraper
+from get_departments import DepartmentCache, iter_page_departments, stream_departments
+from mock_wesmaps import MockWesMaps
+from resilience import RetryPolicy
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+def chunked(page: bytes, size: int):
+    return [page[i:i + size] for i in range(0, len(page), size)]
+
+
+class PageDepartmentsTest(unittest.TestCase):
+    def test_only_links_are_scanned(self):
+        page = (b'<html><head><meta name="keywords" content="ABCD101"></head><body>'
+                b'<a href="!wesmaps_page.html?subj_page=ECON&term=1259">Economics</a>'
+                b'<td title="WXYZ200">See also HIST101 and GOVT155.</td>'
+                b'<a href="!wesmaps_page.html?crse=009187&term=1259">COMP211-01</a>'
+                b'<a href="!wesmaps_page.html?crse_list=MATH&term=1259">Math</a></body></html>')
+        self.assertEqual(list(iter_page_departments([page])), ["ECON", "COMP", "MATH"])
+
+    def test_chunk_boundaries_do_not_matter(self):
+        with open(SAMPLE_PAGE, "rb") as f:
+            page = f.read()
+        whole = list(iter_page_departments([page]))
+        self.assertEqual(whole, ["ECON"])
+        for size in (1, 7, 100, 1000, 4096):
+            self.assertEqual(list(iter_page_departments(chunked(page, size))), whole)
+
+
+class StreamDepartmentsTest(unittest.TestCase):
+    def test_failed_discovery_is_filled_in(self):
+        class Response:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def iter_content(self, chunk_size):
+                yield b'<a href="?subj_page=ECON">E</a><a href="?subj_page=HIST">H</a>' + b" " * 2048
+                raise ConnectionError("connection reset")
+
+        cache = DepartmentCache(os.path.join(tempfile.mkdtemp(), "departments.json"))
+        departments = list(stream_departments(cache, fetch=lambda url: Response(),
+                                              fallback=lambda: ["COMP", "ECON", "MATH"]))
+        self.assertEqual(departments, ["ECON", "HIST", "COMP", "MATH"])
+        # A partial discovery is not cached
+        self.assertEqual(cache.known(), [])
+
+    def test_landing_page_is_fetched_with_retries(self):
+        # Seed 1 fails the first request with a 503 and lets the retry through
+        with MockWesMaps(["COMP", "ECON"], SAMPLE_PAGE, error_rate=0.5, seed=1) as mock:
+            scraper = WesleyanCourseScraper(retry_policy=RetryPolicy(base_delay=0.01),
+                                            department_cache=DepartmentCache(
+                                                os.path.join(tempfile.mkdtemp(), "departments.json")))
+            scraper.base_url = mock.base_url
+            self.assertEqual(list(scraper.iter_departments()), ["COMP", "ECON"])
+        self.assertEqual(mock.errors, 1)
+        self.assertEqual(scraper.metrics.snapshot()["counters"]["retries_total"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import unittest
+
+from course_scraper import WesleyanCourseScraper
+from metrics import PROMETHEUS_PREFIX, Histogram, ScrapeMetrics
+from mock_wesmaps import MockWesMaps
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class HistogramTest(unittest.TestCase):
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        # Beyond the last bucket the quantile is the largest value seen
+        self.assertEqual(histogram.quantile(1.0), 2.0)
+        self.assertEqual((histogram.min, histogram.max), (0.05, 2.0))
+
+    def test_merge_adds_worker_snapshots(self):
+        main, worker = ScrapeMetrics(), ScrapeMetrics()
+        main.increment("courses_extracted_total", 3)
+        main.observe("parse_seconds", 0.002)
+        worker.increment("courses_extracted_total", 4)
+        worker.observe("parse_seconds", 0.2)
+        main.merge(worker.snapshot())
+        snapshot = main.snapshot()
+        self.assertEqual(snapshot["counters"]["courses_extracted_total"], 7)
+        parse = snapshot["histograms"]["parse_seconds"]
+        self.assertEqual((parse["count"], parse["min"], parse["max"]), (2, 0.002, 0.2))
+
+
+class PrometheusTest(unittest.TestCase):
+    def test_exposition_format(self):
+        metrics = ScrapeMetrics()
+        metrics.set_info(engine="async", shard='a "quoted"\\label')
+        metrics.increment("requests_total", 2)
+        metrics.observe("fetch_seconds", 0.003)
+        metrics.observe("fetch_seconds", 60.0)
+        lines = metrics.to_prometheus().splitlines()
+        self.assertIn(f'{PROMETHEUS_PREFIX}info{{engine="async",shard="a \\"quoted\\"\\\\label"}} 1', lines)
+        self.assertIn(f"{PROMETHEUS_PREFIX}requests_total 2", lines)
+        # Buckets are cumulative and end with +Inf holding every observation
+        self.assertIn(f'{PROMETHEUS_PREFIX}fetch_seconds_bucket{{le="0.001"}} 0', lines)
+        self.assertIn(f'{PROMETHEUS_PREFIX}fetch_seconds_bucket{{le="0.005"}} 1', lines)
+        self.assertIn(f'{PROMETHEUS_PREFIX}fetch_seconds_bucket{{le="30.0"}} 1', lines)
+        self.assertIn(f'{PROMETHEUS_PREFIX}fetch_seconds_bucket{{le="+Inf"}} 2', lines)
+        self.assertIn(f"{PROMETHEUS_PREFIX}fetch_seconds_count 2", lines)
+
+
+class ScrapeMetricsTest(unittest.TestCase):
+    def test_department_scrape_is_counted(self):
+        with MockWesMaps(["ECON"], SAMPLE_PAGE) as mock:
+            scraper = WesleyanCourseScraper()
+            scraper.base_url = mock.base_url
+            courses = scraper.scrape_department_courses("ECON", "1259")
+        snapshot = scraper.metrics.snapshot()
+        counters, histograms = snapshot["counters"], snapshot["histograms"]
+        self.assertEqual(counters["requests_total"], 1)
+        self.assertEqual(counters["bytes_fetched_total"], os.path.getsize(SAMPLE_PAGE))
+        self.assertEqual(counters["courses_extracted_total"], len(courses))
+        for name in ("fetch_seconds", "parse_seconds", "department_seconds"):
+            self.assertEqual(histograms[name]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
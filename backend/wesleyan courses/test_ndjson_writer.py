@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+
+from course_scraper import Course
+from ndjson_writer import NDJSONWriter, iter_ndjson, ndjson_to_json_array
+
+
+def course(code: str, title: str):
+    return Course(id=f"{code}_1259", code=code, number=code[-3:], title=title, department=code[:-3],
+                  description="", professor="STAFF", term="Fall 2025", meetings=[{"days": 5, "start": 800, "end": 880}])
+
+
+class NDJSONWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "courses.ndjson")
+        self.courses = [course("ECON101", "Intro"), course("ECON110", "Économie, \"générale\"")]
+
+    def test_finalize_writes_legacy_json_array(self):
+        legacy = os.path.join(self.directory, "courses.json")
+        with NDJSONWriter(self.filename) as writer:
+            self.assertEqual(writer.write_courses(self.courses[:1]), 1)
+            writer.write_courses(self.courses[1:])
+            writer.finalize(legacy)
+        self.assertFalse(os.path.exists(writer.partial_filename))
+        records = list(iter_ndjson(self.filename))
+        self.assertEqual([r["code"] for r in records], ["ECON101", "ECON110"])
+        with open(legacy, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps(records, indent=2, ensure_ascii=False))
+
+    def test_empty_array_matches_json_dump(self):
+        with NDJSONWriter(self.filename):
+            pass
+        legacy = os.path.join(self.directory, "courses.json")
+        self.assertEqual(ndjson_to_json_array(self.filename, legacy), 0)
+        with open(legacy, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps([], indent=2))
+
+    def test_error_keeps_partial_file(self):
+        with self.assertRaises(RuntimeError):
+            with NDJSONWriter(self.filename) as writer:
+                writer.write_courses(self.courses[:1])
+                raise RuntimeError("scrape interrupted")
+        # What was scraped before the error survives, and nothing pretends to be finished
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertEqual([r["code"] for r in iter_ndjson(writer.partial_filename)], ["ECON101"])
+
+
+if __name__ == "__main__":
+    unittest.main()
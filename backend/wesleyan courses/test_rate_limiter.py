@@ -0,0 +1,55 @@
+import unittest
+
+from rate_limiter import AdaptiveRateLimiter, RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_slots_are_spaced_by_the_rate(self):
+        limiter = RateLimiter(10.0)
+        delays = [limiter.reserve() for _ in range(3)]
+        self.assertLessEqual(delays[0], 0.0)
+        self.assertAlmostEqual(delays[2] - delays[1], 0.1, delta=0.01)
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+
+class AdaptiveRateLimiterTest(unittest.TestCase):
+    def healthy_window(self, limiter, latency=0.05):
+        return [limiter.record_response(latency, False) for _ in range(limiter.window)]
+
+    def test_additive_increase_up_to_max(self):
+        limiter = AdaptiveRateLimiter(initial_rps=1.0, max_rps=1.5, increase=0.25, window=3)
+        self.assertEqual(self.healthy_window(limiter), [0, 0, 1])
+        self.assertEqual(limiter.requests_per_second, 1.25)
+        self.healthy_window(limiter)
+        self.assertEqual(self.healthy_window(limiter)[-1], 0)
+        self.assertEqual(limiter.requests_per_second, 1.5)
+
+    def test_overload_cuts_once_for_requests_in_flight(self):
+        limiter = AdaptiveRateLimiter(initial_rps=4.0, min_rps=1.5, decrease=0.5)
+        self.assertEqual(limiter.record_response(None, True), -1)
+        self.assertEqual(limiter.requests_per_second, 2.0)
+        # Other requests sent at the old rate report the same overload
+        self.assertEqual(limiter.record_response(None, True), 0)
+        self.assertEqual(limiter.requests_per_second, 2.0)
+        limiter._hold_until = 0.0
+        self.assertEqual(limiter.record_response(None, True), -1)
+        self.assertEqual(limiter.requests_per_second, 1.5)
+
+    def test_latency_spike_cuts_rate(self):
+        limiter = AdaptiveRateLimiter(initial_rps=2.0, window=2, latency_factor=2.0)
+        self.healthy_window(limiter, latency=0.05)
+        rate = limiter.requests_per_second
+        self.assertEqual(self.healthy_window(limiter, latency=0.5)[-1], -1)
+        self.assertEqual(limiter.requests_per_second, rate * limiter.decrease)
+
+    def test_limits_are_validated(self):
+        with self.assertRaises(ValueError):
+            AdaptiveRateLimiter(min_rps=2.0, max_rps=1.0)
+        with self.assertRaises(ValueError):
+            AdaptiveRateLimiter(decrease=1.0)
+        self.assertEqual(AdaptiveRateLimiter(initial_rps=100.0, max_rps=8.0).requests_per_second, 8.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
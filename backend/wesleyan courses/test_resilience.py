@@ -0,0 +1,97 @@
+import os
+import time
+import unittest
+
+import requests
+
+from course_scraper import WesleyanCourseScraper
+from mock_wesmaps import MockWesMaps
+from resilience import CircuitBreaker, RetryPolicy
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+def http_error(status: int, headers=None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_retryable_errors(self):
+        self.assertTrue(RetryPolicy.is_retryable(requests.Timeout()))
+        self.assertTrue(RetryPolicy.is_retryable(requests.ConnectionError()))
+        self.assertTrue(RetryPolicy.is_retryable(http_error(503)))
+        self.assertTrue(RetryPolicy.is_retryable(http_error(429)))
+        self.assertFalse(RetryPolicy.is_retryable(http_error(404)))
+        self.assertFalse(RetryPolicy.is_retryable(ValueError()))
+
+    def test_backoff_is_capped_and_honours_retry_after(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        for attempt in range(8):
+            self.assertLessEqual(policy.backoff(attempt), min(5.0, 2 ** attempt))
+        self.assertEqual(policy.backoff(0, http_error(429, {"Retry-After": "3"})), 3.0)
+        self.assertEqual(policy.backoff(0, http_error(429, {"Retry-After": "120"})), 5.0)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=0.05)
+        self.assertFalse(breaker.record_failure())
+        breaker.record_success()
+        self.assertFalse(breaker.record_failure())
+        self.assertFalse(breaker.record_failure())
+        self.assertTrue(breaker.record_failure())
+        self.assertTrue(breaker.is_open)
+        # Failures of requests already in flight do not extend the pause
+        self.assertFalse(breaker.record_failure())
+        self.assertGreater(breaker.wait(), 0)
+        self.assertFalse(breaker.is_open)
+
+    def test_failed_trial_reopens_for_longer(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=0.02, max_cooldown=0.05)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.wait()
+        start = time.monotonic()
+        self.assertTrue(breaker.record_failure())
+        self.assertGreaterEqual(breaker.wait() + (time.monotonic() - start), 0.035)
+        self.assertEqual(breaker.trips, 2)
+        breaker.record_success()
+        self.assertFalse(breaker.record_failure())
+
+
+class FetchRetryTest(unittest.TestCase):
+    def scraper(self, mock: MockWesMaps, attempts: int = 3) -> WesleyanCourseScraper:
+        scraper = WesleyanCourseScraper(retry_policy=RetryPolicy(max_attempts=attempts, base_delay=0.001),
+                                        circuit_breaker=CircuitBreaker(failure_threshold=100))
+        scraper.base_url = mock.base_url
+        return scraper
+
+    def test_server_errors_are_retried(self):
+        # Seed 1 fails the first request with a 503 and lets the retry through
+        with MockWesMaps(["ECON"], SAMPLE_PAGE, error_rate=0.5, seed=1) as mock:
+            scraper = self.scraper(mock)
+            response = scraper._fetch(mock.base_url + "?subj_page=ECON&term=1259")
+        self.assertEqual(response.status_code, 200)
+        counters = scraper.metrics.snapshot()["counters"]
+        self.assertEqual((counters["requests_total"], counters["retries_total"]), (2, 1))
+
+    def test_not_found_is_not_retried(self):
+        with MockWesMaps(["ECON"], SAMPLE_PAGE) as mock:
+            scraper = self.scraper(mock)
+            with self.assertRaises(requests.HTTPError):
+                scraper._fetch(mock.base_url + "?subj_page=NOPE&term=1259")
+        self.assertEqual(mock.requests, 1)
+
+    def test_last_failure_is_raised(self):
+        with MockWesMaps(["ECON"], SAMPLE_PAGE, error_rate=1.0) as mock:
+            scraper = self.scraper(mock, attempts=3)
+            with self.assertRaises(requests.HTTPError):
+                scraper._fetch(mock.base_url + "?subj_page=ECON&term=1259")
+        self.assertEqual(mock.requests, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
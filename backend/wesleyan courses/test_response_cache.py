@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from dataclasses import asdict
+from unittest import mock
+
+import requests
+
+from course_scraper import WesleyanCourseScraper
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class RevalidatingSession:
+    """Serves one page with an ETag, answering If-None-Match with a 304"""
+
+    def __init__(self, content: bytes, etag: str = '"v1"'):
+        self.content = content
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.requests.append(dict(headers or {}))
+        response = requests.Response()
+        response.url = url
+        if (headers or {}).get("If-None-Match") == self.etag:
+            response.status_code, response._content = 304, b""
+        else:
+            response.status_code, response._content = 200, self.content
+            response.headers["ETag"] = self.etag
+        return response
+
+
+def records(courses):
+    return [{key: value for key, value in asdict(course).items() if key != "createdAt"} for course in courses]
+
+
+class RevalidationCacheTest(unittest.TestCase):
+    def setUp(self):
+        with open(SAMPLE_PAGE, "rb") as f:
+            self.session = RevalidatingSession(f.read())
+        self.cache_dir = tempfile.mkdtemp()
+
+    def scraper(self):
+        scraper = WesleyanCourseScraper(cache_dir=self.cache_dir)
+        scraper.session = self.session
+        return scraper
+
+    def test_unchanged_page_is_not_parsed_again(self):
+        first = self.scraper().scrape_department_courses("ECON", "1259")
+        self.assertTrue(first)
+        scraper = self.scraper()
+        with mock.patch.object(scraper, "_parse_content", side_effect=AssertionError("page parsed again")):
+            second = scraper.scrape_department_courses("ECON", "1259")
+        self.assertEqual(self.session.requests[-1], {"If-None-Match": '"v1"'})
+        self.assertEqual(records(second), records(first))
+
+    def test_changed_page_is_parsed(self):
+        self.scraper().scrape_department_courses("ECON", "1259")
+        self.session.etag = '"v2"'
+        self.session.content = self.session.content.replace(b"ECON101", b"ECON199")
+        courses = self.scraper().scrape_department_courses("ECON", "1259")
+        self.assertIn("ECON199", {course.code for course in courses})
+        self.assertNotIn("ECON101", {course.code for course in courses})
+
+
+if __name__ == "__main__":
+    unittest.main()
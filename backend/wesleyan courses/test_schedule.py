@@ -0,0 +1,60 @@
+import unittest
+
+from course_scraper import DAY_BITS, Course
+from enrichment import merge_sections
+from schedule import ScheduleEngine
+
+MW = DAY_BITS["M"] | DAY_BITS["W"]
+TR = DAY_BITS["T"] | DAY_BITS["R"]
+
+
+def section(code: str, number: str, days: int, start: int, end: int, term: str = "Fall 2025") -> Course:
+    return Course(id=f"{code}_{term}", code=code, number=code[4:], title=code, department=code[:4],
+                  description=code, professor="STAFF", term=term, time=f"{days} {start}-{end}",
+                  meetings=[{"days": days, "start": start, "end": end}], section=number)
+
+
+class ScheduleEngineTest(unittest.TestCase):
+    def test_terms_do_not_conflict(self):
+        engine = ScheduleEngine([section("ECON101", "01", MW, 600, 680),
+                                 section("COMP211", "01", MW, 600, 680),
+                                 section("ECON101", "01", MW, 600, 680, term="Spring 2026")])
+        pairs = [(a.id, b.id) for a, b in engine.conflicting_pairs()]
+        self.assertEqual(pairs, [("ECON101_Fall 2025", "COMP211_Fall 2025")])
+
+    def test_conflict_needs_every_section_to_overlap(self):
+        rows = [section("ECON101", "01", MW, 600, 680), section("ECON101", "02", TR, 600, 680),
+                section("COMP211", "01", MW, 600, 680), section("MATH221", "01", MW, 650, 700)]
+        for courses in (rows, merge_sections(rows)):
+            engine = ScheduleEngine(courses)
+            # ECON101-02 leaves room for either single-section course
+            self.assertEqual(engine.conflicts_with("ECON101_Fall 2025"), [])
+            self.assertEqual([course.code for course in engine.conflicts_with("MATH221_Fall 2025")], ["COMP211"])
+
+    def test_unscheduled_section_never_conflicts(self):
+        tba = section("ECON101", "02", 0, 0, 0)
+        tba.meetings, tba.time = [], ""
+        rows = [section("ECON101", "01", MW, 600, 680), tba, section("COMP211", "01", MW, 600, 680)]
+        for courses in (rows, merge_sections(rows)):
+            engine = ScheduleEngine(courses)
+            self.assertEqual(engine.conflicts_with("COMP211_Fall 2025"), [])
+            self.assertEqual(engine.conflicting_pairs(), [])
+
+    def test_weekend_meetings_conflict(self):
+        engine = ScheduleEngine([section("ECON101", "01", DAY_BITS["S"], 600, 680),
+                                 section("COMP211", "01", DAY_BITS["S"], 630, 700),
+                                 section("MATH221", "01", DAY_BITS["U"], 600, 680)])
+        pairs = [(a.code, b.code) for a, b in engine.conflicting_pairs()]
+        self.assertEqual(pairs, [("ECON101", "COMP211")])
+        fitting = engine.fits_availability({"U": [(540, 720)]})
+        self.assertEqual([course.code for course in fitting], ["MATH221"])
+
+    def test_fits_availability_per_section(self):
+        rows = [section("ECON101", "01", MW, 600, 680), section("ECON101", "02", TR, 600, 680)]
+        for courses in (rows, merge_sections(rows)):
+            fitting = ScheduleEngine(courses).fits_availability({"M": [(480, 720)], "W": [(480, 720)]})
+            self.assertEqual([(course.code, course.section) for course in fitting], [("ECON101", "01")])
+
+
+if __name__ == "__main__":
+    unittest.main()
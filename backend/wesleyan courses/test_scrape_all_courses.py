@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import asdict, replace
+from unittest import mock
+
+import scrape_all_courses
+from course_scraper import WesleyanCourseScraper, term_output_filename
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+def sample_courses(department: str, term: str):
+    with open(SAMPLE_PAGE, "rb") as f:
+        courses = WesleyanCourseScraper()._parse_content(f.read(), "ECON", term)
+    return [replace(course, id=course.id.replace("ECON", department), code=course.code.replace("ECON", department),
+                    department=department) for course in courses]
+
+
+class IncompleteRunTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        self.fall = term_output_filename("Fall 2025")
+        self.previous = [asdict(course) for course in sample_courses("ECON", "1259") + sample_courses("COMP", "1259")]
+        with open(self.fall, "w", encoding="utf-8") as f:
+            json.dump(self.previous, f)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+
+    def run_scrape(self, *args):
+        def scrape(scraper, term, on_department=None):
+            # COMP fails in Fall; every other unit succeeds
+            if term == "1259":
+                scraper.failed_units.append((term, "COMP"))
+            return sample_courses("ECON", term)
+
+        with mock.patch.object(WesleyanCourseScraper, "scrape_all_courses", scrape):
+            return scrape_all_courses.main(["--no-discovery", "--metrics", "", "--archive-dir", "",
+                                            "--checkpoint-dir", "checkpoints", "--fetch-plan", "plan.json", *args])
+
+    def test_failed_department_is_not_removed(self):
+        self.assertEqual(self.run_scrape("--diff", "--copy", "courses.csv"), 1)
+        with open(self.fall.replace(".json", ".diff.json"), encoding="utf-8") as f:
+            diff = json.load(f)
+        self.assertEqual(diff["removed"], [])
+        self.assertEqual(diff["added"], [])
+
+    def test_previous_snapshot_is_kept(self):
+        self.run_scrape("--ndjson", "--copy", "courses.csv")
+        with open(self.fall, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), self.previous)
+        with open(scrape_all_courses.incomplete_output_filename(self.fall), encoding="utf-8") as f:
+            self.assertEqual({record["department"] for record in json.load(f)}, {"ECON"})
+        # Spring finished, but the combined outputs would still miss Fall's COMP courses
+        self.assertTrue(os.path.exists(term_output_filename("Spring 2026")))
+        self.assertFalse(os.path.exists("wesleyan_all_courses.json"))
+        self.assertFalse(os.path.exists("courses.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
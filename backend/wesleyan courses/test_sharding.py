@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+
+from sharding import (ALL_COURSES_FILENAME, main, manifest_filename, parse_shard, shard_filename, shard_of,
+                      write_manifest)
+
+TERM_FILE = "wesleyan_courses_fall_2025.json"
+
+
+def record(code: str, department: str):
+    return {"id": f"{code}_1259", "code": code, "department": department, "title": code}
+
+
+class ShardAssignmentTest(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard(" 2/4 "), (2, 4))
+        for text in ("0/4", "5/4", "2", "a/b"):
+            with self.assertRaises(ValueError):
+                parse_shard(text)
+
+    def test_every_unit_has_one_stable_owner(self):
+        departments = ("ECON", "COMP", "HIST", "MATH", "BIOL", "CHEM")
+        owners = [shard_of("1259", dept, 4) for dept in departments]
+        self.assertTrue(all(1 <= owner <= 4 for owner in owners))
+        # Independent of discovery order, so every node agrees on the split
+        self.assertEqual(owners, [shard_of("1259", dept, 4) for dept in reversed(departments)][::-1])
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.directory, "merged")
+        os.mkdir(self.output_dir)
+
+    def write_shard(self, shard, departments, records, failed=()):
+        shard_file = shard_filename(TERM_FILE, shard)
+        with open(os.path.join(self.directory, shard_file), "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        path = os.path.join(self.directory, manifest_filename(shard))
+        write_manifest(path, shard, "2025-07-09T00:00:00", [{
+            "code": "1259", "name": "Fall 2025", "file": TERM_FILE, "shard_file": shard_file,
+            "departments": departments, "failed": list(failed)}])
+        return path
+
+    def merged(self, filename=TERM_FILE):
+        with open(os.path.join(self.output_dir, filename), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_merge_rebuilds_single_node_order(self):
+        econ = [record("ECON101", "ECON"), record("ECON101", "ECON"), record("ECON110", "ECON")]
+        comp, hist = [record("COMP211", "COMP")], [record("HIST101", "HIST")]
+        manifests = [
+            self.write_shard((1, 2), ["ECON", "COMP", "HIST"], comp),
+            # Shard 2 also scraped COMP (e.g. after a rerun); only one copy is kept
+            self.write_shard((2, 2), ["ECON", "COMP", "HIST"], econ + hist + comp),
+        ]
+        self.assertEqual(main(manifests + ["--output-dir", self.output_dir]), 0)
+        self.assertEqual(self.merged(), econ + comp + hist)
+        self.assertEqual(self.merged(ALL_COURSES_FILENAME), econ + comp + hist)
+
+    def test_incomplete_shards_are_refused(self):
+        manifests = [
+            self.write_shard((1, 2), ["ECON", "COMP"], [record("ECON101", "ECON")]),
+            self.write_shard((2, 2), ["ECON", "COMP"], [], failed=["COMP"]),
+        ]
+        self.assertEqual(main(manifests + ["--output-dir", self.output_dir]), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, TERM_FILE)))
+        self.assertEqual(main(manifests + ["--output-dir", self.output_dir, "--allow-incomplete"]), 0)
+        self.assertEqual(self.merged(), [record("ECON101", "ECON")])
+
+    def test_missing_shard_is_refused(self):
+        manifest = self.write_shard((1, 2), ["ECON"], [record("ECON101", "ECON")])
+        self.assertEqual(main([manifest, "--output-dir", self.output_dir]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import unittest
+from dataclasses import asdict
+
+from course_scraper import WesleyanCourseScraper
+from enrichment import merge_sections
+from sqlite_store import CourseStore, meeting_rows, parse_meetings
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class UpsertSectionsTest(unittest.TestCase):
+    def setUp(self):
+        with open(SAMPLE_PAGE, "rb") as f:
+            self.rows = WesleyanCourseScraper()._parse_content(f.read(), "ECON", "1261")
+        # ECON110's first two sections have different instructors and times
+        first = {}
+        for course in self.rows:
+            if course.code == "ECON110":
+                first.setdefault(course.section, course)
+        self.sections = [first["01"], first["02"]]
+
+    def stored(self, courses):
+        with CourseStore(":memory:") as store:
+            store.upsert_courses(courses)
+            course_id = self.sections[0].id
+            return store.meetings_for(course_id), store.instructors_for(course_id)
+
+    def test_merged_sections_keep_every_meeting_and_instructor(self):
+        merged = merge_sections(self.sections)
+        self.assertEqual(len(merged), 1)
+        meetings, instructors = self.stored(merged)
+        self.assertEqual(meetings, [{"days": "Monday, Wednesday", "start_time": "08:20AM", "end_time": "09:40AM"},
+                                    {"days": "Monday, Wednesday", "start_time": "02:50PM", "end_time": "04:10PM"}])
+        self.assertEqual(instructors, ["Boulware,Karl David", "Hogendorn,Christiaan"])
+        # Same rows as when the sections arrive one per record
+        self.assertEqual(self.stored(self.sections), (meetings, instructors))
+
+    def test_structured_meetings_match_time_strings(self):
+        for course in self.rows:
+            record = asdict(course)
+            self.assertEqual(meeting_rows(record), parse_meetings(record["time"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
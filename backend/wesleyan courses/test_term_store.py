@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from dataclasses import asdict, replace
+
+from course_scraper import WesleyanCourseScraper
+from term_store import COURSES_FILENAME, TermCatalog
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_page.html")
+
+
+class TermCatalogTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(SAMPLE_PAGE, "rb") as f:
+            cls.fall = WesleyanCourseScraper()._parse_content(f.read(), "ECON", "1259")
+        cls.term = cls.fall[0].term
+        # The same courses a term later, one of them with a new instructor
+        cls.spring = [replace(course, id=f"{course.code}_1261", term="Spring 2026", createdAt="2026-01-05T00:00:00")
+                      for course in cls.fall]
+        cls.spring[0] = replace(cls.spring[0], professor="Newhire,Alex", location="PAC 001")
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_terms_round_trip(self):
+        store = TermCatalog(self.directory)
+        first = store.append_term(self.term, self.fall)
+        second = store.append_term("Spring 2026", self.spring)
+        # Only the course whose shared attributes changed adds a record
+        self.assertEqual(second, {"courses": len(self.spring), "new_records": 1})
+        self.assertLessEqual(first["new_records"], first["courses"])
+
+        reopened = TermCatalog(self.directory)
+        self.assertEqual(reopened.terms(), [self.term, "Spring 2026"])
+        self.assertEqual([asdict(c) for c in reopened.term_courses(self.term)], [asdict(c) for c in self.fall])
+        self.assertEqual([asdict(c) for c in reopened.term_courses("Spring 2026")], [asdict(c) for c in self.spring])
+        with self.assertRaises(KeyError):
+            reopened.term_courses("Fall 2030")
+
+    def test_replacing_a_term_removes_its_old_file(self):
+        store = TermCatalog(self.directory)
+        store.append_term(self.term, self.fall)
+        old_file = store.manifest["terms"][0]["file"]
+        store.append_term(self.term, self.fall[:1])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, old_file)))
+        self.assertEqual([asdict(c) for c in TermCatalog(self.directory).term_courses(self.term)],
+                         [asdict(self.fall[0])])
+
+    def test_interrupted_append_is_ignored(self):
+        TermCatalog(self.directory).append_term(self.term, self.fall)
+        # Records written by an append that never committed its manifest
+        with open(os.path.join(self.directory, COURSES_FILENAME), "ab") as f:
+            f.write(b'["ECON999", "999"')
+        store = TermCatalog(self.directory)
+        self.assertEqual(len(store.term_courses(self.term)), len(self.fall))
+        store.append_term("Spring 2026", self.spring)
+        self.assertEqual([asdict(c) for c in TermCatalog(self.directory).term_courses("Spring 2026")],
+                         [asdict(c) for c in self.spring])
+
+
+if __name__ == "__main__":
+    unittest.main()